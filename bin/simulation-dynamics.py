@@ -2,8 +2,7 @@
 simulation dynamics of rigid bodies, springs, gravity(-like), frictional forces, etc.
 """
 
-from click import command, argument, Path
-import yaml
+from click import command, argument, option, Path
 from logging import Logger, getLogger
 
 from dynamics.utils import is_mac_os
@@ -15,333 +14,148 @@ if is_mac_os():
 
 import numpy as np
 from matplotlib import pyplot as plt
-from matplotlib.animation import FuncAnimation, PillowWriter
-from matplotlib.axes import Axes
-from matplotlib.figure import Figure
-from matplotlib.patches import Polygon, Arrow
-from matplotlib.text import Text
+from matplotlib.animation import FuncAnimation
 from freq_used.logging_utils import set_logging_basic_config
-from freq_used.plotting import get_figure
 
+from dynamics.accessories.accessories import Accessories
+from dynamics.blitted_animation import BlittedAnimation
 from dynamics.bodies.bodies import Bodies
-from dynamics.utils import (
-    energy_and_momentum_info,
-    load_dynamic_system_simulation_setting,
-    remove_axes_boundary,
-    kinematics_info_text,
-)
+from dynamics.parallel_gif_export import save_to_gif_in_parallel
+from dynamics.physics_worker import PhysicsWorker
+from dynamics.simulation import Simulation
+from dynamics.simulation_figure import SimulationFigure
+from dynamics.streaming_gif_writer import StreamingGifWriter
+from dynamics.trajectory_recorder import TrajectoryRecorder
 
 logger: Logger = getLogger()
 
 
 @command()
 @argument("input_file", type=Path(exists=True, file_okay=True, dir_okay=False, readable=True))
-def main(input_file: str) -> None:
+@option("--headless", is_flag=True, help="run physics only, without any figure")
+@option("--t-end", type=float, default=None, help="end time of headless simulation")
+@option(
+    "--output",
+    type=Path(dir_okay=False, writable=True),
+    default="dynamics-simulation.npz",
+    show_default=True,
+    help="file for samples of headless simulation",
+)
+@option(
+    "--record",
+    type=Path(dir_okay=False, writable=True),
+    default=None,
+    help="chunked .npz file to record the state at every integration step into",
+)
+@option(
+    "--checkpoint",
+    type=Path(dir_okay=False, writable=True),
+    default=None,
+    help="file to save checkpoints to, from which the simulation can be resumed",
+)
+@option(
+    "--checkpoint-every",
+    type=float,
+    default=10.0,
+    show_default=True,
+    help="interval of checkpoints in simulation time (sec.)",
+)
+@option(
+    "--resume",
+    type=Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+    default=None,
+    help="checkpoint of the same input file to resume the simulation from",
+)
+@option(
+    "--physics-worker/--no-physics-worker",
+    default=False,
+    show_default=True,
+    help="run physics of animation in a worker process ahead of rendering, which rebuilds"
+    + " the simulation, and checkpoints and records it itself",
+)
+@option(
+    "--render-processes",
+    type=int,
+    default=1,
+    show_default=True,
+    help="# of processes rendering frames of .gif, e.g., # of CPUs to export the gallery,"
+    + " which simulates all the frames first, or 1 to render them one after another"
+    + " along with physics",
+)
+def main(
+    input_file: str,
+    headless: bool,
+    t_end: float | None,
+    output: str,
+    record: str | None,
+    checkpoint: str | None,
+    checkpoint_every: float,
+    resume: str | None,
+    physics_worker: bool,
+    render_processes: int,
+) -> None:
     set_logging_basic_config(__file__)
 
-    with open(input_file, "r") as fid:
-        data = yaml.safe_load(fid)
-
-    simulation_setting, bodies, forces, accessories = load_dynamic_system_simulation_setting(data)
-
-    Bodies.set_time_step_lengths(
-        (
-            simulation_setting["sim_time_step"]  # type:ignore
-            if "sim_time_step" in simulation_setting
-            else Bodies.SIM_TIME_STEP
-        ),
-        (
-            simulation_setting["sim_time_step_const_vel"]  # type:ignore
-            if "sim_time_step_const_vel" in simulation_setting
-            else Bodies.SIM_TIME_STEP_CONST_VEL
-        ),
-    )
-
-    if simulation_setting["minimize_energy"]:
-        logger.info("set body locations as to (approximately) minimize the total potential energy")
-        forces.approx_min_energy(bodies)
-
-    forces.register_forces(bodies)
-
-    frame_interval: float = float(simulation_setting["frame_interval"])  # type:ignore
-    real_world_time_interval: float = float(
-        simulation_setting["real_world_time_interval"]  # type:ignore
-    )
-
-    # Set up the figure and axis
-    # fig, ax = plt.subplots(figsize=simulation_setting["fig_size"])
-    xlim: list[float | int] = simulation_setting["xlim"]  # type:ignore
-    ylim: list[float | int] = simulation_setting["ylim"]  # type:ignore
-    x_range: float | int = xlim[1] - xlim[0]
-    y_range: float | int = ylim[1] - ylim[0]
-    window_width_inch: float | int = simulation_setting["window_width_inch"]  # type:ignore
-
-    title_height_inch: float = 0.5
-    info_text_head_height_cm: float = 1.7
-    kinematics_info_height_cm: float = (
-        (2.8 / 5) * len(kinematics_info_text(bodies))
-        if simulation_setting["show_kinematics"]
-        else 0.0
-    )
-    info_text_box_height_inch: float = 0.393701 * (
-        info_text_head_height_cm + kinematics_info_height_cm
-    )
-    energy_bar_width: float = 1.0
-    energy_bar_padding: float | int = simulation_setting["energy_bar_padding"]  # type:ignore
-    below_title_padding: float = (info_text_box_height_inch + 0.3) * 72
-    energy_bar_vertical_margin: float = 0.1
-
-    fig: Figure = get_figure(
-        1,
-        2,
-        axis_width=[window_width_inch, energy_bar_width],
-        axis_height=window_width_inch * float(y_range) / float(x_range),
-        left_margin=1.0,
-        right_margin=1.5,
-        bottom_margin=1.0,
-        top_margin=below_title_padding / 72 + title_height_inch,
-        horizontal_padding=energy_bar_padding,
-    )
-    animation_axis: Axes = fig.get_axes()[0]
-    energy_bar_axis: Axes = fig.get_axes()[1]
-
-    accessories.add_objs(animation_axis)
-    forces.add_objs(animation_axis)
-    bodies.add_objs(animation_axis)
-
-    animation_axis.set_xlim(*xlim)  # type:ignore
-    animation_axis.set_ylim(*ylim)
-    if isinstance(simulation_setting["grid"], str):
-        animation_axis.grid(axis=simulation_setting["grid"])  # type:ignore
-    else:
-        animation_axis.grid(simulation_setting["grid"])  # type:ignore
-    animation_axis.set_aspect("equal")
-
-    if simulation_setting["1d"]:
-        animation_axis.axhline(y=0.0, color="black", linestyle="-", alpha=0.5)
-
-    info_text: Text = animation_axis.text(
-        0.01,
-        1.01,
-        "",
-        transform=animation_axis.transAxes,
-        va="bottom",
-    )
-
-    remove_axes_boundary(animation_axis)
-
-    (
-        _,
-        initial_energies,
-        (
-            force_potential_energy_bar_vertices,
-            kinetic_energy_bar_vertices,
-            dissipated_energy_bar_vertices,
-        ),
-    ) = energy_and_momentum_info(bodies, forces)
-    initial_total_energy: float = initial_energies.sum()
-
-    force_potential_energy_bar: Polygon = Polygon(
-        force_potential_energy_bar_vertices.T, color="#cc9933", alpha=0.5
-    )
-    kinetic_energy_bar: Polygon = Polygon(kinetic_energy_bar_vertices.T, color="blue", alpha=0.5)
-    dissipated_energy_bar: Polygon = Polygon(
-        dissipated_energy_bar_vertices.T, color="red", alpha=0.5
-    )
-
-    arrow_width_ratio: float = 0.1
-
-    body_potential_energy_arrow = Arrow(
-        x=1.5,
-        y=initial_energies[1],  # Start point
-        dx=-0.4,
-        dy=0,  # Direction and length
-        color="black",
-        alpha=0.5,
-        width=arrow_width_ratio * np.diff(np.array(energy_bar_axis.get_ylim()))[0],
-    )
-
-    potential_energy_arrow = Arrow(
-        x=1.5,
-        y=initial_energies[1:3].sum(),  # Start point
-        dx=-0.4,
-        dy=0,  # Direction and length
-        color="#cc9933",
-        alpha=0.8,
-        width=arrow_width_ratio * np.diff(np.array(energy_bar_axis.get_ylim()))[0],
-    )
+    simulation: Simulation = Simulation.from_file(input_file)
+    simulation_setting = simulation.simulation_setting
+    bodies: Bodies = simulation.bodies
+    accessories: Accessories = simulation.accessories
 
-    total_energy_arrow = Arrow(
-        x=1.5,
-        y=initial_energies[:3].sum(),  # Start point
-        dx=-0.4,
-        dy=0,  # Direction and length
-        color="blue",
-        alpha=0.8,
-        width=arrow_width_ratio * np.diff(np.array(energy_bar_axis.get_ylim()))[0],
-    )
-
-    energy_bar_axis.add_patch(force_potential_energy_bar)
-    energy_bar_axis.add_patch(kinetic_energy_bar)
-    energy_bar_axis.add_patch(dissipated_energy_bar)
-    energy_bar_axis.add_patch(body_potential_energy_arrow)
-    energy_bar_axis.add_patch(potential_energy_arrow)
-    energy_bar_axis.add_patch(total_energy_arrow)
+    if resume is not None:
+        simulation.resume(resume)
 
-    body_potential_energy_text: Text = energy_bar_axis.text(
-        1.6, initial_energies[1], r"$E_\mathrm{p, gravity}$", ha="left", va="top"
-    )
-    potential_energy_text: Text = energy_bar_axis.text(
-        1.6,
-        initial_energies[1:3].sum(),
-        r"$E_\mathrm{p, gravity}+E_\mathrm{p,spring}$",
-        ha="left",
-        va="top",
+    # frames of .gif are simulated first, and then rendered by a process pool
+    is_rendered_in_parallel: bool = (
+        not headless and bool(simulation_setting["save_to_gif"]) and render_processes > 1
     )
-    total_energy_text: Text = energy_bar_axis.text(
-        1.6,
-        initial_energies[:3].sum(),
-        r"$E_\mathrm{total}$",
-        ha="left",
-        va="top",
-    )
-    force_potential_energy_text: Text = energy_bar_axis.text(
-        0.5,
-        force_potential_energy_bar_vertices[1].mean(),
-        r"$E_\mathrm{p,spring}$",
-        ha="center",
-        va="center",
-    )
-    kinetic_energy_text: Text = energy_bar_axis.text(
-        0.5,
-        kinetic_energy_bar_vertices[1].mean(),
-        r"$E_\mathrm{k}$",
-        ha="center",
-        va="center",
-    )
-    dissipated_energy_text: Text = energy_bar_axis.text(
-        0.5,
-        dissipated_energy_bar_vertices[1].mean(),
-        r"$E_\mathrm{d}$",
-        ha="center",
-        va="center",
-    )
-
-    energy_levels: np.ndarray = np.array(
-        [
-            initial_energies[1],
-            initial_energies[1:3].sum(),
-            initial_energies[:3].sum(),
-            initial_energies.sum(),
-        ]
-    )
-    energy_bar_y_lim: list[float] = [
-        (1.0 + energy_bar_vertical_margin) * energy_levels.min()
-        - energy_bar_vertical_margin * energy_levels.max(0),
-        (1.0 + energy_bar_vertical_margin) * energy_levels.max()
-        - energy_bar_vertical_margin * energy_levels.min(),
-    ]
-
-    energy_bar_axis.set_xlim(0, 1.5)
-    energy_bar_axis.set_xticks([])
-    energy_bar_axis.set_ylim(*energy_bar_y_lim)
-
-    remove_axes_boundary(energy_bar_axis)
-
-    def init():
-        """Initialize animation"""
-        # ball.center = (0, 0)
-        info_text.set_text("")
-
-        return []
-
-    def animate(frame):
-        """Animation function"""
-        t = frame * real_world_time_interval  # convert frame number to time in sec
-
-        bodies.update(t, forces)
-        accessories.update(t)
-        forces.update_objs()
-
-        (
-            energy_info_texts,
-            energies,
-            (
-                force_potential_energy_bar_vertices,
-                kinetic_energy_bar_vertices,
-                dissipated_energy_bar_vertices,
-            ),
-        ) = energy_and_momentum_info(bodies, forces)
-
-        energy_levels = np.array(
-            [
-                energies[1],
-                energies[1:3].sum(),
-                energies[:3].sum(),
-                energies.sum(),
-            ]
-        )
-
-        ylim_min: float = (
-            1.0 + energy_bar_vertical_margin
-        ) * energy_levels.min() - energy_bar_vertical_margin * energy_levels.max()
-        if ylim_min < energy_bar_y_lim[0]:
-            energy_bar_y_lim[0] = ylim_min
-            energy_bar_axis.set_ylim(*energy_bar_y_lim)
-
-        ylim_max: float = (
-            1.0 + energy_bar_vertical_margin
-        ) * energy_levels.max() - energy_bar_vertical_margin * energy_levels.min()
-        if ylim_max > energy_bar_y_lim[1]:
-            energy_bar_y_lim[1] = ylim_max
-            energy_bar_axis.set_ylim(*energy_bar_y_lim)
-
-        force_potential_energy_bar.set_xy(force_potential_energy_bar_vertices.T)
-        kinetic_energy_bar.set_xy(kinetic_energy_bar_vertices.T)
-        dissipated_energy_bar.set_xy(dissipated_energy_bar_vertices.T)
-
-        arrow_width: float = (
-            arrow_width_ratio * np.diff(np.array(energy_bar_axis.get_ylim()))[0].item()
-        )
+    # otherwise, the worker process checkpoints and records its own simulation
+    is_physics_in_process: bool = headless or is_rendered_in_parallel or not physics_worker
 
-        body_potential_energy_arrow.set_data(y=energies[1], width=arrow_width)
-        body_potential_energy_text.set_y(energies[1])
+    if checkpoint is not None and is_physics_in_process:
+        simulation.set_checkpoint(checkpoint, checkpoint_every)
 
-        potential_energy_arrow.set_data(y=energies[1:3].sum(), width=arrow_width)
-        potential_energy_text.set_y(energies[1:3].sum())
+    recorder: TrajectoryRecorder | None = None
+    if record is not None and is_physics_in_process:
+        recorder = TrajectoryRecorder(record, len(bodies.bodies), bodies.locs.shape[1])
+        simulation.attach_recorder(recorder, every_sub_step=True)
 
-        total_energy_arrow.set_data(y=energies[:3].sum(), width=arrow_width)
-        total_energy_text.set_y(energies[:3].sum())
-
-        force_potential_energy_text.set_y(force_potential_energy_bar_vertices[1].mean())
-        kinetic_energy_text.set_y(kinetic_energy_bar_vertices[1].mean())
-        dissipated_energy_text.set_y(dissipated_energy_bar_vertices[1].mean())
-
-        info_text.set_text(
-            f"{t:.2f} sec. - frame: {frame}"
-            + "\n"
-            + "\n".join(energy_info_texts)
-            + (
-                "\n" + "\n".join(kinematics_info_text(bodies))
-                if simulation_setting["show_kinematics"]
-                else ""
+    if headless:
+        if t_end is None:
+            t_end = float(simulation_setting["real_world_time_interval"]) * int(
+                simulation_setting["num_frames"]
             )
+        logger.info(f"HEADLESS SIMULATION up to {t_end} sec.")
+        logger.info(f"\tintegrator: {bodies.integrator.__class__.__name__}")
+        simulation.run(t_end, output_filepath=output)
+        logger.info(
+            "simulation COMPLETED"
+            + f" - # accepted steps: {bodies.integrator.num_accepted_steps}"
+            + f", # rejected steps: {bodies.integrator.num_rejected_steps}"
         )
+        if recorder is not None:
+            recorder.close()
+        return
 
-        return []
-
+    frame_interval: float = float(simulation_setting["frame_interval"])  # type:ignore
+    real_world_time_interval: float = float(
+        simulation_setting["real_world_time_interval"]  # type:ignore
+    )
     num_frames: int = (
         simulation_setting["num_frames_saved"]  # type:ignore
         if simulation_setting["save_to_gif"]
         else simulation_setting["num_frames"]
     )
 
+    # from the frame of the current time, i.e., that of the checkpoint if resumed
+    frames: range = range(int(round(bodies.cur_time / real_world_time_interval)), num_frames)
+
     # simulation
 
     logger.info(
         f"SIMULATION w/ sim_time_step: {Bodies.SIM_TIME_STEP}"
         + f" and sim_time_step_const_vel: {Bodies.SIM_TIME_STEP_CONST_VEL}"
     )
+    logger.info(f"\tintegrator: {bodies.integrator.__class__.__name__}")
     logger.info(f"\t# total frames: {num_frames}")
     logger.info(
         f"\tone visualization update corresponds to {real_world_time_interval} sec. in real world"
@@ -351,19 +165,78 @@ def main(input_file: str) -> None:
         + f"{real_world_time_interval * num_frames} sec. in real world"
     )
 
-    anim = FuncAnimation(  # noqa: F841
-        fig,
-        animate,
-        init_func=init,
-        frames=num_frames,
-        interval=frame_interval,
-        blit=True,
-        repeat=simulation_setting["repeat"],
-    )
-
-    if simulation_setting["save_to_gif"]:
+    if is_rendered_in_parallel:
         num_frames_per_sec: int = simulation_setting["num_frames_per_sec"]  # type:ignore
         gif_filepath: str = simulation_setting["gif_filepath"]  # type:ignore
+        logger.info(
+            f"Start saving {len(frames)} frames"
+            + f" of dynamics simulation animation to {gif_filepath}"
+            + f" with fps: {num_frames_per_sec} rendered in parallel"
+            + " ..."
+        )
+        save_to_gif_in_parallel(
+            simulation, input_file, frames, gif_filepath, resume, render_processes
+        )
+        logger.info("saving COMPLETED")
+        logger.info(
+            f"\t# accepted steps: {bodies.integrator.num_accepted_steps}"
+            + f", # rejected steps: {bodies.integrator.num_rejected_steps}"
+        )
+        if recorder is not None:
+            recorder.close()
+        return
+
+    figure: SimulationFigure = SimulationFigure(simulation)
+
+    worker: PhysicsWorker | None = None
+    if not is_physics_in_process:
+        worker = PhysicsWorker(
+            input_file,
+            len(bodies.bodies),
+            bodies.locs.shape[1],
+            frames,
+            real_world_time_interval,
+            resume=resume,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+            record=record,
+        )
+        logger.info("\tphysics runs in a worker process")
+
+    def animate(frame):
+        """Animation function"""
+        energies_and_total_momentum: tuple[np.ndarray, np.ndarray] | None = None
+        if worker is None:
+            t = frame * real_world_time_interval  # convert frame number to time in sec
+            simulation.advance(t)
+        else:
+            # every frame for .gif, or the latest one without waiting for the worker
+            frame_state: dict[str, np.ndarray] | None = worker.read(
+                block=bool(simulation_setting["save_to_gif"])
+            )
+            if frame_state is None:
+                return figure.animated_artists
+
+            frame = int(frame_state["frames"])
+            t = frame * real_world_time_interval
+            bodies.set_state(
+                float(frame_state["times"]),
+                frame_state["locs"],
+                frame_state["vels"],
+                frame_state["dissipated_energies"],
+            )
+            energies_and_total_momentum = (
+                frame_state["energies"].copy(),
+                frame_state["momenta"].copy(),
+            )
+            worker.release()
+            accessories.advance(t)
+
+        return figure.draw(frame, energies_and_total_momentum)
+
+    if simulation_setting["save_to_gif"]:
+        num_frames_per_sec = simulation_setting["num_frames_per_sec"]  # type:ignore
+        gif_filepath = simulation_setting["gif_filepath"]  # type:ignore
         logger.info(
             f"Start saving {simulation_setting['num_frames_saved']} frames"
             + f" of dynamics simulation animation to {gif_filepath}"
@@ -375,21 +248,23 @@ def main(input_file: str) -> None:
             + f" {num_frames_per_sec * real_world_time_interval} times faster than real world"
         )
 
-        animation_axis.set_title(
-            str(simulation_setting["name"])
-            + f" - {real_world_time_interval * num_frames:.1f} sec."
-            + ", (up to) "
-            + f"{num_frames_per_sec * real_world_time_interval:g}x"
-            + " & "
-            + f"{num_frames_per_sec:g} fps"
-            + f"\ninitial total energy: {initial_total_energy:.2f}",
-            pad=below_title_padding,
+        # saving draws every frame in full anyway
+        writer = StreamingGifWriter(fps=num_frames_per_sec)
+        FuncAnimation(figure.fig, animate, init_func=figure.init, frames=frames).save(
+            gif_filepath, writer=writer
         )
-
-        writer = PillowWriter(fps=num_frames_per_sec)
-        anim.save(gif_filepath, writer=writer)
         logger.info("saving COMPLETED")
     else:
+        anim = BlittedAnimation(  # noqa: F841
+            figure.fig,
+            animate,
+            frames,
+            init_func=figure.init,
+            overlay_artists=figure.info_artists,
+            interval=frame_interval,
+            repeat=simulation_setting["repeat"],
+        )
+
         logger.info("Start animation")
         logger.info(f"\t(try to) update visualization every {frame_interval / 1000.0:.3f} sec")
         logger.info(f"\tthat is, (try to) show {1000.0/frame_interval:.1f} frames per sec")
@@ -398,17 +273,6 @@ def main(input_file: str) -> None:
             + f"{real_world_time_interval / frame_interval * 1000.0} times faster than real world"
         )
 
-        animation_axis.set_title(
-            str(simulation_setting["name"])
-            + f" - {real_world_time_interval * num_frames:.1f} sec."
-            + ", (up to) "
-            + f"{real_world_time_interval * 1000.0 / frame_interval:g}x"
-            + " & "
-            + f"{1./real_world_time_interval:g} fps"
-            + f"\ninitial total energy: {initial_total_energy:.2f}",
-            pad=below_title_padding,
-        )
-
         if simulation_setting["upper_left_window_corner_coordinate"] is not None:
             x_coordinate: int
             y_coordinate: int
@@ -425,6 +289,17 @@ def main(input_file: str) -> None:
         plt.show()
         logger.info("animation COMPLETED")
 
+    if worker is not None:
+        worker.close()
+    else:
+        logger.info(
+            f"\t# accepted steps: {bodies.integrator.num_accepted_steps}"
+            + f", # rejected steps: {bodies.integrator.num_rejected_steps}"
+        )
+
+    if recorder is not None:
+        recorder.close()
+
 
 if __name__ == "__main__":
     main()
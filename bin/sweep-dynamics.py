@@ -0,0 +1,40 @@
+"""
+run a scenario over grids of its constants in parallel without any figure
+"""
+
+from click import command, argument, option, Path
+from logging import Logger, getLogger
+
+from freq_used.logging_utils import set_logging_basic_config
+
+from dynamics.sweep import ParameterSweep
+
+logger: Logger = getLogger()
+
+
+@command()
+@argument("base_file", type=Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@argument("sweep_file", type=Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@option("--num-workers", type=int, default=None, help="# worker processes (# cores by default)")
+@option(
+    "--output",
+    type=Path(dir_okay=False, writable=True),
+    default="dynamics-sweep.npz",
+    show_default=True,
+    help="file for sweep results",
+)
+def main(base_file: str, sweep_file: str, num_workers: int | None, output: str) -> None:
+    set_logging_basic_config(__file__)
+
+    parameter_sweep: ParameterSweep = ParameterSweep.from_files(base_file, sweep_file)
+    logger.info(
+        f"SWEEP of {base_file} over {', '.join(parameter_sweep.constant_names)}"
+        + f" - {parameter_sweep.num_variants} variants"
+    )
+
+    parameter_sweep.run(num_workers, output)
+    logger.info("sweep COMPLETED")
+
+
+if __name__ == "__main__":
+    main()
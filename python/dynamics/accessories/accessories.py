@@ -2,9 +2,15 @@
 collection of accessories
 """
 
+from functools import reduce
+from typing import Sequence
+
+import numpy as np
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 
 from dynamics.accessories.accessory_base import AccessoryBase
+from dynamics.checkpoint import prefixed, unprefixed
 
 
 class Accessories:
@@ -12,9 +18,24 @@ class Accessories:
         self._accessories: list[AccessoryBase] = list(args)
 
     def update(self, time: float) -> None:
+        self.advance(time)
+        self.update_objs()
+
+    def advance(self, time: float) -> None:
         for accessory in self._accessories:
             accessory.update(time)
 
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        state: dict[str, np.ndarray] = dict()
+        for idx, accessory in enumerate(self._accessories):
+            state.update(prefixed(f"{idx}/", accessory.checkpoint_state()))
+        return state
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        for idx, accessory in enumerate(self._accessories):
+            accessory.restore_checkpoint_state(unprefixed(f"{idx}/", state))
         self.update_objs()
 
     # visualization
@@ -23,6 +44,20 @@ class Accessories:
         for accessory in self._accessories:
             accessory.add_objs(ax)
 
+    @property
+    def objs(self) -> Sequence[Artist]:
+        return reduce(
+            list.__add__, [list(accessory.objs) for accessory in self._accessories], list()
+        )
+
+    @property
+    def updated_objs(self) -> Sequence[Artist]:
+        return reduce(
+            list.__add__,
+            [list(accessory.updated_objs) for accessory in self._accessories],
+            list(),
+        )
+
     def update_objs(self) -> None:
         for accessory in self._accessories:
             accessory.update_objs()
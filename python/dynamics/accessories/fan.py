@@ -54,6 +54,13 @@ class Fan(AccessoryBase):
     def update(self, time: float) -> None:
         self._time = time
 
+    # checkpoint
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        return dict(time=np.array(self._time))
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        self._time = float(state["time"])
+
     # visualization
     def add_objs(self, ax: Axes) -> None:
         ax.add_patch(self._circle)
@@ -64,6 +71,10 @@ class Fan(AccessoryBase):
     def objs(self) -> Sequence[Artist]:
         return self._objs
 
+    @property
+    def updated_objs(self) -> Sequence[Artist]:
+        return self._blade_list
+
     def update_objs(self) -> None:
         blade_coordinates: np.ndarray = self._blade_coordinates
         for idx, blade in enumerate(self._blade_list):
@@ -0,0 +1,39 @@
+"""
+array operations shared by batched force kernels
+"""
+
+import numpy as np
+
+
+def scatter_add_rows(target: np.ndarray, rows: np.ndarray, values: np.ndarray) -> None:
+    """
+    target[..., rows[idx], :] += values[..., idx, :] for every idx in place,
+    accumulating (unlike fancy-index assignment) values whose rows are repeated
+
+    :param target: (..., # rows, dim)
+    :param rows: (# values,) row indices
+    :param values: (..., # values, dim)
+    """
+    num_rows: int = target.shape[-2]
+    dim: int = target.shape[-1]
+    num_leading: int = int(np.prod(target.shape[:-2], dtype=int))
+
+    flat_rows: np.ndarray = (
+        np.arange(num_leading)[:, np.newaxis] * num_rows + rows[np.newaxis, :]
+    ).ravel()
+    flat_values: np.ndarray = np.broadcast_to(
+        values, target.shape[:-2] + values.shape[-2:]
+    ).reshape(-1, dim)
+
+    for idx in range(dim):
+        target[..., idx] += np.bincount(
+            flat_rows, weights=flat_values[:, idx], minlength=num_leading * num_rows
+        ).reshape(target.shape[:-1])
+
+
+def ranks_within(counts: np.ndarray) -> np.ndarray:
+    """
+    :return: 0, 1, ..., counts[0] - 1, 0, 1, ..., counts[1] - 1, ...,
+    e.g., to expand (item, group) pairs to (item, member of group) pairs with np.repeat
+    """
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
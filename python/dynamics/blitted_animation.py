@@ -0,0 +1,155 @@
+"""
+animation blitting the whole figure over its cached background by the public blitting API
+of the canvas, i.e., copy_from_bbox, restore_region, draw_artist, and blit
+"""
+
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from matplotlib.artist import Artist
+from matplotlib.backend_bases import Event
+from matplotlib.figure import Figure
+
+
+class BlittedAnimation:
+    """
+    FuncAnimation with blit=True restores and blits every Axes of the animated artists
+    separately, which leaves those outside their Axes, e.g., the info text above the animation
+    axis and the labels beside the energy bars, drawn over each other, and caches the background
+    of an Axes whose limits have changed without redrawing it, i.e., with the stale ticks
+
+    instead, the background of the whole figure, i.e., all but the animated artists,
+    is cached after every full draw, e.g., the first one, after resizing, or when the limits
+    of any Axes really change, and every frame restores it and draws only the animated artists
+    on top of it, driven by a timer of the canvas
+
+    the overlay artists, e.g., the info text, which are animated but change less often than
+    every frame, are drawn onto a second cached background only when they have changed
+
+    it only shows the animation on canvases supporting blitting (and redraws the whole figure
+    every frame otherwise), so use FuncAnimation to save it
+    """
+
+    def __init__(
+        self,
+        fig: Figure,
+        func: Callable[[Any], Iterable[Artist]],
+        frames: Iterable[Any],
+        init_func: Callable[[], Iterable[Artist]] | None = None,
+        overlay_artists: Sequence[Artist] = (),
+        interval: float | int = 200,
+        repeat: bool = True,
+    ) -> None:
+        """
+        :param func: draws a frame, and returns the animated artists
+        :param init_func: resets the artists at the start (and every repeat), and returns
+        the animated artists
+        :param overlay_artists: those of the artists func returns, which change less often
+        :param interval: delay between frames in milliseconds
+        """
+        self._fig: Figure = fig
+        self._func: Callable[[Any], Iterable[Artist]] = func
+        self._frames: Iterable[Any] = frames
+        self._init_func: Callable[[], Iterable[Artist]] | None = init_func
+        self._overlay_artists: list[Artist] = list(overlay_artists)
+        self._repeat: bool = repeat
+        self._blits: bool = fig.canvas.supports_blit
+
+        self._frame_iterator: Iterator[Any] = iter(frames)
+        self._artists: list[Artist] = list()
+
+        self._background: Any = None
+        # limits of every Axes the background has been drawn with
+        self._background_limits: list[tuple[float, ...]] | None = None
+        # the background with the overlay artists drawn on it
+        self._overlay_background: Any = None
+
+        self._init()
+
+        # the canvas only keeps weak references to its callbacks, so, as with FuncAnimation,
+        # a reference to this has to be kept while the animation is shown
+        self._timer: Any = fig.canvas.new_timer(interval=int(interval))
+        self._timer.add_callback(self._step)
+        fig.canvas.mpl_connect("draw_event", self._on_draw)
+        fig.canvas.mpl_connect("close_event", self._on_close)
+        self._first_draw_cid: int = fig.canvas.mpl_connect("draw_event", self._start)
+
+    # animation
+
+    def _init(self) -> None:
+        self._artists = [] if self._init_func is None else list(self._init_func())
+        for artist in self._artists:
+            artist.set_animated(self._blits)
+        self._overlay_background = None
+
+    def _start(self, event: Event) -> None:
+        self._fig.canvas.mpl_disconnect(self._first_draw_cid)
+        self._timer.start()
+
+    def _on_close(self, event: Event) -> None:
+        self._timer.stop()
+
+    def _step(self) -> None:
+        try:
+            frame: Any = next(self._frame_iterator)
+        except StopIteration:
+            if not self._repeat:
+                self._timer.stop()
+                return
+
+            self._frame_iterator = iter(self._frames)
+            self._init()
+            frame = next(self._frame_iterator)
+
+        # drawn in the order of zorder as in a full draw
+        self._artists = sorted(self._func(frame), key=lambda artist: artist.get_zorder())
+
+        if self._blits:
+            self._blit()
+        else:
+            self._fig.canvas.draw_idle()
+
+    # blitting
+
+    def _limits(self) -> list[tuple[float, ...]]:
+        return [tuple(ax.get_xlim()) + tuple(ax.get_ylim()) for ax in self._fig.axes]
+
+    def _on_draw(self, event: Event) -> None:
+        """
+        cache the background right after a full draw, which skips the animated artists,
+        and draw them on top of it so that they are shown until the next frame
+        """
+        if not self._blits:
+            return
+
+        canvas = self._fig.canvas
+        self._background = canvas.copy_from_bbox(self._fig.bbox)
+        self._background_limits = self._limits()
+        self._overlay_background = None
+
+        for artist in self._artists:
+            self._fig.draw_artist(artist)
+
+    def _blit(self) -> None:
+        canvas = self._fig.canvas
+
+        if self._background is None or self._limits() != self._background_limits:
+            # full redraw, after which _on_draw caches the background again
+            canvas.draw()
+
+        if self._overlay_background is None or any(
+            artist.stale for artist in self._overlay_artists
+        ):
+            canvas.restore_region(self._background)
+            for artist in self._overlay_artists:
+                self._fig.draw_artist(artist)
+                # empty texts are not drawn, so are left stale
+                artist.stale = False
+            self._overlay_background = canvas.copy_from_bbox(self._fig.bbox)
+        else:
+            canvas.restore_region(self._overlay_background)
+
+        overlay_artists: set[Artist] = set(self._overlay_artists)
+        for artist in self._artists:
+            if artist not in overlay_artists:
+                self._fig.draw_artist(artist)
+        canvas.blit(self._fig.bbox)
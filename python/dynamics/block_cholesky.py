@@ -0,0 +1,167 @@
+"""
+block-banded Cholesky factorization of sparse symmetric positive definite matrices,
+e.g., of the min energy system, reused by every later solve with the same matrix
+"""
+
+import numpy as np
+from numpy.linalg import cholesky, inv
+
+from dynamics.sparse_matrix import SparseMatrix
+
+
+class BlockCholesky:
+    """
+    L L^T of the matrix permuted by reverse Cuthill-McKee, whose entries then lie within a band,
+    e.g., of about the width of a lattice, out of which the factor does not fill in,
+    so it is kept as (block size, block size) blocks on block bandwidth + 1 block diagonals,
+    and both the factorization and the solves are products of blocks (for many vectors at once)
+
+    small dense matrices are factorized as a few full blocks
+    """
+
+    MIN_BLOCK_SIZE: int = 32
+    MAX_BLOCK_SIZE: int = 256
+
+    def __init__(self, matrix: SparseMatrix, max_num_bytes: int | None = None) -> None:
+        """
+        LinAlgError is raised if the matrix is not positive definite
+
+        :param max_num_bytes: MemoryError is raised instead of factorizing if the factor would
+        take more bytes, e.g., for matrices without any narrow band
+        """
+        self._size: int = matrix.size
+        self._order: np.ndarray = matrix.reverse_cuthill_mckee_order()
+        positions: np.ndarray = np.empty(self._size, int)
+        positions[self._order] = np.arange(self._size)
+
+        _rows, _cols, values = matrix.entries
+        rows: np.ndarray = positions[_rows]
+        cols: np.ndarray = positions[_cols]
+        bandwidth: int = int(np.abs(rows - cols).max(initial=0))
+
+        block_size: int = min(
+            max(bandwidth, self.MIN_BLOCK_SIZE), self.MAX_BLOCK_SIZE, max(self._size, 1)
+        )
+        block_bandwidth: int = -(-bandwidth // block_size)
+        num_blocks: int = -(-self._size // block_size)
+
+        num_bytes: int = num_blocks * (block_bandwidth + 2) * block_size**2 * 8
+        if max_num_bytes is not None and num_bytes > max_num_bytes:
+            raise MemoryError(f"the factor would take {num_bytes} bytes (> {max_num_bytes})")
+
+        # the block of the block row idx and the block column idx - offset at [idx, offset]
+        self._blocks: np.ndarray = np.zeros(
+            (num_blocks, block_bandwidth + 1, block_size, block_size)
+        )
+        is_lower: np.ndarray = rows // block_size >= cols // block_size
+        rows, cols, values = rows[is_lower], cols[is_lower], values[is_lower]
+        self._blocks[
+            rows // block_size,
+            rows // block_size - cols // block_size,
+            rows % block_size,
+            cols % block_size,
+        ] = values
+
+        # the last block is padded with the identity
+        padding: np.ndarray = np.arange(self._size, num_blocks * block_size)
+        self._blocks[padding // block_size, 0, padding % block_size, padding % block_size] = 1.0
+
+        self._inverse_diagonal_blocks: np.ndarray = np.zeros((num_blocks, block_size, block_size))
+        self._factorize()
+
+    # getters
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def block_size(self) -> int:
+        return self._blocks.shape[-1]
+
+    @property
+    def block_bandwidth(self) -> int:
+        return self._blocks.shape[1] - 1
+
+    @property
+    def num_bytes(self) -> int:
+        return self._blocks.nbytes + self._inverse_diagonal_blocks.nbytes
+
+    # factorization
+
+    def _row_blocks(self, idx: int, first_offset: int, num_offsets: int) -> np.ndarray:
+        """
+        (block size, num_offsets * block size) blocks of the block row idx at the block columns
+        idx - first_offset, idx - first_offset - 1, ... side by side
+        """
+        block_size: int = self.block_size
+        return (
+            self._blocks[idx, first_offset : first_offset + num_offsets]
+            .transpose(1, 0, 2)
+            .reshape(block_size, num_offsets * block_size)
+        )
+
+    def _factorize(self) -> None:
+        """
+        in place and block row by block row, i.e., each block of L from those of the block rows
+        above it and the (lower) block of the matrix at it
+        """
+        block_bandwidth: int = self.block_bandwidth
+
+        for idx in range(self._blocks.shape[0]):
+            for offset in range(min(idx, block_bandwidth), -1, -1):
+                _idx: int = idx - offset
+                # over the block columns left of _idx within the band of both block rows
+                num_offsets: int = min(idx, block_bandwidth) - offset
+                block: np.ndarray = (
+                    self._blocks[idx, offset]
+                    - self._row_blocks(idx, offset + 1, num_offsets)
+                    @ self._row_blocks(_idx, 1, num_offsets).T
+                )
+
+                if offset > 0:
+                    self._blocks[idx, offset] = block @ self._inverse_diagonal_blocks[_idx].T
+                else:
+                    self._blocks[idx, 0] = cholesky(block)
+                    self._inverse_diagonal_blocks[idx] = inv(self._blocks[idx, 0])
+
+    # solving
+
+    def solve(self, b_1d: np.ndarray) -> np.ndarray:
+        """
+        solve the system for (..., size) vectors by forward and back substitution
+        """
+        assert b_1d.shape[-1] == self._size, (b_1d.shape, self._size)
+        num_blocks: int = self._blocks.shape[0]
+        block_size: int = self.block_size
+        num_vectors: int = int(np.prod(b_1d.shape[:-1]))
+
+        y_2d: np.ndarray = np.zeros((num_blocks * block_size, num_vectors))
+        y_2d[: self._size] = b_1d.reshape(num_vectors, self._size).T[self._order]
+        y_2d = y_2d.reshape(num_blocks, block_size, num_vectors)
+
+        # L y = b
+        for idx in range(num_blocks):
+            num_offsets: int = min(idx, self.block_bandwidth)
+            left_y_2d: np.ndarray = y_2d[idx - num_offsets : idx][::-1]
+            y_2d[idx] = self._inverse_diagonal_blocks[idx] @ (
+                y_2d[idx]
+                - self._row_blocks(idx, 1, num_offsets)
+                @ left_y_2d.reshape(num_offsets * block_size, num_vectors)
+            )
+
+        # L^T x = y, whose blocks right of the diagonal are the transposes of those below it
+        for idx in range(num_blocks - 1, -1, -1):
+            num_offsets = min(num_blocks - 1 - idx, self.block_bandwidth)
+            offsets: np.ndarray = np.arange(1, num_offsets + 1)
+            lower_blocks: np.ndarray = self._blocks[idx + offsets, offsets]
+            right_y_2d: np.ndarray = y_2d[idx + 1 : idx + num_offsets + 1]
+            y_2d[idx] = self._inverse_diagonal_blocks[idx].T @ (
+                y_2d[idx]
+                - lower_blocks.reshape(num_offsets * block_size, block_size).T
+                @ right_y_2d.reshape(num_offsets * block_size, num_vectors)
+            )
+
+        x_2d: np.ndarray = np.empty((self._size, num_vectors))
+        x_2d[self._order] = y_2d.reshape(num_blocks * block_size, num_vectors)[: self._size]
+        return x_2d.T.reshape(b_1d.shape)
@@ -12,6 +12,9 @@ from matplotlib.artist import Artist
 
 from dynamics.bodies.body_base import BodyBase
 from dynamics.bodies.fixed_body_base import FixedBodyBase
+from dynamics.checkpoint import prefixed, unprefixed
+from dynamics.integrators.integrator_base import IntegratorBase
+from dynamics.integrators.predictor_corrector import PredictorCorrector
 
 
 class Bodies:
@@ -26,19 +29,54 @@ class Bodies:
         cls.SIM_TIME_STEP = sim_time_step
         cls.SIM_TIME_STEP_CONST_VEL = sim_time_step_const_vel
 
+    @classmethod
+    def time_step_length(cls, vels: np.ndarray) -> float:
+        """
+        return the simulation time step length for (..., # bodies, dim) velocities
+        """
+        max_vel: float = norm(vels, axis=-1).max().item() if vels.size > 0 else 0.0
+        return min(
+            cls.SIM_TIME_STEP, cls.SIM_TIME_STEP_CONST_VEL / (max_vel if max_vel > 0.0 else 1.0)
+        )
+
     def __init__(self, *args) -> None:
         self._bodies: list[BodyBase] = list(args)
         self._cur_time: float = 0.0
 
-        self._body_start_coordinate_map: dict[int, int | None] = dict()
-
-        self._num_coordinates: int = 0
-        for body in self.bodies:
-            if isinstance(body, FixedBodyBase):
-                self._body_start_coordinate_map[id(body)] = None
-            else:
-                self._body_start_coordinate_map[id(body)] = self._num_coordinates
-                self._num_coordinates += body.loc.size
+        # structure-of-arrays state store
+        #   rows [0, num_free_bodies) are the (integrated) free bodies in the order of appearance,
+        #   and the rows after them are the fixed bodies, which are never integrated
+
+        free_bodies: list[BodyBase] = [
+            body for body in self.bodies if not isinstance(body, FixedBodyBase)
+        ]
+        fixed_bodies: list[BodyBase] = [
+            body for body in self.bodies if isinstance(body, FixedBodyBase)
+        ]
+
+        self._free_bodies: list[BodyBase] = free_bodies
+        self._num_free_bodies: int = len(free_bodies)
+        self._dim: int = self.bodies[0].loc.size if self.bodies else 2
+        assert all(body.loc.size == self._dim for body in self.bodies), [
+            body.loc.size for body in self.bodies
+        ]
+
+        num_bodies: int = len(self.bodies)
+        self._locs: np.ndarray = np.zeros((num_bodies, self._dim))
+        self._vels: np.ndarray = np.zeros((num_bodies, self._dim))
+        self._masses: np.ndarray = np.zeros(num_bodies)
+        self._dissipated_energies: np.ndarray = np.zeros(num_bodies)
+
+        self._body_row_map: dict[int, int] = dict()
+        for row, body in enumerate(free_bodies + fixed_bodies):
+            assert id(body) not in self._body_row_map, body
+            self._body_row_map[id(body)] = row
+            self._masses[row] = body.mass
+            body.bind_state(self._locs[row], self._vels[row], self._dissipated_energies[row, ...])
+
+        self._num_coordinates: int = self._num_free_bodies * self._dim
+
+        self._integrator: IntegratorBase = PredictorCorrector()
 
     # getters
 
@@ -46,51 +84,195 @@ class Bodies:
     def bodies(self) -> list[BodyBase]:
         return self._bodies
 
+    @property
+    def num_free_bodies(self) -> int:
+        return self._num_free_bodies
+
+    @property
+    def locs(self) -> np.ndarray:
+        """
+        (# bodies, dim) locations - the first num_free_bodies rows are those of free bodies
+        """
+        return self._locs
+
+    @property
+    def vels(self) -> np.ndarray:
+        return self._vels
+
+    @property
+    def masses(self) -> np.ndarray:
+        return self._masses
+
+    @property
+    def dissipated_energies(self) -> np.ndarray:
+        return self._dissipated_energies
+
+    @property
+    def integrator(self) -> IntegratorBase:
+        return self._integrator
+
+    def row(self, body: BodyBase) -> int:
+        """
+        return the row of body in the state store
+        """
+        assert id(body) in self._body_row_map, body
+        return self._body_row_map[id(body)]
+
     # setters
 
+    def set_integrator(self, integrator: IntegratorBase) -> None:
+        self._integrator = integrator
+
     def set_body_locs(self, locs: np.ndarray) -> None:
-        for body in self.bodies:
-            if isinstance(body, FixedBodyBase):
-                continue
-            body.loc = locs[list(self.coordinate_indices(body))]
-            body.vel = np.zeros_like(body.vel)
-            body.update_objs()
+        assert locs.size == self.num_coordinates, (locs.size, self.num_coordinates)
+        self._locs[: self.num_free_bodies] = locs.reshape(self.num_free_bodies, self._dim)
+        self._vels[: self.num_free_bodies] = 0.0
+        self.update_objs()
+
+    def set_state(
+        self, time: float, locs: np.ndarray, vels: np.ndarray, dissipated_energies: np.ndarray
+    ) -> None:
+        """
+        set the state store to that of all the bodies advanced elsewhere, e.g., by another process,
+        in place, since the bodies are bound to its rows
+        """
+        assert locs.shape == self._locs.shape, (locs.shape, self._locs.shape)
+        self._cur_time = float(time)
+        self._locs[...] = locs
+        self._vels[...] = vels
+        self._dissipated_energies[...] = dissipated_energies
 
     # simulation
 
+    @property
+    def cur_time(self) -> float:
+        return self._cur_time
+
     def update(self, next_time: float, forces: Any) -> None:
+        self.advance(next_time, forces)
+        self.update_objs()
+
+    def advance(self, next_time: float, forces: Any) -> None:
+        """
+        advance the state to next_time without touching the visualization objects
+        """
         assert next_time >= self._cur_time, (next_time, self._cur_time)
         if next_time == self._cur_time:
             return
 
-        max_vel: float = max([norm(body._cur_vel).item() for body in self.bodies])
+        self._update_bodies(next_time, self.time_step_length(self._vels), forces)
+        self._cur_time = next_time
 
-        t_step: float = min(
-            self.SIM_TIME_STEP, self.SIM_TIME_STEP_CONST_VEL / (max_vel if max_vel > 0.0 else 1.0)
+    def _update_bodies(self, next_time: float, t_step: float, forces: Any) -> None:
+        num_free_bodies: int = self.num_free_bodies
+
+        locs: np.ndarray = self._locs[:num_free_bodies].copy()
+        vels: np.ndarray = self._vels[:num_free_bodies].copy()
+
+        def force_function(
+            time: float, _locs: np.ndarray, _vels: np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray]:
+            return self.free_body_force(time, forces, _locs, _vels)
+
+        dissipated_energy: np.ndarray = self._integrator.advance(
+            self._cur_time,
+            next_time,
+            t_step,
+            locs,
+            vels,
+            self._masses[:num_free_bodies],
+            force_function,
         )
-        self._update_bodies(next_time, t_step, forces)
-        self._cur_time = next_time
 
-        self.update_objs()
+        self._locs[:num_free_bodies] = locs
+        self._vels[:num_free_bodies] = vels
+        self._dissipated_energies[:num_free_bodies] += dissipated_energy
+
+    def with_fixed_rows(self, free_array: np.ndarray, is_vel: bool = False) -> np.ndarray:
+        """
+        append the fixed-body rows of the store to (..., # free bodies, dim) locations
+        (or velocities if is_vel) to get (..., # bodies, dim) arrays
+        """
+        fixed_array: np.ndarray = (self._vels if is_vel else self._locs)[self.num_free_bodies :]
+        return np.concatenate(
+            (
+                free_array,
+                np.broadcast_to(fixed_array, free_array.shape[:-2] + fixed_array.shape),
+            ),
+            axis=-2,
+        )
 
-    def _update_bodies(self, next_time: float, t_step: float, forces: Any) -> None:
-        t_stamps: np.ndarray = np.hstack((np.arange(self._cur_time, next_time, t_step), next_time))
-        for idx, t_1 in enumerate(t_stamps[:-1]):
-            for body in self.bodies:
-                body.update(t_1, t_stamps[idx + 1], forces)
+    def free_body_force(
+        self, time: float, forces: Any, locs: np.ndarray, vels: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        evaluate forces exerted on the free bodies located at locs with velocities vels,
+        using the batched force kernels if every force supports them, otherwise body by body
+
+        :return: (..., # free bodies, dim) total forces and frictional forces
+        """
+        num_free_bodies: int = self.num_free_bodies
+
+        if forces.supports_batched_force:
+            force, frictional_force = forces.batched_force(
+                time, self.with_fixed_rows(locs), self.with_fixed_rows(vels, True), self._masses
+            )
+            return force[..., :num_free_bodies, :], frictional_force[..., :num_free_bodies, :]
+
+        # per-body fallback for forces without batched kernels, which read bodies' own states
+        assert locs.ndim == 2, locs.shape
+        self._locs[:num_free_bodies] = locs
+        self._vels[:num_free_bodies] = vels
+
+        force = np.zeros_like(locs)
+        frictional_force = np.zeros_like(locs)
+        for row, body in enumerate(self._free_bodies):
+            force[row], frictional_force[row] = body.force(time)
+
+        return force, frictional_force
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """
+        the current time, the state store, and the state of the integrator under integrator/
+        """
+        state: dict[str, np.ndarray] = dict(
+            cur_time=np.array(self._cur_time),
+            locs=self._locs.copy(),
+            vels=self._vels.copy(),
+            dissipated_energies=self._dissipated_energies.copy(),
+            integrator_name=np.array(self._integrator.__class__.__name__),
+        )
+        state.update(prefixed("integrator/", self._integrator.checkpoint_state()))
+        return state
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        assert state["locs"].shape == self._locs.shape, (state["locs"].shape, self._locs.shape)
+        assert str(state["integrator_name"]) == self._integrator.__class__.__name__, (
+            str(state["integrator_name"]),
+            self._integrator.__class__.__name__,
+        )
+
+        self.set_state(
+            float(state["cur_time"]), state["locs"], state["vels"], state["dissipated_energies"]
+        )
+        self._integrator.restore_checkpoint_state(unprefixed("integrator/", state))
+
+        self.update_objs()
 
     # energy
 
     @property
     def total_kinetic_energy(self) -> float:
-        return sum([body.kinetic_energy for body in self.bodies])
+        return 0.5 * float((self._masses * np.square(self._vels).sum(axis=-1)).sum())
 
     def total_potential_energy(self, forces: Any) -> float:
         return sum([body.body_potential_energy(forces) for body in self.bodies])
 
     @property
     def total_dissipated_energy(self) -> float:
-        return sum([body.dissipated_energy for body in self.bodies])
+        return float(self._dissipated_energies.sum())
 
     # potential energy solving
 
@@ -98,21 +280,24 @@ class Bodies:
     def num_coordinates(self) -> int:
         return self._num_coordinates
 
-    def coordinate_indices(self, body: BodyBase) -> tuple[int, ...]:
-        assert id(body) in self._body_start_coordinate_map, (
-            list(self._body_start_coordinate_map.keys()),
-            id(body),
-        )
-        start_idx: int | None = self._body_start_coordinate_map[id(body)]
-        assert start_idx is not None, body
+    def coordinate_slice(self, body: BodyBase) -> slice:
+        """
+        return the slice of body's coordinates in the flattened free-body block of the store
+        """
+        row: int = self.row(body)
+        assert row < self.num_free_bodies, body
 
-        return tuple(range(start_idx, start_idx + body.loc.size))
+        return slice(row * self._dim, (row + 1) * self._dim)
+
+    def coordinate_indices(self, body: BodyBase) -> tuple[int, ...]:
+        coordinate_slice: slice = self.coordinate_slice(body)
+        return tuple(range(coordinate_slice.start, coordinate_slice.stop))
 
     # momentum
 
     @property
     def total_momentum(self) -> np.ndarray:
-        return np.vstack([body.momentum for body in self.bodies]).sum(axis=0)
+        return (self._masses[:, np.newaxis] * self._vels).sum(axis=0)
 
     # visualization
 
@@ -26,7 +26,24 @@ class BodyBase(ObjBase):
         )
 
         self._forces: list[Any] = list()
-        self._dissipated_energy: float = 0.0
+        self._dissipated_energy: np.ndarray = np.zeros(())
+
+    def bind_state(self, loc: np.ndarray, vel: np.ndarray, dissipated_energy: np.ndarray) -> None:
+        """
+        copy the current state into the given arrays and keep them as views from now on,
+        i.e., the arrays are (row) views into the state store owned by Bodies
+        """
+        assert loc.shape == self._cur_loc.shape, (loc.shape, self._cur_loc.shape)
+        assert vel.shape == self._cur_vel.shape, (vel.shape, self._cur_vel.shape)
+        assert dissipated_energy.shape == (), dissipated_energy.shape
+
+        loc[...] = self._cur_loc
+        vel[...] = self._cur_vel
+        dissipated_energy[...] = self._dissipated_energy
+
+        self._cur_loc = loc
+        self._cur_vel = vel
+        self._dissipated_energy = dissipated_energy
 
     def force(self, time: float) -> tuple[np.ndarray, np.ndarray]:
         frictional_force_list: list[np.ndarray] = [
@@ -45,7 +62,7 @@ class BodyBase(ObjBase):
         non_frictional_force: np.ndarray = (
             np.vstack(non_frictional_force_list).sum(axis=0)
             if non_frictional_force_list
-            else np.zeros(self.loc)
+            else np.zeros_like(self.loc)
         )
 
         return non_frictional_force + frictional_force, frictional_force
@@ -53,23 +70,6 @@ class BodyBase(ObjBase):
     def register_force(self, force: Any) -> None:
         self._forces.append(force)
 
-    def update(self, t_1: float, t_2: float, forces: Any) -> None:
-        ori_loc: np.ndarray = self.loc.copy()
-        ori_vel: np.ndarray = self.vel.copy()
-
-        force_1, frictional_force_1 = self.force((t_1 + t_2) / 2.0)
-        self._cur_loc += (t_2 - t_1) * self.vel
-        force_2, frictional_force_2 = self.force((t_1 + t_2) / 2.0)
-
-        force: np.ndarray = (force_1 + force_2) / 2.0
-        frictional_force: np.ndarray = (frictional_force_1 + frictional_force_2) / 2.0
-        self._cur_vel += (t_2 - t_1) * force / self.mass
-
-        avg_vel: np.ndarray = (ori_vel + self.vel) / 2.0
-        self._cur_loc = ori_loc + (t_2 - t_1) * avg_vel
-
-        self._dissipated_energy += -np.dot(frictional_force, self.vel) * (t_2 - t_1)
-
     @property
     def mass(self) -> float:
         return self._mass
@@ -81,7 +81,7 @@ class BodyBase(ObjBase):
     @loc.setter
     def loc(self, value: np.ndarray) -> None:
         assert self.loc.shape == value.shape, (self.loc.shape, value.shape)
-        self._cur_loc = value
+        self._cur_loc[...] = value
 
     @property
     def vel(self) -> np.ndarray:
@@ -90,7 +90,7 @@ class BodyBase(ObjBase):
     @vel.setter
     def vel(self, value: np.ndarray) -> None:
         assert self.vel.shape == value.shape, (self.vel.shape, value.shape)
-        self._cur_vel = value
+        self._cur_vel[...] = value
 
     @property
     def loc_text(self):
@@ -109,7 +109,7 @@ class BodyBase(ObjBase):
 
     @property
     def dissipated_energy(self) -> float:
-        return self._dissipated_energy
+        return float(self._dissipated_energy)
 
     @property
     def momentum(self) -> np.ndarray:
@@ -27,9 +27,6 @@ class VerticalPin2D(FixedBodyBase):
 
         self._circle: Circle = Circle(tuple(self.loc), **circ_kwargs)
 
-    def update(self, t_1: float, t_2: float, forces: Any) -> None:
-        pass
-
     @property
     def kinetic_energy(self) -> float:
         return 0.0
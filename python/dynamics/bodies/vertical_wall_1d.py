@@ -30,9 +30,6 @@ class VerticalWall1D(FixedBodyBase):
 
         self._polygon: Polygon = Polygon(vertices, **plt_kwargs)
 
-    def update(self, t_1: float, t_2: float, forces: Any) -> None:
-        pass
-
     @property
     def kinetic_energy(self) -> float:
         return 0.0
@@ -0,0 +1,35 @@
+"""
+checkpoint files, i.e., .npz files of the arrays of the simulation state keyed by their paths,
+e.g., bodies/locs or forces/3/cur_x
+"""
+
+import os
+
+import numpy as np
+
+
+def prefixed(prefix: str, state: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {prefix + key: value for key, value in state.items()}
+
+
+def unprefixed(prefix: str, state: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    the part of state under prefix without the prefix
+    """
+    return {key[len(prefix) :]: value for key, value in state.items() if key.startswith(prefix)}
+
+
+def save_checkpoint(filepath: str, state: dict[str, np.ndarray]) -> None:
+    """
+    save state to filepath via a temporary file, so that the previous checkpoint survives
+    if the process dies while saving
+    """
+    temp_filepath: str = filepath + ".tmp"
+    with open(temp_filepath, "wb") as fid:
+        np.savez(fid, **state)
+    os.replace(temp_filepath, filepath)
+
+
+def load_checkpoint(filepath: str) -> dict[str, np.ndarray]:
+    with np.load(filepath, allow_pickle=False) as npz_file:
+        return {key: npz_file[key] for key in npz_file.files}
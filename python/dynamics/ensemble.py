@@ -0,0 +1,192 @@
+"""
+ensemble of many copies of one body/force topology simulated at once
+"""
+
+import numpy as np
+
+from dynamics.bodies.bodies import Bodies
+from dynamics.forces.forces import Forces
+from dynamics.integrators.integrator_base import IntegratorBase
+
+
+class Ensemble:
+    """
+    every member shares bodies (masses and fixed bodies), forces, and an integrator of the same
+    type and settings as that of Bodies (but not its state, e.g., step length or callback),
+    and has its own (free-body) locations and velocities, which are stored as
+    (# members, # free bodies, dim) arrays so that all force kernels and integrator steps
+    are broadcast over the members
+    """
+
+    def __init__(
+        self,
+        bodies: Bodies,
+        forces: Forces,
+        locs: np.ndarray,
+        vels: np.ndarray | None = None,
+        integrator: IntegratorBase | None = None,
+    ) -> None:
+        """
+        :param locs: (# members, # free bodies, dim) initial locations
+        :param vels: (# members, # free bodies, dim) initial velocities (zeros by default)
+        :param integrator: a fresh copy of the integrator of bodies by default
+        """
+        assert forces.supports_batched_force, "every force should support batched force kernels"
+
+        free_shape: tuple[int, ...] = bodies.locs[: bodies.num_free_bodies].shape
+        assert locs.ndim == 3 and locs.shape[1:] == free_shape, (locs.shape, free_shape)
+
+        self._bodies: Bodies = bodies
+        self._forces: Forces = forces
+        self._integrator: IntegratorBase = (
+            bodies.integrator.fresh_copy() if integrator is None else integrator
+        )
+
+        self._locs: np.ndarray = np.array(locs, float)
+        self._vels: np.ndarray = (
+            np.zeros_like(self._locs) if vels is None else np.array(vels, float)
+        )
+        assert self._vels.shape == self._locs.shape, (self._vels.shape, self._locs.shape)
+        self._dissipated_energies: np.ndarray = np.zeros(self._locs.shape[:-1])
+
+        self._cur_time: float = bodies.cur_time
+
+    @classmethod
+    def perturbed(
+        cls,
+        bodies: Bodies,
+        forces: Forces,
+        num_members: int,
+        loc_std: float = 0.0,
+        vel_std: float = 0.0,
+        seed: int | None = None,
+    ) -> "Ensemble":
+        """
+        create an ensemble whose members start from the current state of bodies
+        perturbed by Gaussian noise
+        """
+        rng: np.random.Generator = np.random.default_rng(seed)
+        free_shape: tuple[int, ...] = (num_members,) + bodies.locs[: bodies.num_free_bodies].shape
+
+        return cls(
+            bodies,
+            forces,
+            bodies.locs[: bodies.num_free_bodies] + loc_std * rng.standard_normal(free_shape),
+            bodies.vels[: bodies.num_free_bodies] + vel_std * rng.standard_normal(free_shape),
+        )
+
+    # getters
+
+    @property
+    def num_members(self) -> int:
+        return self._locs.shape[0]
+
+    @property
+    def cur_time(self) -> float:
+        return self._cur_time
+
+    @property
+    def locs(self) -> np.ndarray:
+        return self._locs
+
+    @property
+    def vels(self) -> np.ndarray:
+        return self._vels
+
+    @property
+    def dissipated_energies(self) -> np.ndarray:
+        return self._dissipated_energies
+
+    # simulation
+
+    def advance(self, next_time: float) -> None:
+        assert next_time >= self._cur_time, (next_time, self._cur_time)
+        if next_time == self._cur_time:
+            return
+
+        def force_function(
+            time: float, locs: np.ndarray, vels: np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray]:
+            return self._bodies.free_body_force(time, self._forces, locs, vels)
+
+        self._dissipated_energies += self._integrator.advance(
+            self._cur_time,
+            next_time,
+            Bodies.time_step_length(self._vels),
+            self._locs,
+            self._vels,
+            self._bodies.masses[: self._bodies.num_free_bodies],
+            force_function,
+        )
+        self._cur_time = next_time
+
+    def run(self, t_end: float, sample_every: float) -> dict[str, np.ndarray]:
+        """
+        :return: sample times, (# samples, # members, # free bodies, dim) locations and velocities,
+        (# samples, # members, 4) energies, i.e., kinetic, body potential, spring potential,
+        and dissipated energies, and (# samples, # members, dim) momenta
+        """
+        assert sample_every > 0.0, sample_every
+        assert t_end >= self._cur_time, (t_end, self._cur_time)
+
+        num_samples: int = int(np.floor((t_end - self._cur_time) / sample_every + 1e-9)) + 1
+        times: np.ndarray = self._cur_time + sample_every * np.arange(num_samples)
+
+        locs: np.ndarray = np.zeros((num_samples,) + self._locs.shape)
+        vels: np.ndarray = np.zeros_like(locs)
+        energies: np.ndarray = np.zeros((num_samples, self.num_members, 4))
+        momenta: np.ndarray = np.zeros((num_samples, self.num_members, self._locs.shape[-1]))
+
+        for idx, time in enumerate(times):
+            self.advance(time)
+
+            locs[idx] = self._locs
+            vels[idx] = self._vels
+            energies[idx] = self.energies
+            momenta[idx] = self.total_momentum
+
+        return dict(times=times, locs=locs, vels=vels, energies=energies, momenta=momenta)
+
+    # energy & momentum for all the members at once
+
+    @property
+    def total_kinetic_energy(self) -> np.ndarray:
+        return 0.5 * (
+            self._bodies.masses[: self._bodies.num_free_bodies] * np.square(self._vels).sum(axis=-1)
+        ).sum(axis=-1)
+
+    @property
+    def potential_energy(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: (# members,) non-spring (including body) potential energy,
+        (# members,) spring potential energy
+        """
+        return self._forces.batched_potential_energy(
+            self._bodies.with_fixed_rows(self._locs), self._bodies.masses
+        )
+
+    @property
+    def total_dissipated_energy(self) -> np.ndarray:
+        return self._dissipated_energies.sum(axis=-1)
+
+    @property
+    def total_momentum(self) -> np.ndarray:
+        return (self._bodies.masses[: self._bodies.num_free_bodies, np.newaxis] * self._vels).sum(
+            axis=-2
+        )
+
+    @property
+    def energies(self) -> np.ndarray:
+        """
+        :return: (# members, 4) kinetic, body potential, spring potential, and dissipated energies
+        """
+        non_spring_potential_energy, spring_potential_energy = self.potential_energy
+        return np.stack(
+            (
+                self.total_kinetic_energy,
+                non_spring_potential_energy,
+                spring_potential_energy,
+                self.total_dissipated_energy,
+            ),
+            axis=-1,
+        )
@@ -0,0 +1,78 @@
+"""
+cache of the factorizations of min energy system matrices owned by its caller, e.g., a sweep
+"""
+
+from collections import OrderedDict
+from logging import Logger, getLogger
+
+import numpy as np
+
+from dynamics.block_cholesky import BlockCholesky
+from dynamics.sparse_matrix import SparseMatrix
+
+logger: Logger = getLogger()
+
+
+class FactorizationCache:
+    """
+    (block) Cholesky factorizations of the latest matrices keyed by their entries, i.e., by the
+    topology and the spring constants, which are reused by systems differing only in the vectors,
+    e.g., in repeated sweeps over gravity-like accelerations or fixed body locations,
+    or by the variants of a parameter sweep sharing the springs
+
+    the least recently used ones are dropped as soon as the cached factors exceed max_num_bytes,
+    and all of them when the cache is cleared or goes away with its owner
+    """
+
+    def __init__(self, max_num_bytes: int = 1 << 28) -> None:
+        assert max_num_bytes > 0, max_num_bytes
+        self._max_num_bytes: int = max_num_bytes
+        self._factorizations: OrderedDict[bytes, BlockCholesky] = OrderedDict()
+        self._num_bytes: int = 0
+
+    # getters
+
+    @property
+    def num_bytes(self) -> int:
+        return self._num_bytes
+
+    def __len__(self) -> int:
+        return len(self._factorizations)
+
+    # caching
+
+    def factorization(self, matrix: SparseMatrix) -> BlockCholesky | None:
+        """
+        :return: the factorization of the matrix, or None if its factor would exceed
+        max_num_bytes, e.g., for a matrix without any narrow band
+        """
+        key: bytes = matrix.key
+        if key in self._factorizations:
+            self._factorizations.move_to_end(key)
+            return self._factorizations[key]
+
+        try:
+            factorization: BlockCholesky = BlockCholesky(matrix, self._max_num_bytes)
+        except MemoryError as error:
+            logger.info(f"the matrix is not factorized ({error})")
+            return None
+
+        self._factorizations[key] = factorization
+        self._num_bytes += factorization.num_bytes
+        while self._num_bytes > self._max_num_bytes:
+            _, dropped = self._factorizations.popitem(last=False)
+            self._num_bytes -= dropped.num_bytes
+
+        return factorization
+
+    def solve(self, matrix: SparseMatrix, b_1d: np.ndarray) -> np.ndarray:
+        """
+        solve the system for (..., size) vectors by the (cached) factorization of the matrix,
+        or by SparseMatrix.solve if it is not factorized
+        """
+        factorization: BlockCholesky | None = self.factorization(matrix)
+        return matrix.solve(b_1d) if factorization is None else factorization.solve(b_1d)
+
+    def clear(self) -> None:
+        self._factorizations.clear()
+        self._num_bytes = 0
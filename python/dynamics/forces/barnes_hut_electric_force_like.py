@@ -0,0 +1,236 @@
+"""
+electric-force-like force between every pair of bodies in a group on the plane
+approximated by Barnes-Hut quadtree
+
+the quadtree is built from the Morton (Z-order) keys of the bodies level by level,
+and is walked for all the bodies at once by expanding (body, node) pairs level by level
+"""
+
+import numpy as np
+from numpy.linalg import norm
+
+from dynamics.array_ops import ranks_within, scatter_add_rows
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.electric_force_like_group_base import ElectricForceLikeGroupBase
+
+
+class BarnesHutElectricForceLike(ElectricForceLikeGroupBase):
+    _MAX_DEPTH: int = 20
+
+    def __init__(
+        self,
+        coefficient: float | int,
+        exponent: float | int,
+        threshold: float | int,
+        bodies: list[BodyBase],
+        opening_angle: float | int = 0.5,
+        leaf_size: int = 8,
+        exact: bool = False,
+    ) -> None:
+        """
+        :param opening_angle: a node (of the quadtree) is regarded as one body at its center of
+        bodies if its size over the distance to that center is less than opening_angle
+        :param leaf_size: max # of bodies in a leaf node, whose bodies exert forces one by one
+        :param exact: sum up the forces of all the pairs instead, e.g., for validation
+        """
+        assert opening_angle >= 0.0, opening_angle
+        assert leaf_size >= 1, leaf_size
+        assert all(body.loc.size == 2 for body in bodies), [body.loc.size for body in bodies]
+        super().__init__(coefficient, exponent, threshold, bodies)
+
+        self._opening_angle: float = float(opening_angle)
+        self._leaf_size: int = int(leaf_size)
+        self._exact: bool = exact
+
+    # getters
+
+    @property
+    def opening_angle(self) -> float:
+        return self._opening_angle
+
+    @property
+    def exact(self) -> bool:
+        return self._exact
+
+    # setters
+
+    def set_exact(self, exact: bool) -> None:
+        self._exact = exact
+        self._cached_locs = None
+
+    # forces & potential energy of the group
+
+    def group_forces(self, locs: np.ndarray) -> np.ndarray:
+        if self._exact:
+            return self.exact_group_forces(locs)
+
+        forces, _ = self._walk_tree(locs, False)
+        return forces
+
+    def group_potential_energy(self, locs: np.ndarray) -> float:
+        if self._exact:
+            return float(self.exact_group_potential_energy(locs))
+
+        _, potential_energies = self._walk_tree(locs, True)
+        return 0.5 * float(potential_energies.sum())
+
+    # quadtree
+
+    def _walk_tree(
+        self, locs: np.ndarray, with_potential_energy: bool
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: (# bodies, 2) forces, (# bodies,) potential energies (zeros unless
+        with_potential_energy) of every body with respect to all the others
+        """
+        num_bodies: int = locs.shape[0]
+        order, starts, counts, centers, sizes, first_children, num_children = self._build_tree(locs)
+        sorted_locs: np.ndarray = locs[order]
+        is_leaves: np.ndarray = num_children == 0
+
+        sorted_forces: np.ndarray = np.zeros_like(sorted_locs)
+        sorted_potential_energies: np.ndarray = np.zeros(num_bodies)
+
+        def accumulate(
+            _bodies: np.ndarray, weights: np.ndarray, vecs_2_1: np.ndarray, dists: np.ndarray
+        ) -> None:
+            scatter_add_rows(
+                sorted_forces,
+                _bodies,
+                (weights * self._law.force_factor(dists))[:, np.newaxis] * vecs_2_1,
+            )
+            if with_potential_energy:
+                sorted_potential_energies[:] += np.bincount(
+                    _bodies,
+                    weights=weights * self._law.potential_energy(dists),
+                    minlength=num_bodies,
+                )
+
+        # (body, node) pairs to visit, starting from the root
+        bodies: np.ndarray = np.arange(num_bodies)
+        nodes: np.ndarray = np.zeros(num_bodies, int)
+
+        while bodies.size > 0:
+            vecs_2_1: np.ndarray = sorted_locs[bodies] - centers[nodes]
+            dists: np.ndarray = norm(vecs_2_1, axis=-1)
+            contains: np.ndarray = (starts[nodes] <= bodies) & (
+                bodies < starts[nodes] + counts[nodes]
+            )
+            is_far: np.ndarray = ~contains & (sizes[nodes] < self._opening_angle * dists)
+
+            # far nodes act as single bodies at their centers
+            accumulate(
+                bodies[is_far],
+                counts[nodes[is_far]].astype(float),
+                vecs_2_1[is_far],
+                dists[is_far],
+            )
+
+            # bodies in near leaves act one by one
+            is_near_leaf: np.ndarray = ~is_far & is_leaves[nodes]
+            leaf_bodies: np.ndarray = np.repeat(bodies[is_near_leaf], counts[nodes[is_near_leaf]])
+            other_bodies: np.ndarray = np.repeat(
+                starts[nodes[is_near_leaf]], counts[nodes[is_near_leaf]]
+            ) + ranks_within(counts[nodes[is_near_leaf]])
+            is_other: np.ndarray = leaf_bodies != other_bodies
+            leaf_vecs_2_1: np.ndarray = (
+                sorted_locs[leaf_bodies[is_other]] - sorted_locs[other_bodies[is_other]]
+            )
+            accumulate(
+                leaf_bodies[is_other],
+                np.ones(is_other.sum()),
+                leaf_vecs_2_1,
+                norm(leaf_vecs_2_1, axis=-1),
+            )
+
+            # near internal nodes are opened
+            is_open: np.ndarray = ~is_far & ~is_leaves[nodes]
+            _num_children: np.ndarray = num_children[nodes[is_open]]
+            bodies = np.repeat(bodies[is_open], _num_children)
+            nodes = np.repeat(first_children[nodes[is_open]], _num_children) + ranks_within(
+                _num_children
+            )
+
+        forces: np.ndarray = np.zeros_like(locs)
+        forces[order] = sorted_forces
+        potential_energies: np.ndarray = np.zeros(num_bodies)
+        potential_energies[order] = sorted_potential_energies
+
+        return forces, potential_energies
+
+    def _build_tree(self, locs: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        :return: order of bodies sorted by Morton keys, and the followings of all the nodes
+        (level by level from the root): starts in the sorted order and # of their bodies,
+        (# nodes, 2) centers of the bodies, sizes, first children and # of children
+        (zero for leaves)
+        """
+        num_cells: int = 1 << self._MAX_DEPTH
+        lower: np.ndarray = locs.min(axis=0)
+        size: float = float((locs.max(axis=0) - lower).max())
+        size = size if size > 0.0 else 1.0
+
+        cell_indices: np.ndarray = np.minimum(
+            ((locs - lower) * (num_cells / size)).astype(np.int64), num_cells - 1
+        )
+        keys: np.ndarray = np.zeros(locs.shape[0], np.int64)
+        for bit in range(self._MAX_DEPTH):
+            keys |= ((cell_indices[:, 0] >> bit) & 1) << (2 * bit)
+            keys |= ((cell_indices[:, 1] >> bit) & 1) << (2 * bit + 1)
+
+        order: np.ndarray = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        sorted_locs: np.ndarray = locs[order]
+
+        level_starts: list[np.ndarray] = list()
+        level_counts: list[np.ndarray] = list()
+        level_centers: list[np.ndarray] = list()
+        level_sizes: list[np.ndarray] = list()
+        level_keys: list[np.ndarray] = list()
+
+        for level in range(self._MAX_DEPTH + 1):
+            node_keys: np.ndarray = keys >> (2 * (self._MAX_DEPTH - level))
+            starts: np.ndarray = np.flatnonzero(np.r_[True, node_keys[1:] != node_keys[:-1]])
+            counts: np.ndarray = np.diff(np.r_[starts, keys.size])
+
+            level_starts.append(starts)
+            level_counts.append(counts)
+            level_centers.append(
+                np.add.reduceat(sorted_locs, starts, axis=0) / counts[:, np.newaxis]
+            )
+            level_sizes.append(np.full(starts.size, size / (1 << level)))
+            level_keys.append(node_keys[starts])
+
+            if np.all(counts <= self._leaf_size):
+                break
+
+        offsets: np.ndarray = np.cumsum([0] + [starts.size for starts in level_starts])
+        level_first_children: list[np.ndarray] = list()
+        level_num_children: list[np.ndarray] = list()
+
+        for level, (node_keys, counts) in enumerate(zip(level_keys, level_counts)):
+            if level + 1 == len(level_keys):
+                level_first_children.append(np.zeros(node_keys.size, int))
+                level_num_children.append(np.zeros(node_keys.size, int))
+                continue
+
+            parent_keys: np.ndarray = level_keys[level + 1] >> 2
+            first_children: np.ndarray = np.searchsorted(parent_keys, node_keys, "left")
+            level_first_children.append(offsets[level + 1] + first_children)
+            level_num_children.append(
+                np.where(
+                    counts > self._leaf_size,
+                    np.searchsorted(parent_keys, node_keys, "right") - first_children,
+                    0,
+                )
+            )
+
+        return (
+            order,
+            np.concatenate(level_starts),
+            np.concatenate(level_counts),
+            np.concatenate(level_centers),
+            np.concatenate(level_sizes),
+            np.concatenate(level_first_children),
+            np.concatenate(level_num_children),
+        )
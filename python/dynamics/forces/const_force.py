@@ -20,8 +20,27 @@ class ConstForce(ForceBase):
     def force(self, time: float, body: BodyBase) -> np.ndarray:
         return self._force_vec
 
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        force += self._force_vec
+
     def body_potential_energy(self, body: BodyBase) -> float:
         return -float(np.dot(self._force_vec, body.loc))
 
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return -(locs @ self._force_vec).sum(axis=-1), np.zeros(locs.shape[:-2])
+
     def x_potential_energy(self, body: BodyBase, x_1d: np.ndarray) -> np.ndarray:
         return -self._force_vec[0] * x_1d
@@ -0,0 +1,131 @@
+"""
+short-range electric-force-like force between every pair of bodies in a group
+which vanishes beyond cutoff, evaluated only for the pairs of Verlet neighbor list
+"""
+
+import numpy as np
+from numpy.linalg import norm
+
+from dynamics.array_ops import scatter_add_rows
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.electric_force_like_group_base import ElectricForceLikeGroupBase
+from dynamics.neighbor_list import NeighborList
+
+
+class CutoffElectricForceLike(ElectricForceLikeGroupBase):
+    def __init__(
+        self,
+        coefficient: float | int,
+        exponent: float | int,
+        threshold: float | int,
+        bodies: list[BodyBase],
+        cutoff: float | int,
+        skin: float | int | None = None,
+    ) -> None:
+        """
+        :param cutoff: distance beyond which the force vanishes - the potential energy is shifted
+        so that it vanishes there too
+        :param skin: margin of the neighbor lists (0.2 * cutoff by default),
+        each of which is rebuilt only when some body moves by skin / 2 or more
+        """
+        super().__init__(coefficient, exponent, threshold, bodies)
+
+        assert cutoff > 0.0, cutoff
+        self._cutoff: float = float(cutoff)
+        self._cutoff_potential_energy: float = float(self._law.potential_energy(self._cutoff))
+        self._skin: float = float(0.2 * self._cutoff if skin is None else skin)
+        self._neighbor_list: NeighborList = NeighborList(self._cutoff, self._skin)
+
+        # one list per (...) index of batched locations, e.g., per ensemble member, since a list
+        # shared by all of them would be rebuilt for every member, which moves independently
+        self._batch_neighbor_lists: dict[tuple[int, ...], NeighborList] = dict()
+
+    # getters
+
+    @property
+    def cutoff(self) -> float:
+        return self._cutoff
+
+    @property
+    def neighbor_list(self) -> NeighborList:
+        """
+        the list of unbatched locations, i.e., of the bodies themselves
+        """
+        return self._neighbor_list
+
+    def batch_neighbor_list(self, idx: tuple[int, ...]) -> NeighborList:
+        """
+        the list of the locations at idx of batched locations
+        """
+        if idx == ():
+            return self._neighbor_list
+
+        if idx not in self._batch_neighbor_lists:
+            self._batch_neighbor_lists[idx] = NeighborList(self._cutoff, self._skin)
+        return self._batch_neighbor_lists[idx]
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """
+        the list of the bodies themselves, and not those of batched locations, e.g., of ensembles
+        """
+        return self._neighbor_list.checkpoint_state()
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        self._neighbor_list.restore_checkpoint_state(state)
+
+    # forces & potential energy of the group
+
+    def pair_force_factor(self, dist: np.ndarray) -> np.ndarray:
+        return np.where(dist < self._cutoff, self._law.force_factor(dist), 0.0)
+
+    def pair_potential_energy(self, dist: np.ndarray) -> np.ndarray:
+        return np.where(
+            dist < self._cutoff,
+            self._law.potential_energy(dist) - self._cutoff_potential_energy,
+            0.0,
+        )
+
+    def group_forces(self, locs: np.ndarray) -> np.ndarray:
+        return self._group_forces(locs, self._neighbor_list)
+
+    def group_potential_energy(self, locs: np.ndarray) -> float:
+        return self._group_potential_energy(locs, self._neighbor_list)
+
+    def batched_group_forces(self, locs: np.ndarray) -> np.ndarray:
+        forces: np.ndarray = np.zeros_like(locs)
+        for idx in np.ndindex(locs.shape[:-2]):
+            forces[idx] = self._group_forces(locs[idx], self.batch_neighbor_list(idx))
+
+        return forces
+
+    def batched_group_potential_energy(self, locs: np.ndarray) -> np.ndarray:
+        potential_energy: np.ndarray = np.zeros(locs.shape[:-2])
+        for idx in np.ndindex(locs.shape[:-2]):
+            potential_energy[idx] = self._group_potential_energy(
+                locs[idx], self.batch_neighbor_list(idx)
+            )
+
+        return potential_energy
+
+    def _group_forces(self, locs: np.ndarray, neighbor_list: NeighborList) -> np.ndarray:
+        first_indices, second_indices = neighbor_list.pairs(locs)
+        vecs_2_1: np.ndarray = locs[second_indices] - locs[first_indices]
+        second_body_forces: np.ndarray = (
+            self.pair_force_factor(norm(vecs_2_1, axis=-1, keepdims=True)) * vecs_2_1
+        )
+
+        forces: np.ndarray = np.zeros_like(locs)
+        scatter_add_rows(forces, second_indices, second_body_forces)
+        scatter_add_rows(forces, first_indices, -second_body_forces)
+
+        return forces
+
+    def _group_potential_energy(self, locs: np.ndarray, neighbor_list: NeighborList) -> float:
+        first_indices, second_indices = neighbor_list.pairs(locs)
+        return float(
+            self.pair_potential_energy(
+                norm(locs[second_indices] - locs[first_indices], axis=-1)
+            ).sum()
+        )
@@ -6,10 +6,11 @@ import numpy as np
 from numpy.linalg import norm
 
 from dynamics.bodies.body_base import BodyBase
-from dynamics.forces.force_base import ForceBase
+from dynamics.forces.electric_force_like_law import ElectricForceLikeLaw
+from dynamics.forces.pair_force_base import PairForceBase
 
 
-class ElectricForceLike(ForceBase):
+class ElectricForceLike(PairForceBase):
     def __init__(
         self,
         coefficient: float | int,
@@ -18,64 +19,35 @@ class ElectricForceLike(ForceBase):
         body_1: BodyBase,
         body_2: BodyBase,
     ) -> None:
-        assert exponent >= 1.0, exponent
-        assert threshold > 0.0, threshold
-        self._coefficient: float = float(coefficient)
-        self._exponent: float = float(exponent)
-        self._threshold: float = float(threshold)
-        self._threshold_coefficient: float = self._threshold
-        self._body_1: BodyBase = body_1
-        self._body_2: BodyBase = body_2
+        self._law: ElectricForceLikeLaw = ElectricForceLikeLaw(coefficient, exponent, threshold)
+        super().__init__(body_1, body_2)
 
-        self._body_1.register_force(self)
-        self._body_2.register_force(self)
+    # getters
 
-        self._threshold_force: float = self._threshold_coefficient * np.power(
-            self._threshold, -self._exponent
-        )
-        self._threshold_potential_energy: float = (
-            (self._coefficient / (self._exponent - 1.0))
-            * np.power(self._threshold, -(self._exponent - 1))
-            if self._exponent > 1.0
-            else -self._coefficient * np.log(self._threshold)
-        )
+    @property
+    def law(self) -> ElectricForceLikeLaw:
+        return self._law
 
     # dynamics simulation
 
-    def force(self, time: float, body: BodyBase) -> np.ndarray:
-        if body is self._body_1:
-            return -self._second_body_force(time)
-        elif body is self._body_2:
-            return self._second_body_force(time)
-        else:
-            return np.zeros(2)
-
-    def _second_body_force(self, time: float) -> np.ndarray:
-        vec_2_1: np.ndarray = self._body_2.loc - self._body_1.loc
-        dist: float = norm(vec_2_1).item()
-        assert dist > 0.0, (self._body_1.loc, self._body_2.loc, vec_2_1, dist)
-        return (
-            (self._coefficient / np.power(dist, self._exponent + 1.0)) * vec_2_1
-            if dist > self._threshold
-            else (self._threshold_force / self._threshold) * vec_2_1
-        )
+    def second_body_force(self, vec_2_1: np.ndarray) -> np.ndarray:
+        dist: np.ndarray = norm(vec_2_1, axis=-1, keepdims=True)
+        assert np.all(dist > 0.0), (self._body_1.loc, self._body_2.loc, vec_2_1, dist)
+        return self._law.force_factor(dist) * vec_2_1
 
     # potential energy
 
     @property
     def potential_energy(self) -> tuple[float, float]:
-        dist: float = norm(self._body_1.loc - self._body_2.loc).item()
-        return (
-            (
-                (self._coefficient / (self._exponent - 1.0))
-                * np.power(dist, -(self._exponent - 1.0))
-                if self._exponent > 1.0
-                else -self._coefficient * np.log(dist)
-            )
-            if dist > self._threshold
-            else (
-                self._threshold_potential_energy
-                - 0.5 * (self._threshold_force / self._threshold) * np.power(dist, 2.0)
-                + 0.5 * (self._threshold_force / self._threshold) * np.power(self._threshold, 2.0)
-            )
-        ), 0.0
+        return float(self.distance_potential_energy(norm(self._body_1.loc - self._body_2.loc))), 0.0
+
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return self.distance_potential_energy(self._pair_dist(locs)), np.zeros(locs.shape[:-2])
+
+    def distance_potential_energy(self, dist: np.ndarray | float) -> np.ndarray:
+        """
+        potential energy of two bodies apart by dist (element-wise)
+        """
+        return self._law.potential_energy(dist)
@@ -0,0 +1,24 @@
+"""
+electric-force-like force between every pair of bodies in a group
+evaluated by the (chunked) full pairwise interaction matrix
+"""
+
+import numpy as np
+
+from dynamics.forces.electric_force_like_group_base import ElectricForceLikeGroupBase
+
+
+class ElectricForceLikeGroup(ElectricForceLikeGroupBase):
+    def group_forces(self, locs: np.ndarray) -> np.ndarray:
+        return self.exact_group_forces(locs)
+
+    def group_potential_energy(self, locs: np.ndarray) -> float:
+        return float(self.exact_group_potential_energy(locs))
+
+    # the pairwise interaction matrix broadcasts over leading axes by itself
+
+    def batched_group_forces(self, locs: np.ndarray) -> np.ndarray:
+        return self.exact_group_forces(locs)
+
+    def batched_group_potential_energy(self, locs: np.ndarray) -> np.ndarray:
+        return self.exact_group_potential_energy(locs)
@@ -0,0 +1,199 @@
+"""
+base class for electric-force-like forces acting between every pair of bodies in a group
+"""
+
+from abc import abstractmethod
+
+import numpy as np
+from numpy.linalg import norm
+
+from dynamics.bodies.bodies import Bodies
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.electric_force_like_law import ElectricForceLikeLaw
+from dynamics.forces.force_base import ForceBase
+
+
+class ElectricForceLikeGroupBase(ForceBase):
+    # max # of (body, body) pairs evaluated at once by exact summation
+    _EXACT_SUMMATION_CHUNK_SIZE: int = 1 << 20
+
+    def __init__(
+        self,
+        coefficient: float | int,
+        exponent: float | int,
+        threshold: float | int,
+        bodies: list[BodyBase],
+    ) -> None:
+        assert len(bodies) >= 2, len(bodies)
+        assert len(set(id(body) for body in bodies)) == len(bodies), bodies
+
+        self._law: ElectricForceLikeLaw = ElectricForceLikeLaw(coefficient, exponent, threshold)
+        self._bodies: list[BodyBase] = list(bodies)
+        self._body_idx_map: dict[int, int] = {id(body): idx for idx, body in enumerate(bodies)}
+
+        for body in self._bodies:
+            body.register_force(self)
+
+        # set by register_force
+        self._rows: np.ndarray | None = None
+
+        # the last per-body evaluation, which is reused by the other bodies at the same locations
+        self._cached_locs: bytes | None = None
+        self._cached_forces: np.ndarray = np.zeros((len(bodies), bodies[0].loc.size))
+
+    # getters
+
+    @property
+    def law(self) -> ElectricForceLikeLaw:
+        return self._law
+
+    @property
+    def bodies(self) -> list[BodyBase]:
+        return self._bodies
+
+    # forces & potential energy of the group
+
+    @abstractmethod
+    def group_forces(self, locs: np.ndarray) -> np.ndarray:
+        """
+        :param locs: (# bodies in group, dim) locations of the bodies in the group
+        :return: (# bodies in group, dim) forces exerted on them
+        """
+        pass
+
+    @abstractmethod
+    def group_potential_energy(self, locs: np.ndarray) -> float:
+        """
+        :param locs: (# bodies in group, dim) locations of the bodies in the group
+        """
+        pass
+
+    def pair_force_factor(self, dist: np.ndarray) -> np.ndarray:
+        """
+        force factor of two bodies in the group apart by dist (element-wise)
+        """
+        return self._law.force_factor(dist)
+
+    def pair_potential_energy(self, dist: np.ndarray) -> np.ndarray:
+        """
+        potential energy of two bodies in the group apart by dist (element-wise)
+        """
+        return self._law.potential_energy(dist)
+
+    def exact_group_forces(self, locs: np.ndarray) -> np.ndarray:
+        """
+        sum up the forces of all the pairs, e.g., for validation of approximate methods
+
+        :param locs: (..., # bodies in group, dim) locations of the bodies in the group
+        :return: (..., # bodies in group, dim) forces exerted on them
+        """
+        forces: np.ndarray = np.zeros_like(locs)
+        for chunk in self._exact_summation_chunks(locs):
+            # the force exerted by the body itself vanishes since its relative location is zero
+            vecs_2_1: np.ndarray = locs[..., chunk, np.newaxis, :] - locs[..., np.newaxis, :, :]
+            forces[..., chunk, :] = (
+                self.pair_force_factor(norm(vecs_2_1, axis=-1, keepdims=True)) * vecs_2_1
+            ).sum(axis=-2)
+
+        return forces
+
+    def exact_group_potential_energy(self, locs: np.ndarray) -> np.ndarray:
+        """
+        :param locs: (..., # bodies in group, dim) locations of the bodies in the group
+        :return: (...) potential energy summed up over all the pairs
+        """
+        num_bodies: int = locs.shape[-2]
+        potential_energy: np.ndarray = np.zeros(locs.shape[:-2])
+
+        for chunk in self._exact_summation_chunks(locs):
+            dists: np.ndarray = norm(
+                locs[..., chunk, np.newaxis, :] - locs[..., np.newaxis, :, :], axis=-1
+            )
+            is_other: np.ndarray = np.arange(num_bodies)[chunk, np.newaxis] != np.arange(num_bodies)
+            potential_energy += 0.5 * np.where(
+                is_other, self.pair_potential_energy(dists), 0.0
+            ).sum(axis=(-2, -1))
+
+        return potential_energy
+
+    def _exact_summation_chunks(self, locs: np.ndarray) -> list[slice]:
+        num_bodies: int = locs.shape[-2]
+        chunk_size: int = max(
+            1, self._EXACT_SUMMATION_CHUNK_SIZE // max(1, num_bodies * locs[..., 0, 0].size)
+        )
+        return [
+            slice(start, min(start + chunk_size, num_bodies))
+            for start in range(0, num_bodies, chunk_size)
+        ]
+
+    # dynamics simulation
+
+    def register_force(self, bodies: Bodies) -> None:
+        self._rows = np.array([bodies.row(body) for body in self._bodies], int)
+
+    def force(self, time: float, body: BodyBase) -> np.ndarray:
+        if id(body) not in self._body_idx_map:
+            return np.zeros_like(body.loc)
+
+        locs: np.ndarray = np.array([_body.loc for _body in self._bodies])
+        if locs.tobytes() != self._cached_locs:
+            self._cached_forces = self.group_forces(locs)
+            self._cached_locs = locs.tobytes()
+
+        return self._cached_forces[self._body_idx_map[id(body)]].copy()
+
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        rows: np.ndarray = self._registered_rows
+        force[..., rows, :] += self.batched_group_forces(locs[..., rows, :])
+
+    def batched_group_forces(self, locs: np.ndarray) -> np.ndarray:
+        """
+        group_forces for (..., # bodies in group, dim) locations
+        """
+        forces: np.ndarray = np.zeros_like(locs)
+        for idx in np.ndindex(locs.shape[:-2]):
+            forces[idx] = self.group_forces(locs[idx])
+
+        return forces
+
+    # potential energy
+
+    @property
+    def potential_energy(self) -> tuple[float, float]:
+        return (
+            self.group_potential_energy(np.array([body.loc for body in self._bodies])),
+            0.0,
+        )
+
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return self.batched_group_potential_energy(locs[..., self._registered_rows, :]), np.zeros(
+            locs.shape[:-2]
+        )
+
+    def batched_group_potential_energy(self, locs: np.ndarray) -> np.ndarray:
+        """
+        group_potential_energy for (..., # bodies in group, dim) locations
+        """
+        potential_energy: np.ndarray = np.zeros(locs.shape[:-2])
+        for idx in np.ndindex(locs.shape[:-2]):
+            potential_energy[idx] = self.group_potential_energy(locs[idx])
+
+        return potential_energy
+
+    @property
+    def _registered_rows(self) -> np.ndarray:
+        assert self._rows is not None, "register_force has not been called"
+        return self._rows
@@ -0,0 +1,73 @@
+"""
+electric-force-like law, i.e., coefficient / distance^exponent force softened within threshold,
+shared by the pairwise and the body-group electric-force-like forces
+"""
+
+import numpy as np
+
+
+class ElectricForceLikeLaw:
+    def __init__(self, coefficient: float | int, exponent: float | int, threshold: float | int):
+        assert exponent >= 1.0, exponent
+        assert threshold > 0.0, threshold
+
+        self._coefficient: float = float(coefficient)
+        self._exponent: float = float(exponent)
+        self._threshold: float = float(threshold)
+        self._threshold_coefficient: float = self._threshold
+
+        self._threshold_force: float = self._threshold_coefficient * np.power(
+            self._threshold, -self._exponent
+        )
+        self._threshold_potential_energy: float = (
+            (self._coefficient / (self._exponent - 1.0))
+            * np.power(self._threshold, -(self._exponent - 1))
+            if self._exponent > 1.0
+            else -self._coefficient * np.log(self._threshold)
+        )
+
+    # getters
+
+    @property
+    def coefficient(self) -> float:
+        return self._coefficient
+
+    @property
+    def exponent(self) -> float:
+        return self._exponent
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    # law
+
+    def force_factor(self, dist: np.ndarray) -> np.ndarray:
+        """
+        factor by which the location of the second body relative to the first one is multiplied
+        to get the force exerted on the second body apart by dist (element-wise)
+        """
+        return np.where(
+            dist > self._threshold,
+            self._coefficient / np.power(np.maximum(dist, self._threshold), self._exponent + 1.0),
+            self._threshold_force / self._threshold,
+        )
+
+    def potential_energy(self, dist: np.ndarray | float) -> np.ndarray:
+        """
+        potential energy of two bodies apart by dist (element-wise)
+        """
+        dist = np.asarray(dist, float)
+        far_dist: np.ndarray = np.maximum(dist, self._threshold)
+        return np.where(
+            dist > self._threshold,
+            (
+                (self._coefficient / (self._exponent - 1.0))
+                * np.power(far_dist, -(self._exponent - 1.0))
+                if self._exponent > 1.0
+                else -self._coefficient * np.log(far_dist)
+            ),
+            self._threshold_potential_energy
+            - 0.5 * (self._threshold_force / self._threshold) * np.power(dist, 2.0)
+            + 0.5 * (self._threshold_force / self._threshold) * np.power(self._threshold, 2.0),
+        )
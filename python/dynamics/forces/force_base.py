@@ -30,11 +30,61 @@ class ForceBase(ObjBase):
     def force(self, time: float, boyd: BodyBase) -> np.ndarray:
         pass
 
+    # batched dynamics simulation
+
+    @property
+    def supports_batched_force(self) -> bool:
+        return False
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        """
+        add the forces exerted on all the bodies to force in place
+
+        :param locs: (..., # bodies, dim) locations whose rows follow the state store of Bodies
+        :param vels: (..., # bodies, dim) velocities
+        :param masses: (# bodies,) masses
+        :param force: (..., # bodies, dim) force buffer
+        """
+        raise NotImplementedError()
+
     # potential energy
 
     def min_energy_matrices(self, bodies: Bodies) -> tuple[np.ndarray, np.ndarray]:
         raise NotImplementedError()
 
+    def min_energy_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        sparse counterpart of min_energy_matrices
+
+        :return: row indices, column indices, and values of the (COO) matrix entries,
+        whose duplicates are summed up, and the vector
+        """
+        a_2d, b_1d = self.min_energy_matrices(bodies)
+        rows, cols = np.nonzero(a_2d)
+        return rows, cols, a_2d[rows, cols], b_1d
+
+    def min_energy_fixed_locs_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        the vector of min_energy_triplets is affine in the locations of the fixed bodies,
+        whose linear part is given here
+
+        :return: row indices (of the coordinates), column indices (of the coordinates of the fixed
+        bodies, i.e., of bodies.locs[bodies.num_free_bodies:].ravel()), and values of the (COO)
+        entries, i.e., none unless the vector depends on the fixed bodies
+        """
+        return np.zeros(0, int), np.zeros(0, int), np.zeros(0)
+
     def x_potential_energy(self, body: BodyBase, x_1d: np.ndarray) -> np.ndarray:
         raise NotImplementedError()
 
@@ -48,6 +98,19 @@ class ForceBase(ObjBase):
         """
         return 0.0, 0.0
 
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        batched counterpart of body_potential_energy (summed over all the bodies) and
+        potential_energy for forces supporting batched force kernels
+
+        :param locs: (..., # bodies, dim) locations whose rows follow the state store of Bodies
+        :param masses: (# bodies,) masses
+        :return: (...) non-spring (including body) potential energy, (...) spring potential energy
+        """
+        return np.zeros(locs.shape[:-2]), np.zeros(locs.shape[:-2])
+
     # visualization
 
     def add_objs(self, ax: Axes) -> None:
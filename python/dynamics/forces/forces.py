@@ -3,16 +3,24 @@ collection of force sources
 """
 
 from functools import reduce
+from logging import Logger, getLogger
 from typing import Sequence
 
 import numpy as np
-from numpy.linalg import solve
+from numpy.linalg import LinAlgError
 from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 
 from dynamics.bodies.body_base import BodyBase
 from dynamics.bodies.bodies import Bodies
+from dynamics.checkpoint import prefixed, unprefixed
 from dynamics.forces.force_base import ForceBase
+from dynamics.forces.gravity_like import GravityLike
+from dynamics.factorization_cache import FactorizationCache
+from dynamics.lbfgs import LBFGS
+from dynamics.sparse_matrix import SparseMatrix
+
+logger: Logger = getLogger()
 
 
 class Forces:
@@ -42,6 +50,31 @@ class Forces:
 
         return non_frictional_force + frictional_force, frictional_force
 
+    @property
+    def supports_batched_force(self) -> bool:
+        return all(force.supports_batched_force for force in self._forces)
+
+    def batched_force(
+        self, time: float, locs: np.ndarray, vels: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: total forces and frictional forces exerted on all the bodies,
+        each of which has the same shape as locs
+        """
+        non_frictional_force: np.ndarray = np.zeros_like(locs)
+        frictional_force: np.ndarray = np.zeros_like(locs)
+
+        for force in self._forces:
+            force.accumulate_force(
+                time,
+                locs,
+                vels,
+                masses,
+                frictional_force if force.is_frictional_force else non_frictional_force,
+            )
+
+        return non_frictional_force + frictional_force, frictional_force
+
     # energy
 
     @property
@@ -53,17 +86,216 @@ class Forces:
             np.array([force.potential_energy for force in self._forces], float).sum(axis=0)
         )
 
-    def approx_min_energy(self, bodies: Bodies) -> None:
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: (...) non-spring (including body) potential energy, (...) spring potential energy
+        for (..., # bodies, dim) locations
+        """
+        non_spring_potential_energy: np.ndarray = np.zeros(locs.shape[:-2])
+        spring_potential_energy: np.ndarray = np.zeros(locs.shape[:-2])
+
+        for force in self._forces:
+            _non_spring_potential_energy, _spring_potential_energy = force.batched_potential_energy(
+                locs, masses
+            )
+            non_spring_potential_energy += _non_spring_potential_energy
+            spring_potential_energy += _spring_potential_energy
+
+        return non_spring_potential_energy, spring_potential_energy
+
+    def approx_min_energy(
+        self, bodies: Bodies, factorization_cache: FactorizationCache | None = None
+    ) -> None:
         """
         move bodies to (approximate) min energy locations
+
+        :param factorization_cache: cache of the factorization of the matrix reused by later
+        calls, e.g., by the other variants of a parameter sweep, if any
+        """
+        bodies.set_body_locs(
+            self.approx_min_energy_locs(bodies, factorization_cache=factorization_cache)
+        )
+
+    def approx_min_energy_locs(
+        self,
+        bodies: Bodies,
+        accelerations: np.ndarray | None = None,
+        fixed_locs: np.ndarray | None = None,
+        factorization_cache: FactorizationCache | None = None,
+    ) -> np.ndarray:
+        """
+        (approximate) min energy locations for many gravity-like accelerations and/or locations
+        of the fixed bodies at once, i.e., sweeps over them, which share the matrix of the
+        min energy system, since only its vector depends on them
+
+        :param accelerations: (..., dim) total accelerations in place of those of the
+        gravity-like forces
+        :param fixed_locs: (..., # fixed bodies, dim) locations in place of those of the
+        fixed bodies, whose batch shape broadcasts with that of accelerations
+        :param factorization_cache: cache of the factorization of the matrix reused by later
+        calls, if any
+        :return: (..., # free bodies, dim) locations
+        """
+        a_2d, b_1d = self.min_energy_system(bodies)
+        b_2d: np.ndarray = b_1d
+
+        if accelerations is not None:
+            gravity_likes: list[GravityLike] = [
+                force for force in self._forces if isinstance(force, GravityLike)
+            ]
+            assert gravity_likes, "there are no gravity-like forces to replace"
+            b_2d = (
+                b_2d
+                - gravity_likes[0].min_energy_vectors(
+                    bodies, np.sum([force.acceleration for force in gravity_likes], axis=0)
+                )
+                + gravity_likes[0].min_energy_vectors(bodies, accelerations)
+            )
+
+        if fixed_locs is not None:
+            fixed_locs = np.asarray(fixed_locs, float)
+            cur_fixed_locs: np.ndarray = bodies.locs[bodies.num_free_bodies :]
+            assert fixed_locs.shape[-2:] == cur_fixed_locs.shape, (
+                fixed_locs.shape,
+                cur_fixed_locs.shape,
+            )
+            b_2d = b_2d + (
+                (fixed_locs - cur_fixed_locs).reshape(fixed_locs.shape[:-2] + (-1,))
+                @ self._fixed_locs_min_energy_map(bodies).T
+            )
+
+        x_2d: np.ndarray = (
+            a_2d.solve(b_2d)
+            if factorization_cache is None
+            else factorization_cache.solve(a_2d, b_2d)
+        )
+        return x_2d.reshape(b_2d.shape[:-1] + (bodies.num_free_bodies, bodies.locs.shape[-1]))
+
+    def _fixed_locs_min_energy_map(self, bodies: Bodies) -> np.ndarray:
+        """
+        (# coordinates, # fixed coordinates) linear map from the locations of the fixed bodies
+        to the vector of the min energy system, which is affine in them, assembled from
+        the triplets of all the forces
+        """
+        map_2d: np.ndarray = np.zeros(
+            (bodies.num_coordinates, bodies.locs.size - bodies.num_coordinates)
+        )
+        for force in self.forces:
+            rows, cols, values = force.min_energy_fixed_locs_triplets(bodies)
+            np.add.at(map_2d, (rows, cols), values)
+
+        return map_2d
+
+    def min_energy_system(
+        self, bodies: Bodies, ignore_nonlinear: bool = False
+    ) -> tuple[SparseMatrix, np.ndarray]:
+        """
+        assemble the (sparse) linear system of the (approximate) min energy locations
+        from the triplets of all the forces
+
+        :param ignore_nonlinear: leave out forces without linearization, e.g., electric-like ones,
+        instead of raising NotImplementedError
+        """
+        triplets_list: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = list()
+        for force in self.forces:
+            try:
+                triplets_list.append(force.min_energy_triplets(bodies))
+            except NotImplementedError:
+                if not ignore_nonlinear:
+                    raise
+
+        num_coordinates: int = bodies.num_coordinates
+        return (
+            SparseMatrix(
+                num_coordinates,
+                np.concatenate([np.zeros(0, int)] + [rows for rows, _, _, _ in triplets_list]),
+                np.concatenate([np.zeros(0, int)] + [cols for _, cols, _, _ in triplets_list]),
+                np.concatenate([np.zeros(0)] + [values for _, _, values, _ in triplets_list]),
+            ),
+            np.array([np.zeros(num_coordinates)] + [b_1d for _, _, _, b_1d in triplets_list]).sum(
+                axis=0
+            ),
+        )
+
+    def min_energy(
+        self, bodies: Bodies, factorization_cache: FactorizationCache | None = None
+    ) -> None:
+        """
+        move bodies to (local) min energy locations of the true total potential energy
+        by L-BFGS, whose gradients are given by the batched force kernels, starting from
+        the linear (approximate) solution unless the current locations have lower energy,
+        where locations collapsing bodies together are never tried
+
+        register_forces has to be called beforehand, and RuntimeError is raised if the energy
+        is unbounded below, e.g., under gravity-like forces without any fixed bodies
+
+        :param factorization_cache: cache of the factorization of the matrix of the linear
+        solution, if any
+        """
+        assert self.supports_batched_force, [
+            type(force).__name__ for force in self.forces if not force.supports_batched_force
+        ]
+
+        shape: tuple[int, int] = bodies.num_free_bodies, bodies.locs.shape[-1]
+        if bodies.num_free_bodies == 0:
+            return
+
+        fixed_vels: np.ndarray = bodies.with_fixed_rows(np.zeros(shape), True)
+        num_fixed_locs: int = np.unique(bodies.locs[shape[0] :], axis=0).shape[0]
+
+        def is_collapsed(locs: np.ndarray) -> bool:
+            # a free body at the same location as another body, where forces may be undefined
+            return np.unique(locs, axis=0).shape[0] < shape[0] + num_fixed_locs
+
+        def energy(x_1d: np.ndarray) -> float:
+            locs: np.ndarray = bodies.with_fixed_rows(x_1d.reshape(shape))
+            if is_collapsed(locs):
+                return np.inf
+            return float(sum(self.batched_potential_energy(locs, bodies.masses)))
+
+        def energy_and_gradient(x_1d: np.ndarray) -> tuple[float, np.ndarray]:
+            locs: np.ndarray = bodies.with_fixed_rows(x_1d.reshape(shape))
+            if is_collapsed(locs):
+                return np.inf, np.full(x_1d.shape, np.nan)
+            force, frictional_force = self.batched_force(
+                bodies.cur_time, locs, fixed_vels, bodies.masses
+            )
+            return (
+                float(sum(self.batched_potential_energy(locs, bodies.masses))),
+                -(force - frictional_force)[: shape[0]].ravel(),
+            )
+
+        x_1d: np.ndarray = bodies.locs[: shape[0]].ravel().copy()
+        try:
+            a_2d, b_1d = self.min_energy_system(bodies, ignore_nonlinear=True)
+            linear_x_1d: np.ndarray = (
+                a_2d.solve(b_1d)
+                if factorization_cache is None
+                else factorization_cache.solve(a_2d, b_1d)
+            )
+            if np.all(np.isfinite(linear_x_1d)) and energy(linear_x_1d) < energy(x_1d):
+                x_1d = linear_x_1d
+        except LinAlgError as error:
+            logger.info(f"start from the current locations without linear solution ({error})")
+
+        bodies.set_body_locs(LBFGS(energy_and_gradient).minimize(x_1d))
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """
+        the state of every force under its index, e.g., 3/cur_x
         """
-        a_2d, b_1d = self._min_energy_matrices(bodies)
-        equilibrium_loc: np.ndarray = solve(a_2d, b_1d)
-        bodies.set_body_locs(equilibrium_loc)
+        state: dict[str, np.ndarray] = dict()
+        for idx, force in enumerate(self._forces):
+            state.update(prefixed(f"{idx}/", force.checkpoint_state()))
+        return state
 
-    def _min_energy_matrices(self, bodies: Bodies) -> tuple[np.ndarray, np.ndarray]:
-        a_list, b_list = zip(*[force.min_energy_matrices(bodies) for force in self.forces])
-        return np.array(a_list, float).sum(axis=0), np.array(b_list, float).sum(axis=0)
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        for idx, force in enumerate(self._forces):
+            force.restore_checkpoint_state(unprefixed(f"{idx}/", state))
 
     # visualization
 
@@ -77,6 +77,24 @@ class FrictionalForce2D(FrictionalForceBase):
             else np.zeros_like(body.loc)
         )
 
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        force += np.where(
+            np.all(locs < self._upper_right_pnt, axis=-1, keepdims=True),
+            -self._coef_friction * vels,
+            0.0,
+        )
+
     # visualization
 
     def add_objs(self, ax: Axes) -> None:
@@ -25,3 +25,8 @@ class FrictionalForceBase(ForceBase):
         return np.zeros((bodies.num_coordinates, bodies.num_coordinates)), np.zeros(
             bodies.num_coordinates
         )
+
+    def min_energy_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return np.zeros(0, int), np.zeros(0, int), np.zeros(0), np.zeros(bodies.num_coordinates)
@@ -0,0 +1,189 @@
+"""
+frictional force field of many rectangular or polygonal zones with their own coefficients
+looked up for all the bodies at once via uniform grid of buckets
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.collections import PolyCollection
+
+from dynamics.array_ops import ranks_within
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.frictional_force_base import FrictionalForceBase
+
+
+class FrictionalZones2D(FrictionalForceBase):
+    """
+    a body in several (overlapping) zones gets the sum of their coefficients of friction,
+    i.e., the same as one FrictionalForce2D-like force per zone
+    """
+
+    def __init__(
+        self,
+        coefs_friction: list[float | int],
+        polygons: list[np.ndarray | list[list[float | int]]],
+        bucket_size: float | int | None = None,
+        **kwargs
+    ) -> None:
+        """
+        :param polygons: (# vertices, 2) vertices of each zone
+        :param bucket_size: size of the square buckets of the spatial index
+        (chosen from the extent and # of zones by default)
+        """
+        assert len(coefs_friction) == len(polygons) > 0, (len(coefs_friction), len(polygons))
+        self._coefs_friction: np.ndarray = np.array(coefs_friction, float)
+        assert np.all(self._coefs_friction >= 0.0), self._coefs_friction
+
+        _polygons: list[np.ndarray] = [np.array(polygon, float) for polygon in polygons]
+        assert all(
+            polygon.ndim == 2 and polygon.shape[0] >= 3 and polygon.shape[1] == 2
+            for polygon in _polygons
+        ), [polygon.shape for polygon in _polygons]
+
+        # (# zones, max # vertices) edges padded by degenerate ones, which never cross any ray
+        max_num_vertices: int = max(polygon.shape[0] for polygon in _polygons)
+        self._edge_starts: np.ndarray = np.zeros((len(_polygons), max_num_vertices, 2))
+        self._edge_ends: np.ndarray = np.zeros((len(_polygons), max_num_vertices, 2))
+        for idx, polygon in enumerate(_polygons):
+            self._edge_starts[idx, : polygon.shape[0]] = polygon
+            self._edge_ends[idx, : polygon.shape[0]] = np.roll(polygon, -1, axis=0)
+
+        # spatial index, i.e., zones whose bounding boxes overlap each bucket in CSR format
+        self._zone_lowers: np.ndarray = np.array([polygon.min(axis=0) for polygon in _polygons])
+        self._zone_uppers: np.ndarray = np.array([polygon.max(axis=0) for polygon in _polygons])
+        self._lower: np.ndarray = self._zone_lowers.min(axis=0)
+        extent: np.ndarray = np.maximum(self._zone_uppers.max(axis=0) - self._lower, 1e-12)
+
+        self._bucket_size: float = (
+            float(extent.max() / np.ceil(np.sqrt(len(_polygons))))
+            if bucket_size is None
+            else float(bucket_size)
+        )
+        assert self._bucket_size > 0.0, self._bucket_size
+        self._num_buckets: np.ndarray = np.floor(extent / self._bucket_size).astype(int) + 1
+
+        first_buckets: np.ndarray = self._bucket_indices(self._zone_lowers)
+        last_buckets: np.ndarray = self._bucket_indices(self._zone_uppers)
+        zone_bucket_pairs: list[tuple[int, int]] = [
+            (zone, bucket_x * self._num_buckets[1] + bucket_y)
+            for zone, (first, last) in enumerate(zip(first_buckets, last_buckets))
+            for bucket_x in range(first[0], last[0] + 1)
+            for bucket_y in range(first[1], last[1] + 1)
+        ]
+        zones, buckets = np.array(zone_bucket_pairs, int).T
+        order: np.ndarray = np.argsort(buckets, kind="stable")
+        self._bucket_zones: np.ndarray = zones[order]
+        self._bucket_starts: np.ndarray = np.searchsorted(
+            buckets[order], np.arange(self._num_buckets.prod() + 1)
+        )
+
+        # visualization
+
+        poly_kwargs: dict[str, Any] = dict(
+            facecolors="black",
+            edgecolors="none",
+            alpha=0.1,
+        )
+        poly_kwargs.update(**kwargs)
+        self._poly_collection: PolyCollection = PolyCollection(_polygons, **poly_kwargs)
+        if "alpha" not in kwargs and self._coefs_friction.max() > 0.0:
+            self._poly_collection.set_alpha(
+                (0.05 + 0.2 * self._coefs_friction / self._coefs_friction.max()).tolist()
+            )
+
+    # getters
+
+    @property
+    def num_zones(self) -> int:
+        return self._coefs_friction.size
+
+    # spatial index
+
+    def _bucket_indices(self, locs: np.ndarray) -> np.ndarray:
+        return np.floor((locs - self._lower) / self._bucket_size).astype(int)
+
+    def coefs_friction(self, locs: np.ndarray) -> np.ndarray:
+        """
+        :param locs: (..., dim) locations
+        :return: (...) (sum of) coefficients of friction of the zones containing locs
+        """
+        flat_locs: np.ndarray = locs.reshape(-1, locs.shape[-1])[:, :2]
+
+        bucket_indices: np.ndarray = self._bucket_indices(flat_locs)
+        is_inside: np.ndarray = np.all(
+            (bucket_indices >= 0) & (bucket_indices < self._num_buckets), axis=-1
+        )
+        points: np.ndarray = np.flatnonzero(is_inside)
+        buckets: np.ndarray = (
+            bucket_indices[is_inside, 0] * self._num_buckets[1] + bucket_indices[is_inside, 1]
+        )
+
+        # (point, candidate zone) pairs
+        num_candidates: np.ndarray = self._bucket_starts[buckets + 1] - self._bucket_starts[buckets]
+        points = np.repeat(points, num_candidates)
+        zones: np.ndarray = self._bucket_zones[
+            np.repeat(self._bucket_starts[buckets], num_candidates) + ranks_within(num_candidates)
+        ]
+
+        # candidates whose bounding boxes contain the points
+        is_in_box: np.ndarray = np.all(
+            (self._zone_lowers[zones] <= flat_locs[points])
+            & (flat_locs[points] <= self._zone_uppers[zones]),
+            axis=-1,
+        )
+        points = points[is_in_box]
+        zones = zones[is_in_box]
+
+        # crossing number of the horizontal ray from each point toward +x
+        x: np.ndarray = flat_locs[points, 0, np.newaxis]
+        y: np.ndarray = flat_locs[points, 1, np.newaxis]
+        starts: np.ndarray = self._edge_starts[zones]
+        ends: np.ndarray = self._edge_ends[zones]
+
+        straddles: np.ndarray = (starts[..., 1] > y) != (ends[..., 1] > y)
+        dy: np.ndarray = np.where(straddles, ends[..., 1] - starts[..., 1], 1.0)
+        crossing_x: np.ndarray = (
+            starts[..., 0] + (y - starts[..., 1]) * (ends[..., 0] - starts[..., 0]) / dy
+        )
+        is_in_zone: np.ndarray = (np.count_nonzero(straddles & (x < crossing_x), axis=-1) % 2) == 1
+
+        return (
+            np.bincount(
+                points[is_in_zone],
+                weights=self._coefs_friction[zones[is_in_zone]],
+                minlength=flat_locs.shape[0],
+            )
+            .astype(float)
+            .reshape(locs.shape[:-1])
+        )
+
+    # dynamics simulation
+
+    def force(self, time: float, body: BodyBase) -> np.ndarray:
+        return -self.coefs_friction(body.loc) * body.vel
+
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        force -= self.coefs_friction(locs)[..., np.newaxis] * vels
+
+    # visualization
+
+    def add_objs(self, ax: Axes) -> None:
+        ax.add_collection(self._poly_collection)
+
+    @property
+    def objs(self) -> Sequence[Artist]:
+        return [self._poly_collection]
@@ -7,7 +7,6 @@ import numpy as np
 
 from dynamics.bodies.bodies import Bodies
 from dynamics.bodies.body_base import BodyBase
-from dynamics.bodies.fixed_body_base import FixedBodyBase
 from dynamics.forces.force_base import ForceBase
 
 
@@ -28,11 +27,30 @@ class GravityLike(ForceBase):
     def force(self, time: float, body: BodyBase) -> np.ndarray:
         return body.mass * self._acceleration
 
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        force += masses[:, np.newaxis] * self._acceleration
+
     # potential energy
 
     def body_potential_energy(self, body: BodyBase) -> float:
         return -body.mass * float(np.dot(self._acceleration, body.loc))
 
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return -(masses * (locs @ self._acceleration)).sum(axis=-1), np.zeros(locs.shape[:-2])
+
     def x_potential_energy(self, body: BodyBase, x_1d: np.ndarray) -> np.ndarray:
         return -body.mass * self._acceleration[0] * x_1d
 
@@ -40,11 +58,26 @@ class GravityLike(ForceBase):
 
     def min_energy_matrices(self, bodies: Bodies) -> tuple[np.ndarray, np.ndarray]:
         num_coordinates: int = bodies.num_coordinates
-        b_1d: np.ndarray = np.zeros(num_coordinates)
-        for body in bodies.bodies:
-            if isinstance(body, FixedBodyBase):
-                continue
-            for _idx, idx in enumerate(bodies.coordinate_indices(body)):
-                b_1d[idx] = self.acceleration[_idx] * body.mass
+        return np.zeros((num_coordinates, num_coordinates)), self.min_energy_vectors(bodies)
+
+    def min_energy_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return np.zeros(0, int), np.zeros(0, int), np.zeros(0), self.min_energy_vectors(bodies)
+
+    def min_energy_vectors(
+        self, bodies: Bodies, accelerations: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        :param accelerations: (..., dim) accelerations in place of that of this force
+        :return: (..., # coordinates) contributions of the accelerations to the vectors of
+        the min energy systems, i.e., without those of the other forces,
+        e.g., of springs anchored to fixed bodies (see Forces.approx_min_energy_locs)
+        """
+        if accelerations is None:
+            accelerations = self.acceleration
 
-        return np.zeros((num_coordinates, num_coordinates)), b_1d
+        return (
+            bodies.masses[: bodies.num_free_bodies, np.newaxis]
+            * np.asarray(accelerations, float)[..., np.newaxis, :]
+        ).reshape(np.shape(accelerations)[:-1] + (bodies.num_coordinates,))
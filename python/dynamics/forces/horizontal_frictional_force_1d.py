@@ -54,6 +54,22 @@ class HorizontalFrictionalForce1D(FrictionalForceBase):
             [0.0 if body.loc[0] >= self._boundary else (-self._coef_friction * body.vel[0]), 0.0]
         )
 
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        force[..., 0] += np.where(
+            locs[..., 0] >= self._boundary, 0.0, -self._coef_friction * vels[..., 0]
+        )
+
     # visualization
 
     def add_objs(self, ax: Axes) -> None:
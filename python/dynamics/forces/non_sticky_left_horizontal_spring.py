@@ -25,6 +25,8 @@ class NonStickyLeftHorizontalSpring(SpringBase):
         super().__init__(spring_constant)
         self._equilibrium_point: float = float(equilibrium_point)
         self._cur_x: float = self._equilibrium_point
+        self._num_free_bodies: int | None = None
+        self._bodies: Bodies | None = None
 
         # visualization
 
@@ -58,6 +60,8 @@ class NonStickyLeftHorizontalSpring(SpringBase):
     def register_force(self, bodies: Bodies) -> None:
         for body in bodies.bodies:
             body.register_force(self)
+        self._num_free_bodies = bodies.num_free_bodies
+        self._bodies = bodies
 
     def force(self, time: float, body: BodyBase) -> np.ndarray:
         self._cur_x = body.loc[0]
@@ -68,6 +72,41 @@ class NonStickyLeftHorizontalSpring(SpringBase):
         )
         return np.array([force_x, 0.0])
 
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        assert self._num_free_bodies is not None, "register_force has not been called"
+        if self._num_free_bodies == 0:
+            return
+
+        x_1d: np.ndarray = locs[..., : self._num_free_bodies, 0]
+        force[..., : self._num_free_bodies, 0] += np.where(
+            x_1d >= self._equilibrium_point,
+            0.0,
+            self.spring_constant * (self._equilibrium_point - x_1d),
+        )
+
+        if locs.ndim == 2:
+            # as force does, keep the location of the last body for potential energy and drawing
+            self._cur_x = float(x_1d[-1])
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        return dict(cur_x=np.array(self._cur_x))
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        self._cur_x = float(state["cur_x"])
+
     # potential energy
 
     @property
@@ -78,6 +117,19 @@ class NonStickyLeftHorizontalSpring(SpringBase):
             else 0.0
         )
 
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        assert self._num_free_bodies is not None, "register_force has not been called"
+        x_1d: np.ndarray = locs[..., : self._num_free_bodies, 0]
+
+        return np.zeros(locs.shape[:-2]), (
+            0.5
+            * self.spring_constant
+            * (x_1d < self._equilibrium_point)
+            * np.power(x_1d - self._equilibrium_point, 2.0)
+        ).sum(axis=-1)
+
     def x_potential_energy(self, obj: BodyBase, x_1d: np.ndarray) -> np.ndarray:
         return (
             0.5
@@ -103,6 +155,17 @@ class NonStickyLeftHorizontalSpring(SpringBase):
 
         return a_2d, b_1d
 
+    def min_energy_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        indices: np.ndarray = np.arange(bodies.num_coordinates)
+        return (
+            indices,
+            indices,
+            np.full(indices.size, self.spring_constant),
+            np.full(indices.size, self.spring_constant * self.equilibrium_point),
+        )
+
     # visualization
 
     def _create_obj(self) -> Line2D:
@@ -117,10 +180,16 @@ class NonStickyLeftHorizontalSpring(SpringBase):
         ax.add_artist(self._line2d)
 
     def update_objs(self) -> None:
+        # the (last) free body in the store, which may have been advanced by another process
+        cur_x: float = (
+            float(self._bodies.locs[self._num_free_bodies - 1, 0])
+            if self._bodies is not None and self._num_free_bodies
+            else self._cur_x
+        )
         self._line2d.set_xdata(
             np.linspace(
                 self._equilibrium_point - self._SPRING_X_STRETCH,
-                self._cur_x if self._cur_x <= self._equilibrium_point else self._equilibrium_point,
+                cur_x if cur_x <= self._equilibrium_point else self._equilibrium_point,
                 self._t_1d_p.size,
             )
         )
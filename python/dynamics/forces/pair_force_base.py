@@ -0,0 +1,104 @@
+"""
+base class for forces between two bodies, e.g., springs and electric-force-like forces
+
+the force on the second body is evaluated only once per evaluation point, and the first body
+gets its opposite, i.e., Newton's third law
+"""
+
+from abc import abstractmethod
+
+import numpy as np
+from numpy.linalg import norm
+
+from dynamics.bodies.bodies import Bodies
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.force_base import ForceBase
+
+
+class PairForceBase(ForceBase):
+    def __init__(self, body_1: BodyBase, body_2: BodyBase) -> None:
+        self._body_1: BodyBase = body_1
+        self._body_2: BodyBase = body_2
+
+        self._body_1.register_force(self)
+        self._body_2.register_force(self)
+
+        self._rows: tuple[int, int] | None = None
+
+        # the last per-body evaluation, which is reused by the other body at the same locations
+        self._cached_locs: tuple[float, ...] | None = None
+        self._cached_second_body_force: np.ndarray = np.zeros_like(self._body_2.loc)
+
+    # getters
+
+    @property
+    def body_1(self) -> BodyBase:
+        return self._body_1
+
+    @property
+    def body_2(self) -> BodyBase:
+        return self._body_2
+
+    # dynamics simulation
+
+    def register_force(self, bodies: Bodies) -> None:
+        self._rows = bodies.row(self._body_1), bodies.row(self._body_2)
+
+    @abstractmethod
+    def second_body_force(self, vec_2_1: np.ndarray) -> np.ndarray:
+        """
+        :param vec_2_1: (..., dim) location of the second body relative to the first one
+        :return: (..., dim) force exerted on the second body
+        """
+        pass
+
+    def force(self, time: float, body: BodyBase) -> np.ndarray:
+        if body is not self._body_1 and body is not self._body_2:
+            return np.zeros_like(body.loc)
+
+        locs: tuple[float, ...] = tuple(self._body_1.loc) + tuple(self._body_2.loc)
+        if locs != self._cached_locs:
+            self._cached_second_body_force = self.second_body_force(
+                self._body_2.loc - self._body_1.loc
+            )
+            self._cached_locs = locs
+
+        return (
+            -self._cached_second_body_force
+            if body is self._body_1
+            else self._cached_second_body_force.copy()
+        )
+
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        row_1, row_2 = self._registered_rows
+        second_body_force: np.ndarray = self.second_body_force(
+            locs[..., row_2, :] - locs[..., row_1, :]
+        )
+
+        force[..., row_1, :] -= second_body_force
+        force[..., row_2, :] += second_body_force
+
+    # potential energy
+
+    def _pair_dist(self, locs: np.ndarray) -> np.ndarray:
+        """
+        :return: (...) distances between the two bodies for (..., # bodies, dim) locations
+        """
+        row_1, row_2 = self._registered_rows
+        return norm(locs[..., row_1, :] - locs[..., row_2, :], axis=-1)
+
+    @property
+    def _registered_rows(self) -> tuple[int, int]:
+        assert self._rows is not None, "register_force has not been called"
+        return self._rows
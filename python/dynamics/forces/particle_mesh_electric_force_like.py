@@ -0,0 +1,151 @@
+"""
+electric-force-like force between every pair of bodies in a group on the plane
+approximated by particle mesh
+
+the bodies are deposited onto the grid over xlim and ylim by cloud-in-cell weights,
+the field and potential are convolved with the (softened) law by FFT over the zero-padded grid,
+and they are interpolated back to the bodies by the same weights
+"""
+
+import numpy as np
+from numpy.linalg import norm
+
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.electric_force_like_group_base import ElectricForceLikeGroupBase
+
+
+class ParticleMeshElectricForceLike(ElectricForceLikeGroupBase):
+    # offsets of the four grid nodes around a body
+    _NODE_OFFSETS: np.ndarray = np.array([[0, 0], [1, 0], [0, 1], [1, 1]], int)
+
+    def __init__(
+        self,
+        coefficient: float | int,
+        exponent: float | int,
+        threshold: float | int,
+        bodies: list[BodyBase],
+        xlim: list[float | int],
+        ylim: list[float | int],
+        grid_size: int | list[int] = 128,
+    ) -> None:
+        """
+        :param grid_size: # of grid nodes along each axis (or along x and y axes),
+        whose spacing should be (much) less than threshold for accurate forces at short range
+
+        bodies outside xlim and ylim are regarded as on the boundary of the grid
+        """
+        assert all(body.loc.size == 2 for body in bodies), [body.loc.size for body in bodies]
+        super().__init__(coefficient, exponent, threshold, bodies)
+
+        self._lower: np.ndarray = np.array([xlim[0], ylim[0]], float)
+        self._upper: np.ndarray = np.array([xlim[1], ylim[1]], float)
+        assert np.all(self._lower < self._upper), (xlim, ylim)
+
+        self._grid_shape: tuple[int, int] = (
+            (int(grid_size), int(grid_size))
+            if isinstance(grid_size, int)
+            else (int(grid_size[0]), int(grid_size[1]))
+        )
+        assert min(self._grid_shape) >= 2, self._grid_shape
+        self._padded_grid_shape: tuple[int, int] = (
+            2 * self._grid_shape[0],
+            2 * self._grid_shape[1],
+        )
+        self._spacing: np.ndarray = (self._upper - self._lower) / (
+            np.array(self._grid_shape, float) - 1.0
+        )
+
+        # kernels indexed by (wrapped) displacements between grid nodes
+        displacements: np.ndarray = np.stack(
+            np.meshgrid(
+                *[
+                    np.fft.fftfreq(num_nodes, 1.0 / num_nodes) * spacing
+                    for num_nodes, spacing in zip(self._padded_grid_shape, self._spacing)
+                ],
+                indexing="ij",
+            ),
+            axis=-1,
+        )
+        dists: np.ndarray = norm(displacements, axis=-1)
+
+        self._potential_kernel_fft: np.ndarray = np.fft.rfft2(self._law.potential_energy(dists))
+        self._field_kernel_fft: np.ndarray = np.fft.rfft2(
+            self._law.force_factor(dists)[..., np.newaxis] * displacements, axes=(0, 1)
+        )
+
+        # potential energy between the four grid nodes around a body for its self energy
+        node_displacements: np.ndarray = (
+            self._NODE_OFFSETS[:, np.newaxis, :] - self._NODE_OFFSETS[np.newaxis, :, :]
+        ) * self._spacing
+        self._node_potential_energies: np.ndarray = self._law.potential_energy(
+            norm(node_displacements, axis=-1)
+        )
+
+    # getters
+
+    @property
+    def grid_shape(self) -> tuple[int, int]:
+        return self._grid_shape
+
+    @property
+    def spacing(self) -> np.ndarray:
+        return self._spacing
+
+    # forces & potential energy of the group
+
+    def group_forces(self, locs: np.ndarray) -> np.ndarray:
+        node_indices, weights = self._cloud_in_cell(locs)
+        field: np.ndarray = np.fft.irfft2(
+            self._density_fft(node_indices, weights)[..., np.newaxis] * self._field_kernel_fft,
+            s=self._padded_grid_shape,
+            axes=(0, 1),
+        )[: self._grid_shape[0], : self._grid_shape[1]].reshape(-1, 2)
+
+        return (weights[..., np.newaxis] * field[node_indices]).sum(axis=1)
+
+    def group_potential_energy(self, locs: np.ndarray) -> float:
+        node_indices, weights = self._cloud_in_cell(locs)
+        potential: np.ndarray = np.fft.irfft2(
+            self._density_fft(node_indices, weights) * self._potential_kernel_fft,
+            s=self._padded_grid_shape,
+        )[: self._grid_shape[0], : self._grid_shape[1]].ravel()
+
+        self_potential_energies: np.ndarray = np.einsum(
+            "na,ab,nb->n", weights, self._node_potential_energies, weights
+        )
+
+        return 0.5 * float(
+            ((weights * potential[node_indices]).sum(axis=1) - self_potential_energies).sum()
+        )
+
+    # grid
+
+    def _cloud_in_cell(self, locs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: (# bodies, 4) flat indices of the grid nodes around bodies and their weights
+        """
+        grid_locs: np.ndarray = np.clip(
+            (locs - self._lower) / self._spacing,
+            0.0,
+            np.array(self._grid_shape, float) - 1.0,
+        )
+        cells: np.ndarray = np.minimum(
+            np.floor(grid_locs).astype(int), np.array(self._grid_shape) - 2
+        )
+        fractions: np.ndarray = grid_locs - cells
+
+        nodes: np.ndarray = cells[:, np.newaxis, :] + self._NODE_OFFSETS
+        weights: np.ndarray = np.where(
+            self._NODE_OFFSETS == 1, fractions[:, np.newaxis, :], 1.0 - fractions[:, np.newaxis, :]
+        ).prod(axis=-1)
+
+        return nodes[..., 0] * self._grid_shape[1] + nodes[..., 1], weights
+
+    def _density_fft(self, node_indices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        density: np.ndarray = np.bincount(
+            node_indices.ravel(),
+            weights=weights.ravel(),
+            minlength=self._grid_shape[0] * self._grid_shape[1],
+        ).reshape(self._grid_shape)
+
+        return np.fft.rfft2(density, s=self._padded_grid_shape)
@@ -15,12 +15,13 @@ from matplotlib.patches import Polygon
 from dynamics.bodies.bodies import Bodies
 from dynamics.bodies.fixed_body_base import FixedBodyBase
 from dynamics.bodies.point_mass import PointMass
+from dynamics.forces.pair_force_base import PairForceBase
 from dynamics.forces.spring_base import SpringBase
 from dynamics.bodies.body_base import BodyBase
 from dynamics.bodies.vertical_wall_1d import VerticalWall1D
 
 
-class Spring(SpringBase):
+class Spring(SpringBase, PairForceBase):
     def __init__(
         self,
         spring_constant: float | int,
@@ -29,15 +30,11 @@ class Spring(SpringBase):
         body_2: BodyBase,
         **kwargs
     ) -> None:
-        super().__init__(spring_constant)
+        SpringBase.__init__(self, spring_constant)
+        PairForceBase.__init__(self, body_1, body_2)
 
         assert natural_length >= 0.0, natural_length
         self._natural_length: float = float(natural_length)
-        self._body_1: BodyBase = body_1
-        self._body_2: BodyBase = body_2
-
-        self._body_1.register_force(self)
-        self._body_2.register_force(self)
 
         # visualization
 
@@ -70,20 +67,10 @@ class Spring(SpringBase):
 
     # dynamics simulation
 
-    def force(self, time: float, body: BodyBase) -> np.ndarray:
-        if body is self._body_1:
-            return -self._second_body_force(time)
-        elif body is self._body_2:
-            return self._second_body_force(time)
-        else:
-            return np.zeros(2)
-
-    def _second_body_force(self, time: float) -> np.ndarray:
-        vec_2_1: np.ndarray = self._body_2.loc - self._body_1.loc
-        assert norm(vec_2_1) > 0.0, vec_2_1
-        return (
-            -self.spring_constant * (norm(vec_2_1) - self._natural_length) / norm(vec_2_1)
-        ) * vec_2_1
+    def second_body_force(self, vec_2_1: np.ndarray) -> np.ndarray:
+        dist: np.ndarray = norm(vec_2_1, axis=-1, keepdims=True)
+        assert np.all(dist > 0.0), vec_2_1
+        return (-self.spring_constant * (dist - self._natural_length) / dist) * vec_2_1
 
     # potential energy
 
@@ -93,6 +80,26 @@ class Spring(SpringBase):
 
         return _a_2d_1 + _a_2d_2, _b_1d_1 + _b_1d_2
 
+    def min_energy_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return self._zero_length_min_energy_triplets(
+            bodies,
+            np.array([bodies.row(self._body_1)]),
+            np.array([bodies.row(self._body_2)]),
+            np.array([self.spring_constant]),
+        )
+
+    def min_energy_fixed_locs_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._zero_length_fixed_locs_triplets(
+            bodies,
+            np.array([bodies.row(self._body_1)]),
+            np.array([bodies.row(self._body_2)]),
+            np.array([self.spring_constant]),
+        )
+
     def _min_energy_matrices(
         self, body_1: BodyBase, body_2: BodyBase, bodies: Bodies
     ) -> tuple[np.ndarray, np.ndarray]:
@@ -129,6 +136,13 @@ class Spring(SpringBase):
             * float(norm(self._body_1.loc - self._body_2.loc) - self._natural_length) ** 2.0
         )
 
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros(locs.shape[:-2]), 0.5 * self.spring_constant * np.power(
+            self._pair_dist(locs) - self._natural_length, 2.0
+        )
+
     def x_potential_energy(self, body: BodyBase, x_1d: np.ndarray) -> np.ndarray:
         if not isinstance(self._body_1, VerticalWall1D) and not isinstance(
             self._body_2, VerticalWall1D
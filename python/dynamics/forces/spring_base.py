@@ -2,6 +2,9 @@
 base class for all types of springs
 """
 
+import numpy as np
+
+from dynamics.bodies.bodies import Bodies
 from dynamics.forces.force_base import ForceBase
 
 
@@ -20,3 +23,78 @@ class SpringBase(ForceBase):
     @property
     def spring_constant(self) -> float:
         return self._spring_constant
+
+    # potential energy solving
+
+    @staticmethod
+    def _zero_length_min_energy_triplets(
+        bodies: Bodies, rows_1: np.ndarray, rows_2: np.ndarray, spring_constants: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        min_energy_triplets of springs between the bodies at rows_1 and rows_2 of the state store
+        linearized as if their natural lengths were zero
+        """
+        num_free_bodies: int = bodies.num_free_bodies
+        dim: int = bodies.locs.shape[1]
+        coordinate_offsets: np.ndarray = np.arange(dim)
+
+        rows: list[np.ndarray] = list()
+        cols: list[np.ndarray] = list()
+        values: list[np.ndarray] = list()
+
+        for _rows_1, _rows_2 in ((rows_1, rows_2), (rows_2, rows_1)):
+            is_free_1: np.ndarray = _rows_1 < num_free_bodies
+            is_free_2: np.ndarray = _rows_2 < num_free_bodies
+
+            indices_1: np.ndarray = (
+                _rows_1[is_free_1, np.newaxis] * dim + coordinate_offsets
+            ).ravel()
+            rows.append(indices_1)
+            cols.append(indices_1)
+            values.append(np.repeat(spring_constants[is_free_1], dim))
+
+            is_both_free: np.ndarray = is_free_1 & is_free_2
+            rows.append((_rows_1[is_both_free, np.newaxis] * dim + coordinate_offsets).ravel())
+            cols.append((_rows_2[is_both_free, np.newaxis] * dim + coordinate_offsets).ravel())
+            values.append(-np.repeat(spring_constants[is_both_free], dim))
+
+        fixed_rows, fixed_cols, fixed_values = SpringBase._zero_length_fixed_locs_triplets(
+            bodies, rows_1, rows_2, spring_constants
+        )
+        b_1d: np.ndarray = np.bincount(
+            fixed_rows,
+            weights=fixed_values * bodies.locs[num_free_bodies:].ravel()[fixed_cols],
+            minlength=bodies.num_coordinates,
+        )
+
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(values), b_1d
+
+    @staticmethod
+    def _zero_length_fixed_locs_triplets(
+        bodies: Bodies, rows_1: np.ndarray, rows_2: np.ndarray, spring_constants: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        min_energy_fixed_locs_triplets of the springs of _zero_length_min_energy_triplets,
+        i.e., the spring constant at every coordinate of the free body of each spring between
+        a free body and a fixed one
+        """
+        num_free_bodies: int = bodies.num_free_bodies
+        dim: int = bodies.locs.shape[1]
+        coordinate_offsets: np.ndarray = np.arange(dim)
+
+        rows: list[np.ndarray] = list()
+        cols: list[np.ndarray] = list()
+        values: list[np.ndarray] = list()
+
+        for _rows_1, _rows_2 in ((rows_1, rows_2), (rows_2, rows_1)):
+            is_free_fixed: np.ndarray = (_rows_1 < num_free_bodies) & (_rows_2 >= num_free_bodies)
+            rows.append((_rows_1[is_free_fixed, np.newaxis] * dim + coordinate_offsets).ravel())
+            cols.append(
+                (
+                    (_rows_2[is_free_fixed, np.newaxis] - num_free_bodies) * dim
+                    + coordinate_offsets
+                ).ravel()
+            )
+            values.append(np.repeat(spring_constants[is_free_fixed], dim))
+
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
@@ -0,0 +1,228 @@
+"""
+network of springs stored as arrays of (body 1, body 2, spring constant, natural length)
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+from numpy.linalg import norm
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+
+from dynamics.array_ops import scatter_add_rows
+from dynamics.bodies.bodies import Bodies
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.spring_base import SpringBase
+from dynamics.sparse_matrix import SparseMatrix
+
+
+class SpringNetwork(SpringBase):
+    def __init__(
+        self,
+        spring_constants: np.ndarray | list[float | int],
+        natural_lengths: np.ndarray | list[float | int],
+        body_pairs: list[tuple[BodyBase, BodyBase]],
+        **kwargs
+    ) -> None:
+        self._spring_constants: np.ndarray = np.array(spring_constants, float)
+        self._natural_lengths: np.ndarray = np.array(natural_lengths, float)
+        assert self._spring_constants.shape == (len(body_pairs),), (
+            self._spring_constants.shape,
+            len(body_pairs),
+        )
+        assert self._natural_lengths.shape == (len(body_pairs),), (
+            self._natural_lengths.shape,
+            len(body_pairs),
+        )
+        assert np.all(self._spring_constants > 0.0), self._spring_constants
+        assert np.all(self._natural_lengths >= 0.0), self._natural_lengths
+        super().__init__(float(self._spring_constants.mean()) if body_pairs else 1.0)
+
+        self._body_pairs: list[tuple[BodyBase, BodyBase]] = list(body_pairs)
+
+        registered_body_ids: set[int] = set()
+        for body_pair in self._body_pairs:
+            for body in body_pair:
+                if id(body) not in registered_body_ids:
+                    body.register_force(self)
+                    registered_body_ids.add(id(body))
+
+        # set by register_force
+        self._rows_1: np.ndarray = np.zeros(0, int)
+        self._rows_2: np.ndarray = np.zeros(0, int)
+        self._body_row_map: dict[int, int] = dict()
+        self._row_edges_map: dict[int, tuple[np.ndarray, np.ndarray]] = dict()
+        self._locs: np.ndarray | None = None
+
+        # visualization
+
+        self._line_collection_kwargs: dict[str, Any] = dict(
+            linestyles="-",
+            colors="blue",
+            alpha=0.5,
+            linewidths=self._SPRING_UNIT_CONSTANT_LINE_WIDTH
+            * np.power(self._spring_constants, 1.0 / 3.0),
+        )
+        self._line_collection_kwargs.update(**kwargs)
+        self._line_collection: LineCollection = LineCollection(
+            self._segments(
+                np.array([[body.loc for body in body_pair] for body_pair in self._body_pairs])
+            ).reshape(-1, 2, 2),
+            **self._line_collection_kwargs
+        )
+
+    # getters
+
+    @property
+    def num_springs(self) -> int:
+        return self._spring_constants.size
+
+    @property
+    def spring_constants(self) -> np.ndarray:
+        return self._spring_constants
+
+    @property
+    def natural_lengths(self) -> np.ndarray:
+        return self._natural_lengths
+
+    # dynamics simulation
+
+    def register_force(self, bodies: Bodies) -> None:
+        self._rows_1 = np.array([bodies.row(body_1) for body_1, _ in self._body_pairs], int)
+        self._rows_2 = np.array([bodies.row(body_2) for _, body_2 in self._body_pairs], int)
+        self._locs = bodies.locs
+        self._body_row_map = {
+            id(body): bodies.row(body) for body_pair in self._body_pairs for body in body_pair
+        }
+
+        edges: np.ndarray = np.arange(self.num_springs)
+        self._row_edges_map = dict()
+        for row in np.union1d(self._rows_1, self._rows_2):
+            self._row_edges_map[int(row)] = (
+                edges[self._rows_1 == row],
+                edges[self._rows_2 == row],
+            )
+
+    def force(self, time: float, body: BodyBase) -> np.ndarray:
+        if id(body) not in self._body_row_map:
+            return np.zeros_like(body.loc)
+
+        assert self._locs is not None, "register_force has not been called"
+        edges_as_1, edges_as_2 = self._row_edges_map[self._body_row_map[id(body)]]
+
+        return self._second_body_forces(self._locs, edges_as_2).sum(
+            axis=0
+        ) - self._second_body_forces(self._locs, edges_as_1).sum(axis=0)
+
+    @property
+    def supports_batched_force(self) -> bool:
+        return True
+
+    def accumulate_force(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force: np.ndarray,
+    ) -> None:
+        second_body_forces: np.ndarray = self._second_body_forces(locs)
+
+        scatter_add_rows(force, self._rows_2, second_body_forces)
+        scatter_add_rows(force, self._rows_1, -second_body_forces)
+
+    def _second_body_forces(self, locs: np.ndarray, edges: np.ndarray | None = None) -> np.ndarray:
+        """
+        :return: (..., # springs, dim) forces exerted on the second bodies of springs
+        (or only of those in edges)
+        """
+        rows_1: np.ndarray = self._rows_1 if edges is None else self._rows_1[edges]
+        rows_2: np.ndarray = self._rows_2 if edges is None else self._rows_2[edges]
+        spring_constants: np.ndarray = (
+            self._spring_constants if edges is None else self._spring_constants[edges]
+        )
+        natural_lengths: np.ndarray = (
+            self._natural_lengths if edges is None else self._natural_lengths[edges]
+        )
+
+        vecs_2_1: np.ndarray = locs[..., rows_2, :] - locs[..., rows_1, :]
+        dists: np.ndarray = norm(vecs_2_1, axis=-1, keepdims=True)
+        assert np.all(dists > 0.0), dists
+
+        return (
+            -spring_constants[:, np.newaxis] * (dists - natural_lengths[:, np.newaxis]) / dists
+        ) * vecs_2_1
+
+    # potential energy
+
+    @property
+    def potential_energy(self) -> tuple[float, float]:
+        assert self._locs is not None, "register_force has not been called"
+        non_spring_potential_energy, spring_potential_energy = self.batched_potential_energy(
+            self._locs, np.zeros(0)
+        )
+        return float(non_spring_potential_energy), float(spring_potential_energy)
+
+    def batched_potential_energy(
+        self, locs: np.ndarray, masses: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        dists: np.ndarray = norm(locs[..., self._rows_2, :] - locs[..., self._rows_1, :], axis=-1)
+        return np.zeros(locs.shape[:-2]), 0.5 * (
+            self._spring_constants * np.square(dists - self._natural_lengths)
+        ).sum(axis=-1)
+
+    def min_energy_matrices(self, bodies: Bodies) -> tuple[np.ndarray, np.ndarray]:
+        rows, cols, values, b_1d = self.min_energy_triplets(bodies)
+        return SparseMatrix(bodies.num_coordinates, rows, cols, values).to_dense(), b_1d
+
+    def min_energy_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        the same (zero-natural-length) linearization as Spring.min_energy_triplets
+        """
+        return self._zero_length_min_energy_triplets(
+            bodies,
+            np.array([bodies.row(body_1) for body_1, _ in self._body_pairs], int),
+            np.array([bodies.row(body_2) for _, body_2 in self._body_pairs], int),
+            self._spring_constants,
+        )
+
+    def min_energy_fixed_locs_triplets(
+        self, bodies: Bodies
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._zero_length_fixed_locs_triplets(
+            bodies,
+            np.array([bodies.row(body_1) for body_1, _ in self._body_pairs], int),
+            np.array([bodies.row(body_2) for _, body_2 in self._body_pairs], int),
+            self._spring_constants,
+        )
+
+    # visualization
+
+    @staticmethod
+    def _segments(pair_locs: np.ndarray) -> np.ndarray:
+        """
+        :param pair_locs: (# springs, 2, dim) locations of both ends of springs
+        :return: (# springs, 2, 2) line segments on the plane
+        """
+        return pair_locs[..., :2]
+
+    def add_objs(self, ax: Axes) -> None:
+        ax.add_collection(self._line_collection)
+
+    def update_objs(self) -> None:
+        if self._locs is None:
+            return
+        self._line_collection.set_segments(
+            self._segments(np.stack((self._locs[self._rows_1], self._locs[self._rows_2]), axis=1))
+        )
+
+    @property
+    def objs(self) -> Sequence[Artist]:
+        return [self._line_collection]
+
+    @property
+    def updated_objs(self) -> Sequence[Artist]:
+        return self.objs
@@ -0,0 +1,73 @@
+"""
+electric-force-like group creator instantiating one of the electric-force-like forces
+between every pair of bodies in a group from user-entered input data
+
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any
+
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.barnes_hut_electric_force_like import BarnesHutElectricForceLike
+from dynamics.forces.cutoff_electric_force_like import CutoffElectricForceLike
+from dynamics.forces.electric_force_like_group import ElectricForceLikeGroup
+from dynamics.forces.electric_force_like_group_base import ElectricForceLikeGroupBase
+from dynamics.forces.particle_mesh_electric_force_like import ParticleMeshElectricForceLike
+from dynamics.instant_creators.constants import Constants
+
+
+class ElectricForceLikeGroupCreator:
+    NAME_GROUP_CLASS_MAP: dict[str, type[ElectricForceLikeGroupBase]] = dict(
+        exact=ElectricForceLikeGroup,
+        barnes_hut=BarnesHutElectricForceLike,
+        cutoff=CutoffElectricForceLike,
+        particle_mesh=ParticleMeshElectricForceLike,
+    )
+
+    @classmethod
+    def create(
+        cls,
+        data: dict[str, Any],
+        id_body_map: dict[str, BodyBase],
+        constants: Constants,
+        simulation_setting: dict[str, Any],
+    ) -> ElectricForceLikeGroupBase:
+        """
+        the group is either the list of body ids under bodies or the ids matching
+        body_id_pattern (e.g., ball_*), and method (exact by default) chooses the evaluation,
+        whose parameters are given as the other fields, e.g., opening_angle for barnes_hut
+        """
+        _data: dict[str, Any] = data.copy()
+
+        _data.pop("id", None)
+
+        coefficient: float | int = constants.value(_data.pop("coefficient"))
+        exponent: float | int = constants.value(_data.pop("exponent"))
+        threshold: float | int = constants.value(_data.pop("threshold"))
+
+        body_ids: list[str]
+        if "bodies" in _data:
+            body_ids = _data.pop("bodies")
+        else:
+            body_id_pattern: str = _data.pop("body_id_pattern")
+            body_ids = [body_id for body_id in id_body_map if fnmatchcase(body_id, body_id_pattern)]
+        assert len(body_ids) >= 2, body_ids
+        bodies: list[BodyBase] = [id_body_map[body_id] for body_id in body_ids]
+
+        method: str = _data.pop("method", "exact")
+        assert method in cls.NAME_GROUP_CLASS_MAP, (method, list(cls.NAME_GROUP_CLASS_MAP.keys()))
+
+        if method == "particle_mesh":
+            _data["xlim"] = _data.get("xlim", simulation_setting["xlim"])
+            _data["ylim"] = _data.get("ylim", simulation_setting["ylim"])
+
+        return cls.NAME_GROUP_CLASS_MAP[method](
+            coefficient,
+            exponent,
+            threshold,
+            bodies,
+            **{
+                key: value if isinstance(value, (list, bool)) else constants.value(value)
+                for key, value in _data.items()
+            },
+        )
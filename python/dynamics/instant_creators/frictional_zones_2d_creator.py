@@ -0,0 +1,41 @@
+"""
+2d frictional zones creator instantiating FrictionalZones2D from user-entered input data
+
+"""
+
+from typing import Any
+
+from dynamics.forces.frictional_zones_2d import FrictionalZones2D
+from dynamics.instant_creators.constants import Constants
+
+
+class FrictionalZones2DCreator:
+    @staticmethod
+    def create(data: dict[str, Any], constants: Constants) -> FrictionalZones2D:
+        """
+        each zone has coefficient_of_friction and either rectangle, i.e.,
+        [lower left point, upper right point], or polygon, i.e., list of vertices
+        """
+        _data: dict[str, Any] = data.copy()
+        _data.pop("id", None)
+
+        coefs_friction: list[float | int] = list()
+        polygons: list[list[list[float | int]]] = list()
+
+        for zone_data in _data.pop("zones"):
+            _zone_data: dict[str, Any] = zone_data.copy()
+            coefs_friction.append(constants.value(_zone_data.pop("coefficient_of_friction")))
+
+            if "rectangle" in _zone_data:
+                (x_1, y_1), (x_2, y_2) = _zone_data.pop("rectangle")
+                polygons.append([[x_1, y_1], [x_2, y_1], [x_2, y_2], [x_1, y_2]])
+            else:
+                polygons.append(_zone_data.pop("polygon"))
+
+            assert len(_zone_data) == 0, _zone_data
+
+        bucket_size: float | int | None = (
+            constants.value(_data.pop("bucket_size")) if "bucket_size" in _data else None
+        )
+
+        return FrictionalZones2D(coefs_friction, polygons, bucket_size, **_data)
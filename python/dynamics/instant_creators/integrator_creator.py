@@ -0,0 +1,42 @@
+"""
+integrator creator instantiating one of the registered integrators from user-entered input data
+
+"""
+
+from dynamics.integrators.dormand_prince import DormandPrince45
+from dynamics.integrators.integrator_base import IntegratorBase
+from dynamics.integrators.leapfrog import Leapfrog
+from dynamics.integrators.predictor_corrector import PredictorCorrector
+from dynamics.integrators.rk4 import RungeKutta4
+from dynamics.integrators.velocity_verlet import VelocityVerlet
+from dynamics.integrators.yoshida4 import Yoshida4
+from dynamics.instant_creators.constants import Constants
+
+
+class IntegratorCreator:
+    NAME_INTEGRATOR_CLASS_MAP: dict[str, type[IntegratorBase]] = dict(
+        current=PredictorCorrector,
+        velocity_verlet=VelocityVerlet,
+        leapfrog=Leapfrog,
+        rk4=RungeKutta4,
+        yoshida4=Yoshida4,
+        dormand_prince=DormandPrince45,
+    )
+
+    @classmethod
+    def register(cls, name: str, integrator_class: type[IntegratorBase]) -> None:
+        assert name not in cls.NAME_INTEGRATOR_CLASS_MAP, name
+        cls.NAME_INTEGRATOR_CLASS_MAP[name] = integrator_class
+
+    @classmethod
+    def create(cls, data: dict[str, str | float | int], constants: Constants) -> IntegratorBase:
+        _data: dict[str, str | float | int] = data.copy()
+        name: str = _data.pop("name")  # type:ignore
+        assert name in cls.NAME_INTEGRATOR_CLASS_MAP, (
+            name,
+            list(cls.NAME_INTEGRATOR_CLASS_MAP.keys()),
+        )
+
+        return cls.NAME_INTEGRATOR_CLASS_MAP[name](
+            **{key: constants.value(value) for key, value in _data.items()}
+        )
@@ -0,0 +1,50 @@
+"""
+SpringNetwork creator instantiating SpringNetwork from user-entered input data
+
+"""
+
+from typing import Any
+
+from dynamics.bodies.body_base import BodyBase
+from dynamics.forces.spring_network import SpringNetwork
+from dynamics.instant_creators.constants import Constants
+
+
+class SpringNetworkCreator:
+    @staticmethod
+    def create(
+        data: dict[str, Any],
+        id_body_map: dict[str, BodyBase],
+        constants: Constants,
+    ) -> SpringNetwork:
+        """
+        each edge is either [body id 1, body id 2], which takes spring_constant and natural_length
+        of the network, or [body id 1, body id 2, spring constant, natural length]
+        """
+        _data: dict[str, Any] = data.copy()
+
+        _data.pop("id", None)
+        spring_constant: float | int | None = (
+            constants.value(_data.pop("spring_constant")) if "spring_constant" in _data else None
+        )
+        natural_length: float | int | None = (
+            constants.value(_data.pop("natural_length")) if "natural_length" in _data else None
+        )
+
+        spring_constants: list[float | int] = list()
+        natural_lengths: list[float | int] = list()
+        body_pairs: list[tuple[BodyBase, BodyBase]] = list()
+
+        for edge in _data.pop("edges"):
+            assert len(edge) in (2, 4), edge
+            body_pairs.append((id_body_map[edge[0]], id_body_map[edge[1]]))
+
+            if len(edge) == 4:
+                spring_constants.append(constants.value(edge[2]))
+                natural_lengths.append(constants.value(edge[3]))
+            else:
+                assert spring_constant is not None and natural_length is not None, edge
+                spring_constants.append(spring_constant)
+                natural_lengths.append(natural_length)
+
+        return SpringNetwork(spring_constants, natural_lengths, body_pairs, **_data)
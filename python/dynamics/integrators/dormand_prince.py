@@ -0,0 +1,241 @@
+"""
+Dormand-Prince 5(4) integrator with embedded error estimation and adaptive step lengths
+"""
+
+import numpy as np
+
+from dynamics.integrators.integrator_base import ForceFunction, IntegratorBase
+
+
+class DormandPrince45(IntegratorBase):
+    _C: tuple[float, ...] = (0.0, 1.0 / 5.0, 3.0 / 10.0, 4.0 / 5.0, 8.0 / 9.0, 1.0, 1.0)
+    _A: tuple[tuple[float, ...], ...] = (
+        (),
+        (1.0 / 5.0,),
+        (3.0 / 40.0, 9.0 / 40.0),
+        (44.0 / 45.0, -56.0 / 15.0, 32.0 / 9.0),
+        (19372.0 / 6561.0, -25360.0 / 2187.0, 64448.0 / 6561.0, -212.0 / 729.0),
+        (9017.0 / 3168.0, -355.0 / 33.0, 46732.0 / 5247.0, 49.0 / 176.0, -5103.0 / 18656.0),
+        (35.0 / 384.0, 0.0, 500.0 / 1113.0, 125.0 / 192.0, -2187.0 / 6784.0, 11.0 / 84.0),
+    )
+    # 5th order weights (the last row of _A, i.e., first same as last) minus 4th order weights
+    _E: tuple[float, ...] = (
+        71.0 / 57600.0,
+        0.0,
+        -71.0 / 16695.0,
+        71.0 / 1920.0,
+        -17253.0 / 339200.0,
+        22.0 / 525.0,
+        -1.0 / 40.0,
+    )
+
+    _SAFETY: float = 0.9
+    _MIN_FACTOR: float = 0.2
+    _MAX_FACTOR: float = 5.0
+
+    def __init__(
+        self, atol: float | int = 1e-6, rtol: float | int = 1e-6, max_step: float | int = np.inf
+    ) -> None:
+        super().__init__()
+        assert atol > 0.0, atol
+        assert rtol >= 0.0, rtol
+        assert max_step > 0.0, max_step
+
+        self._atol: float = float(atol)
+        self._rtol: float = float(rtol)
+        self._max_step: float = float(max_step)
+
+        self._step_length: float | None = None
+        self._num_rejected_steps: int = 0
+
+    def fresh_copy(self) -> "DormandPrince45":
+        return DormandPrince45(self._atol, self._rtol, self._max_step)
+
+    # statistics
+
+    @property
+    def num_rejected_steps(self) -> int:
+        return self._num_rejected_steps
+
+    @property
+    def step_length(self) -> float | None:
+        """
+        step length to try next
+        """
+        return self._step_length
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        state: dict[str, np.ndarray] = super().checkpoint_state()
+        state.update(
+            # NaN for no step length tried yet
+            step_length=np.array(np.nan if self._step_length is None else self._step_length),
+            num_rejected_steps=np.array(self._num_rejected_steps),
+        )
+        return state
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        super().restore_checkpoint_state(state)
+        step_length: float = float(state["step_length"])
+        self._step_length = None if np.isnan(step_length) else step_length
+        self._num_rejected_steps = int(state["num_rejected_steps"])
+
+    # integration
+
+    def advance(
+        self,
+        t_1: float,
+        t_2: float,
+        t_step: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        """
+        advance locs and vels in place from t_1 to t_2 with as many steps as the tolerances require;
+        t_step is only used as the very first step length to try
+        """
+        dissipated_energy: np.ndarray = np.zeros(locs.shape[:-1])
+        if locs.size == 0:
+            return dissipated_energy
+
+        inv_masses: np.ndarray = 1.0 / masses[:, np.newaxis]
+
+        step_length: float = min(
+            self._step_length if self._step_length is not None else t_step, self._max_step
+        )
+
+        force, frictional_force = force_function(t_1, locs, vels)
+        first_stage: tuple[np.ndarray, np.ndarray] = (
+            force * inv_masses,
+            self._dissipated_power(frictional_force, vels),
+        )
+
+        time: float = t_1
+        while time < t_2:
+            clamped: bool = step_length >= t_2 - time
+            _step_length: float = t_2 - time if clamped else step_length
+            assert _step_length > 1e-14 * max(1.0, abs(time)), (time, _step_length)
+
+            new_locs, new_vels, step_dissipated_energy, error, last_stage = self._trial_step(
+                time, _step_length, locs, vels, inv_masses, force_function, first_stage
+            )
+            factor: float = min(
+                self._MAX_FACTOR,
+                max(
+                    self._MIN_FACTOR,
+                    self._SAFETY * (np.power(error, -0.2) if error > 0.0 else self._MAX_FACTOR),
+                ),
+            )
+
+            if error <= 1.0:
+                locs[...] = new_locs
+                vels[...] = new_vels
+                dissipated_energy += step_dissipated_energy
+                first_stage = last_stage
+                time = t_2 if clamped else time + _step_length
+                self._on_step_accepted(time, locs, vels, dissipated_energy)
+
+                # a step shortened only to land on t_2 says nothing about the step length to use
+                if not clamped or _step_length * factor > step_length:
+                    step_length = min(_step_length * factor, self._max_step)
+            else:
+                self._num_rejected_steps += 1
+                step_length = _step_length * min(1.0, factor)
+
+        self._step_length = step_length
+
+        return dissipated_energy
+
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        """
+        advance locs and vels in place by one 5th order step without error control
+        """
+        inv_masses: np.ndarray = 1.0 / masses[:, np.newaxis]
+        force, frictional_force = force_function(t_1, locs, vels)
+
+        new_locs, new_vels, dissipated_energy, _, _ = self._trial_step(
+            t_1,
+            t_2 - t_1,
+            locs,
+            vels,
+            inv_masses,
+            force_function,
+            (force * inv_masses, self._dissipated_power(frictional_force, vels)),
+        )
+        locs[...] = new_locs
+        vels[...] = new_vels
+
+        return dissipated_energy
+
+    def _trial_step(
+        self,
+        time: float,
+        step_length: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        inv_masses: np.ndarray,
+        force_function: ForceFunction,
+        first_stage: tuple[np.ndarray, np.ndarray],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, float, tuple[np.ndarray, np.ndarray]]:
+        """
+        :return: 5th order locations, velocities, and dissipated energy, the scaled error norm,
+        and the accelerations and dissipated powers at the new state (for the next first stage)
+        """
+        stage_vels: list[np.ndarray] = [vels]
+        stage_accs: list[np.ndarray] = [first_stage[0]]
+        stage_powers: list[np.ndarray] = [first_stage[1]]
+
+        for idx in range(1, len(self._C)):
+            _locs: np.ndarray = locs + step_length * sum(
+                coef * stage_vel for coef, stage_vel in zip(self._A[idx], stage_vels)
+            )
+            _vels: np.ndarray = vels + step_length * sum(
+                coef * stage_acc for coef, stage_acc in zip(self._A[idx], stage_accs)
+            )
+            force, frictional_force = force_function(
+                time + self._C[idx] * step_length, _locs, _vels
+            )
+            stage_vels.append(_vels)
+            stage_accs.append(force * inv_masses)
+            stage_powers.append(self._dissipated_power(frictional_force, _vels))
+
+        # the last stage is evaluated at the 5th order solution
+        new_locs: np.ndarray = _locs
+        new_vels: np.ndarray = _vels
+        dissipated_energy: np.ndarray = step_length * sum(
+            coef * stage_power for coef, stage_power in zip(self._A[-1], stage_powers)
+        )
+
+        loc_error: np.ndarray = step_length * sum(
+            coef * stage_vel for coef, stage_vel in zip(self._E, stage_vels)
+        )
+        vel_error: np.ndarray = step_length * sum(
+            coef * stage_acc for coef, stage_acc in zip(self._E, stage_accs)
+        )
+
+        loc_scale: np.ndarray = self._atol + self._rtol * np.maximum(np.abs(locs), np.abs(new_locs))
+        vel_scale: np.ndarray = self._atol + self._rtol * np.maximum(np.abs(vels), np.abs(new_vels))
+
+        # root mean square over bodies and coordinates, and the worst among leading axes if any
+        error: float = float(
+            np.sqrt(
+                (
+                    np.square(loc_error / loc_scale).mean(axis=(-2, -1))
+                    + np.square(vel_error / vel_scale).mean(axis=(-2, -1))
+                )
+                / 2.0
+            ).max()
+        )
+
+        return new_locs, new_vels, dissipated_energy, error, (stage_accs[-1], stage_powers[-1])
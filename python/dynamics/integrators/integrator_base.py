@@ -0,0 +1,117 @@
+"""
+base class for time integrators advancing the state of all the free bodies simultaneously
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable
+
+import numpy as np
+
+ForceFunction = Callable[[float, np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+# called with time, locations, velocities, and energy dissipated since the start of advance
+StepCallback = Callable[[float, np.ndarray, np.ndarray, np.ndarray], None]
+
+
+class IntegratorBase(ABC):
+    """
+    every integrator works on (..., # free bodies, dim) locations and velocities
+    with a force function, which returns the total forces and the frictional forces
+    for given time, locations, and velocities
+    """
+
+    def __init__(self) -> None:
+        self._num_accepted_steps: int = 0
+        self._step_callback: StepCallback | None = None
+
+    def fresh_copy(self) -> "IntegratorBase":
+        """
+        new integrator of the same type and settings, i.e., without any state of this one
+        such as the step length to try next, the statistics, or the step callback
+        """
+        return type(self)()
+
+    # statistics
+
+    @property
+    def num_accepted_steps(self) -> int:
+        return self._num_accepted_steps
+
+    @property
+    def num_rejected_steps(self) -> int:
+        return 0
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """
+        state carried over from one advance to the next, e.g., the step length to try next
+        """
+        return dict(num_accepted_steps=np.array(self._num_accepted_steps))
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        self._num_accepted_steps = int(state["num_accepted_steps"])
+
+    # observation
+
+    def set_step_callback(self, step_callback: StepCallback | None) -> None:
+        """
+        have step_callback called after every accepted step, e.g., to record all the sub-steps
+        """
+        self._step_callback = step_callback
+
+    def _on_step_accepted(
+        self, time: float, locs: np.ndarray, vels: np.ndarray, dissipated_energy: np.ndarray
+    ) -> None:
+        self._num_accepted_steps += 1
+        if self._step_callback is not None:
+            self._step_callback(time, locs, vels, dissipated_energy)
+
+    # integration
+
+    def advance(
+        self,
+        t_1: float,
+        t_2: float,
+        t_step: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        """
+        advance locs and vels in place from t_1 to t_2 with steps no longer than t_step
+
+        :return: (..., # free bodies) energy dissipated by frictional forces
+        """
+        dissipated_energy: np.ndarray = np.zeros(locs.shape[:-1])
+
+        t_stamps: np.ndarray = np.hstack((np.arange(t_1, t_2, t_step), t_2))
+        for idx, t_stamp in enumerate(t_stamps[:-1]):
+            dissipated_energy += self.step(
+                t_stamp, t_stamps[idx + 1], locs, vels, masses, force_function
+            )
+            self._on_step_accepted(float(t_stamps[idx + 1]), locs, vels, dissipated_energy)
+
+        return dissipated_energy
+
+    @abstractmethod
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        """
+        advance locs and vels in place by one step from t_1 to t_2
+
+        :return: (..., # free bodies) energy dissipated by frictional forces during the step
+        """
+        pass
+
+    @staticmethod
+    def _dissipated_power(frictional_force: np.ndarray, vels: np.ndarray) -> np.ndarray:
+        return -(frictional_force * vels).sum(axis=-1)
@@ -0,0 +1,30 @@
+"""
+leapfrog (drift-kick-drift) integrator - symplectic and 2nd order for conservative forces
+with a single force evaluation per step
+"""
+
+import numpy as np
+
+from dynamics.integrators.integrator_base import ForceFunction, IntegratorBase
+
+
+class Leapfrog(IntegratorBase):
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        t_step: float = t_2 - t_1
+
+        locs += (0.5 * t_step) * vels
+        force, frictional_force = force_function((t_1 + t_2) / 2.0, locs, vels)
+
+        ori_vels: np.ndarray = vels.copy()
+        vels += t_step * force / masses[:, np.newaxis]
+        locs += (0.5 * t_step) * vels
+
+        return t_step * self._dissipated_power(frictional_force, (ori_vels + vels) / 2.0)
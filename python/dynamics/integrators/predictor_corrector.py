@@ -0,0 +1,33 @@
+"""
+the predictor-corrector scheme originally hard-coded in BodyBase.update
+"""
+
+import numpy as np
+
+from dynamics.integrators.integrator_base import ForceFunction, IntegratorBase
+
+
+class PredictorCorrector(IntegratorBase):
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        t_step: float = t_2 - t_1
+        inv_masses: np.ndarray = 1.0 / masses[:, np.newaxis]
+
+        force_1, frictional_force_1 = force_function((t_1 + t_2) / 2.0, locs, vels)
+        force_2, frictional_force_2 = force_function((t_1 + t_2) / 2.0, locs + t_step * vels, vels)
+
+        force: np.ndarray = (force_1 + force_2) / 2.0
+        frictional_force: np.ndarray = (frictional_force_1 + frictional_force_2) / 2.0
+
+        ori_vels: np.ndarray = vels.copy()
+        vels += t_step * force * inv_masses
+        locs += t_step * (ori_vels + vels) / 2.0
+
+        return t_step * self._dissipated_power(frictional_force, vels)
@@ -0,0 +1,50 @@
+"""
+classical 4th order Runge-Kutta integrator
+"""
+
+import numpy as np
+
+from dynamics.integrators.integrator_base import ForceFunction, IntegratorBase
+
+
+class RungeKutta4(IntegratorBase):
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        t_step: float = t_2 - t_1
+        t_mid: float = (t_1 + t_2) / 2.0
+        inv_masses: np.ndarray = 1.0 / masses[:, np.newaxis]
+
+        vels_1: np.ndarray = vels
+        force_1, frictional_force_1 = force_function(t_1, locs, vels_1)
+        accs_1: np.ndarray = force_1 * inv_masses
+
+        vels_2: np.ndarray = vels + (0.5 * t_step) * accs_1
+        force_2, frictional_force_2 = force_function(t_mid, locs + (0.5 * t_step) * vels_1, vels_2)
+        accs_2: np.ndarray = force_2 * inv_masses
+
+        vels_3: np.ndarray = vels + (0.5 * t_step) * accs_2
+        force_3, frictional_force_3 = force_function(t_mid, locs + (0.5 * t_step) * vels_2, vels_3)
+        accs_3: np.ndarray = force_3 * inv_masses
+
+        vels_4: np.ndarray = vels + t_step * accs_3
+        force_4, frictional_force_4 = force_function(t_2, locs + t_step * vels_3, vels_4)
+        accs_4: np.ndarray = force_4 * inv_masses
+
+        dissipated_energy: np.ndarray = (t_step / 6.0) * (
+            self._dissipated_power(frictional_force_1, vels_1)
+            + 2.0 * self._dissipated_power(frictional_force_2, vels_2)
+            + 2.0 * self._dissipated_power(frictional_force_3, vels_3)
+            + self._dissipated_power(frictional_force_4, vels_4)
+        )
+
+        locs += (t_step / 6.0) * (vels_1 + 2.0 * vels_2 + 2.0 * vels_3 + vels_4)
+        vels += (t_step / 6.0) * (accs_1 + 2.0 * accs_2 + 2.0 * accs_3 + accs_4)
+
+        return dissipated_energy
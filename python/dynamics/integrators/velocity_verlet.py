@@ -0,0 +1,34 @@
+"""
+velocity Verlet (kick-drift-kick) integrator - symplectic and 2nd order for conservative forces
+"""
+
+import numpy as np
+
+from dynamics.integrators.integrator_base import ForceFunction, IntegratorBase
+
+
+class VelocityVerlet(IntegratorBase):
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        t_step: float = t_2 - t_1
+        inv_masses: np.ndarray = 1.0 / masses[:, np.newaxis]
+
+        force_1, frictional_force_1 = force_function(t_1, locs, vels)
+        power_1: np.ndarray = self._dissipated_power(frictional_force_1, vels)
+
+        half_kick: np.ndarray = (0.5 * t_step) * force_1 * inv_masses
+        vels += half_kick
+        locs += t_step * vels
+
+        # velocity-dependent (frictional) forces see the predicted velocities at t_2
+        force_2, frictional_force_2 = force_function(t_2, locs, vels + half_kick)
+        vels += (0.5 * t_step) * force_2 * inv_masses
+
+        return (0.5 * t_step) * (power_1 + self._dissipated_power(frictional_force_2, vels))
@@ -0,0 +1,34 @@
+"""
+4th order Yoshida integrator, i.e., the symmetric composition of three velocity Verlet steps
+"""
+
+import numpy as np
+
+from dynamics.integrators.integrator_base import ForceFunction
+from dynamics.integrators.velocity_verlet import VelocityVerlet
+
+
+class Yoshida4(VelocityVerlet):
+    _W_1: float = 1.0 / (2.0 - 2.0 ** (1.0 / 3.0))
+    _W_0: float = -(2.0 ** (1.0 / 3.0)) / (2.0 - 2.0 ** (1.0 / 3.0))
+
+    def step(
+        self,
+        t_1: float,
+        t_2: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        masses: np.ndarray,
+        force_function: ForceFunction,
+    ) -> np.ndarray:
+        t_step: float = t_2 - t_1
+        dissipated_energy: np.ndarray = np.zeros(locs.shape[:-1])
+
+        t_stamp: float = t_1
+        for weight in (self._W_1, self._W_0, self._W_1):
+            dissipated_energy += super().step(
+                t_stamp, t_stamp + weight * t_step, locs, vels, masses, force_function
+            )
+            t_stamp += weight * t_step
+
+        return dissipated_energy
@@ -0,0 +1,183 @@
+"""
+limited-memory BFGS minimizer of smooth functions with analytic gradients, e.g.,
+the total potential energy of bodies as a function of their locations
+"""
+
+from collections import deque
+from logging import Logger, getLogger
+from typing import Callable
+
+import numpy as np
+from numpy.linalg import norm
+
+logger: Logger = getLogger()
+
+
+class LBFGS:
+    # # of the latest (step, gradient change) pairs approximating the inverse Hessian
+    NUM_CORRECTIONS: int = 10
+
+    # converged when the max gradient component gets below this times the initial one (or 1)
+    GRADIENT_RELATIVE_TOLERANCE: float = 1e-10
+
+    # or when iterations in a row decrease the value by less than this relative to the value
+    # (or 1), i.e., only by rounding errors
+    ENERGY_RELATIVE_TOLERANCE: float = 1e-15
+    NUM_STALLED_ITERATIONS: int = 3
+
+    MAX_NUM_ITERATIONS: int = 10000
+
+    # the function is regarded as unbounded below when the iterate has moved farther than this
+    # times the initial scale (or 1)
+    MAX_RELATIVE_DISPLACEMENT: float = 1e8
+
+    _ARMIJO_COEFFICIENT: float = 1e-4
+    _MAX_NUM_BACKTRACKS: int = 60
+
+    def __init__(self, energy_and_gradient: Callable[[np.ndarray], tuple[float, np.ndarray]]):
+        """
+        :param energy_and_gradient: function returning the value and the gradient at (n,) x_1d,
+        where a non-finite value or gradient marks points outside of the domain, e.g., those
+        collapsing bodies together, which the line search backtracks from
+        """
+        self._energy_and_gradient: Callable[[np.ndarray], tuple[float, np.ndarray]] = (
+            energy_and_gradient
+        )
+
+    def minimize(self, x_1d: np.ndarray) -> np.ndarray:
+        """
+        minimize the function starting from x_1d by backtracking (Armijo) line search
+        along the two-loop recursion directions
+
+        the last evaluation of the function is always at the returned point
+
+        :raise ValueError: if the function is not finite at x_1d
+        :raise RuntimeError: if the function turns out to be unbounded below
+        """
+        x_1d = np.array(x_1d, float)
+        energy, gradient = self._energy_and_gradient(x_1d)
+        if not self._is_finite(energy, gradient):
+            raise ValueError(f"the function is not finite at the initial point ({energy})")
+        tolerance: float = self.GRADIENT_RELATIVE_TOLERANCE * max(1.0, norm(gradient, np.inf))
+
+        initial_x_1d: np.ndarray = x_1d.copy()
+        max_displacement: float = self.MAX_RELATIVE_DISPLACEMENT * max(
+            1.0, norm(initial_x_1d, np.inf)
+        )
+
+        steps: deque[np.ndarray] = deque(maxlen=self.NUM_CORRECTIONS)
+        gradient_changes: deque[np.ndarray] = deque(maxlen=self.NUM_CORRECTIONS)
+
+        num_stalled_iterations: int = 0
+        # of the first step without any curvature pairs, which doubles while the function is
+        # linear along the steps, so that moving off to infinity is detected
+        first_step_scale: float = 1.0
+
+        for num_iterations in range(self.MAX_NUM_ITERATIONS):
+            if norm(gradient, np.inf) <= tolerance:
+                logger.debug(f"L-BFGS converged after {num_iterations} iterations")
+                return x_1d
+
+            direction: np.ndarray = -self._inverse_hessian_dot(gradient, steps, gradient_changes)
+            slope: float = float(gradient @ direction)
+            if slope >= 0.0:
+                # lost the descent direction, e.g., by rounding errors
+                steps.clear()
+                gradient_changes.clear()
+                direction = -gradient
+                slope = -float(gradient @ gradient)
+
+            # the first step is scaled as not to move any coordinate by more than 1
+            step_length: float = (
+                1.0 if steps else first_step_scale * min(1.0, 1.0 / norm(direction, np.inf))
+            )
+            initial_step_length: float = step_length
+
+            for _ in range(self._MAX_NUM_BACKTRACKS):
+                next_x_1d: np.ndarray = x_1d + step_length * direction
+                next_energy, next_gradient = self._energy_and_gradient(next_x_1d)
+                if (
+                    self._is_finite(next_energy, next_gradient)
+                    and next_energy <= energy + self._ARMIJO_COEFFICIENT * step_length * slope
+                ):
+                    break
+                step_length *= 0.5
+            else:
+                logger.warning(
+                    f"L-BFGS line search failed after {num_iterations} iterations"
+                    + f" (max gradient: {norm(gradient, np.inf):.3e})"
+                )
+                self._energy_and_gradient(x_1d)
+                return x_1d
+
+            step: np.ndarray = next_x_1d - x_1d
+            gradient_change: np.ndarray = next_gradient - gradient
+            if step @ gradient_change > 1e-12 * norm(step) * norm(gradient_change):
+                steps.append(step)
+                gradient_changes.append(gradient_change)
+                first_step_scale = 1.0
+            elif not steps and step_length == initial_step_length:
+                first_step_scale *= 2.0
+
+            decrease: float = energy - next_energy
+            x_1d, energy, gradient = next_x_1d, next_energy, next_gradient
+
+            if norm(x_1d - initial_x_1d, np.inf) > max_displacement:
+                raise RuntimeError(
+                    f"the function is unbounded below, i.e., decreased to {energy:.3e}"
+                    + f" after moving by more than {max_displacement:.3e}"
+                    + f" in {num_iterations + 1} iterations"
+                )
+
+            num_stalled_iterations = (
+                num_stalled_iterations + 1
+                if decrease <= self.ENERGY_RELATIVE_TOLERANCE * max(1.0, abs(energy))
+                else 0
+            )
+            if num_stalled_iterations == self.NUM_STALLED_ITERATIONS:
+                logger.debug(f"L-BFGS stalled after {num_iterations + 1} iterations")
+                return x_1d
+
+        logger.warning(
+            f"L-BFGS did not converge after {self.MAX_NUM_ITERATIONS} iterations"
+            + f" (max gradient: {norm(gradient, np.inf):.3e})"
+        )
+        return x_1d
+
+    @staticmethod
+    def _is_finite(energy: float, gradient: np.ndarray) -> bool:
+        return bool(np.isfinite(energy) and np.all(np.isfinite(gradient)))
+
+    @staticmethod
+    def _inverse_hessian_dot(
+        vec: np.ndarray, steps: deque[np.ndarray], gradient_changes: deque[np.ndarray]
+    ) -> np.ndarray:
+        """
+        two-loop recursion, i.e., the product of the approximate inverse Hessian and vec
+        """
+        vec = vec.copy()
+        rhos: list[float] = [
+            1.0 / float(step @ gradient_change)
+            for step, gradient_change in zip(steps, gradient_changes)
+        ]
+
+        alphas: list[float] = list()
+        for step, gradient_change, rho in zip(
+            reversed(steps), reversed(gradient_changes), reversed(rhos)
+        ):
+            alpha: float = rho * float(step @ vec)
+            vec -= alpha * gradient_change
+            alphas.append(alpha)
+
+        if steps:
+            vec *= float(steps[-1] @ gradient_changes[-1]) / float(
+                gradient_changes[-1] @ gradient_changes[-1]
+            )
+
+        for step, gradient_change, rho, alpha in zip(
+            steps, gradient_changes, rhos, reversed(alphas)
+        ):
+            beta: float = rho * float(gradient_change @ vec)
+            vec += (alpha - beta) * step
+
+        return vec
@@ -0,0 +1,134 @@
+"""
+Verlet neighbor list built by uniform cell list
+"""
+
+from itertools import product
+
+import numpy as np
+from numpy.linalg import norm
+
+from dynamics.array_ops import ranks_within
+
+
+class NeighborList:
+    """
+    list of the pairs of bodies apart by less than cutoff + skin, which contains every pair
+    apart by less than cutoff as long as no body moves by skin / 2 or more since it is built,
+    so that it is rebuilt only when some body does so
+    """
+
+    def __init__(self, cutoff: float | int, skin: float | int) -> None:
+        assert cutoff > 0.0, cutoff
+        assert skin >= 0.0, skin
+
+        self._cutoff: float = float(cutoff)
+        self._skin: float = float(skin)
+
+        self._built_locs: np.ndarray | None = None
+        self._pairs: tuple[np.ndarray, np.ndarray] = np.zeros(0, int), np.zeros(0, int)
+        self._num_builds: int = 0
+
+    # getters
+
+    @property
+    def cutoff(self) -> float:
+        return self._cutoff
+
+    @property
+    def skin(self) -> float:
+        return self._skin
+
+    @property
+    def num_builds(self) -> int:
+        return self._num_builds
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """
+        the list and the locations it is built for, on which the summation order depends
+        """
+        if self._built_locs is None:
+            return dict(num_builds=np.array(self._num_builds))
+
+        return dict(
+            built_locs=self._built_locs,
+            first_indices=self._pairs[0],
+            second_indices=self._pairs[1],
+            num_builds=np.array(self._num_builds),
+        )
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        self._num_builds = int(state["num_builds"])
+        if "built_locs" in state:
+            self._built_locs = state["built_locs"].copy()
+            self._pairs = state["first_indices"].copy(), state["second_indices"].copy()
+        else:
+            self._built_locs = None
+            self._pairs = np.zeros(0, int), np.zeros(0, int)
+
+    # neighbor search
+
+    def pairs(self, locs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :param locs: (# bodies, dim) locations
+        :return: first and second indices of the pairs (i < j) of the list
+        """
+        if (
+            self._built_locs is None
+            or self._built_locs.shape != locs.shape
+            or (
+                locs.shape[0] > 0
+                and norm(locs - self._built_locs, axis=-1).max() >= 0.5 * self._skin
+            )
+        ):
+            self._pairs = self._build(locs)
+            self._built_locs = locs.copy()
+            self._num_builds += 1
+
+        return self._pairs
+
+    def _build(self, locs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        num_bodies, dim = locs.shape
+        radius: float = self._cutoff + self._skin
+
+        # cells of size radius, so that the neighbors are in the same or the adjacent cells
+        lower: np.ndarray = locs.min(axis=0) if num_bodies > 0 else np.zeros(dim)
+        cell_indices: np.ndarray = np.floor((locs - lower) / radius).astype(np.int64)
+        num_cells: np.ndarray = (
+            cell_indices.max(axis=0) + 1 if num_bodies > 0 else np.ones(dim, np.int64)
+        )
+        strides: np.ndarray = np.cumprod(np.r_[1, num_cells[:-1]])
+
+        keys: np.ndarray = cell_indices @ strides
+        order: np.ndarray = np.argsort(keys, kind="stable")
+        sorted_keys: np.ndarray = keys[order]
+
+        first_indices: list[np.ndarray] = list()
+        second_indices: list[np.ndarray] = list()
+
+        for offset in product((-1, 0, 1), repeat=dim):
+            neighbor_cell_indices: np.ndarray = cell_indices + np.array(offset, np.int64)
+            is_valid: np.ndarray = np.all(
+                (neighbor_cell_indices >= 0) & (neighbor_cell_indices < num_cells), axis=-1
+            )
+            bodies: np.ndarray = np.flatnonzero(is_valid)
+            neighbor_keys: np.ndarray = neighbor_cell_indices[is_valid] @ strides
+
+            starts: np.ndarray = np.searchsorted(sorted_keys, neighbor_keys, "left")
+            counts: np.ndarray = np.searchsorted(sorted_keys, neighbor_keys, "right") - starts
+
+            _first_indices: np.ndarray = np.repeat(bodies, counts)
+            _second_indices: np.ndarray = order[np.repeat(starts, counts) + ranks_within(counts)]
+
+            is_pair: np.ndarray = _first_indices < _second_indices
+            _first_indices = _first_indices[is_pair]
+            _second_indices = _second_indices[is_pair]
+
+            is_near: np.ndarray = (
+                norm(locs[_second_indices] - locs[_first_indices], axis=-1) < radius
+            )
+            first_indices.append(_first_indices[is_near])
+            second_indices.append(_second_indices[is_near])
+
+        return np.concatenate(first_indices), np.concatenate(second_indices)
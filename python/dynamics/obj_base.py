@@ -5,12 +5,25 @@ base class for all objects, i.e., bodies and accessories
 from abc import ABC, abstractmethod
 from typing import Sequence
 
+import numpy as np
 from matplotlib.axes import Axes
 from matplotlib.artist import Artist
 
 
 class ObjBase(ABC):
 
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """
+        state evolving with the simulation other than that in the state store of Bodies,
+        e.g., the last location for drawing, which is saved to checkpoints
+        """
+        return dict()
+
+    def restore_checkpoint_state(self, state: dict[str, np.ndarray]) -> None:
+        pass
+
     # visualization
 
     @abstractmethod
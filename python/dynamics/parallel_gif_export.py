@@ -0,0 +1,178 @@
+"""
+offline .gif export, which simulates all the frames first, and then rasterizes them
+in a process pool, each process of which renders ranges of frames with its own figure
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from logging import Logger, getLogger
+from multiprocessing import get_context
+
+import numpy as np
+from matplotlib import pyplot as plt
+from PIL import Image
+
+from dynamics.simulation import Simulation
+from dynamics.simulation_figure import SimulationFigure
+from dynamics.streaming_gif_writer import StreamingGifWriter
+from dynamics.utils import energies_and_momentum
+
+logger: Logger = getLogger()
+
+# # of frame ranges per process, i.e., those a process renders one after another,
+# so that processes finishing early take over the rest
+NUM_SHARDS_PER_PROCESS: int = 4
+# so that the rendered images waiting to be written are bounded
+MAX_NUM_FRAMES_PER_SHARD: int = 16
+
+# figure of the scenario each process of the pool renders with
+_figure: SimulationFigure | None = None
+
+
+def _init_process(input_file: str, resume: str | None) -> None:
+    global _figure
+
+    plt.switch_backend("Agg")
+
+    simulation: Simulation = Simulation.from_file(input_file)
+    if resume is not None:
+        simulation.resume(resume)
+    _figure = SimulationFigure(simulation)
+
+
+def rasterized(figure: SimulationFigure) -> Image.Image:
+    """
+    the figure as an image as StreamingGifWriter grabs a frame
+    """
+    width, height = figure.fig.get_size_inches()
+    dpi: float = figure.fig.dpi
+
+    buffer: BytesIO = BytesIO()
+    figure.fig.savefig(buffer, format="rgba", dpi=dpi)
+    image: Image.Image = Image.frombuffer(
+        "RGBA", (int(width * dpi), int(height * dpi)), buffer.getbuffer(), "raw", "RGBA", 0, 1
+    )
+    return image.convert("RGB")
+
+
+def _render_frames(
+    frames: list[int], samples: dict[str, np.ndarray], energy_bar_y_lim: list[float]
+) -> list[Image.Image]:
+    """
+    :param samples: the state of the frames as sampled by Simulation.run
+    :param energy_bar_y_lim: those after the frames before the first one
+    """
+    assert _figure is not None, "the process has not been initialized"
+    simulation: Simulation = _figure.simulation
+    real_world_time_interval: float = float(
+        simulation.simulation_setting["real_world_time_interval"]
+    )
+
+    _figure.set_energy_bar_y_lim(energy_bar_y_lim)
+    # as FuncAnimation does before the first frame, so that the info values are updated
+    # at the first one, which is either the first of all or one of their update frames
+    _figure.init()
+
+    images: list[Image.Image] = list()
+    for idx, frame in enumerate(frames):
+        simulation.bodies.set_state(
+            samples["times"][idx],
+            samples["locs"][idx],
+            samples["vels"][idx],
+            samples["dissipated_energies"][idx],
+        )
+        simulation.accessories.advance(frame * real_world_time_interval)
+        _figure.draw(frame, (samples["energies"][idx], samples["momenta"][idx]))
+        images.append(rasterized(_figure))
+
+    return images
+
+
+def save_to_gif_in_parallel(
+    simulation: Simulation,
+    input_file: str,
+    frames: range,
+    gif_filepath: str,
+    resume: str | None = None,
+    num_processes: int | None = None,
+) -> None:
+    """
+    save frames of the simulation, which has been built from input_file (and resumed),
+    to gif_filepath, which is identical to what FuncAnimation saves with StreamingGifWriter
+
+    :param num_processes: # of processes rendering frames, # of CPUs by default
+    """
+    if num_processes is None:
+        num_processes = os.cpu_count() or 1
+    assert num_processes > 0, num_processes
+    assert len(frames) > 0, frames
+
+    real_world_time_interval: float = float(
+        simulation.simulation_setting["real_world_time_interval"]
+    )
+    num_frames_per_sec: int = simulation.simulation_setting["num_frames_per_sec"]
+
+    # physics, i.e., the state of every frame
+    initial_energies, _ = energies_and_momentum(simulation.bodies, simulation.forces)
+    samples: dict[str, np.ndarray] = simulation.run(
+        frames[-1] * real_world_time_interval, sample_every=real_world_time_interval
+    )
+    assert samples["times"].size == len(frames), (samples["times"].size, len(frames))
+    logger.info(f"\t{len(frames)} frames simulated")
+
+    # y limits of the energy bar axis growing frame by frame, i.e., before each frame
+    energy_bar_y_lims: list[list[float]] = [
+        SimulationFigure.grown_energy_bar_y_lim(None, initial_energies)
+    ]
+    for energies in samples["energies"][:-1]:
+        energy_bar_y_lims.append(
+            SimulationFigure.grown_energy_bar_y_lim(energy_bar_y_lims[-1], energies)
+        )
+
+    # rasterization, where each shard starts at a frame the info values are updated at,
+    # i.e., consists of whole blocks of frames showing the same info values
+    info_update_every: int = simulation.simulation_setting["info_update_every"]
+    blocks: list[np.ndarray] = np.split(
+        np.arange(len(frames)),
+        [idx for idx in range(1, len(frames)) if frames[idx] % info_update_every == 0],
+    )
+    num_shards: int = max(
+        NUM_SHARDS_PER_PROCESS * num_processes, -(-len(frames) // MAX_NUM_FRAMES_PER_SHARD)
+    )
+    shards: list[np.ndarray] = [
+        np.concatenate([blocks[block_idx] for block_idx in block_indices])
+        for block_indices in np.array_split(np.arange(len(blocks)), min(len(blocks), num_shards))
+    ]
+
+    writer: StreamingGifWriter = StreamingGifWriter(fps=num_frames_per_sec)
+    writer.open(gif_filepath)
+    with ProcessPoolExecutor(
+        num_processes,
+        mp_context=get_context("spawn"),
+        initializer=_init_process,
+        initargs=(input_file, resume),
+    ) as executor:
+        # in order, with a bounded # of shards being rendered or waiting to be written
+        futures: deque[Future] = deque()
+        for shard in shards:
+            futures.append(
+                executor.submit(
+                    _render_frames,
+                    [frames[idx] for idx in shard],
+                    {name: array[shard] for name, array in samples.items()},
+                    energy_bar_y_lims[shard[0]],
+                )
+            )
+            if len(futures) == 2 * num_processes:
+                _write_images(writer, futures.popleft().result(), len(frames))
+        while futures:
+            _write_images(writer, futures.popleft().result(), len(frames))
+    writer.finish()
+
+
+def _write_images(writer: StreamingGifWriter, images: list[Image.Image], num_frames: int) -> None:
+    for image in images:
+        writer.append_image(image)
+    logger.debug(f"\t{writer.num_frames} of {num_frames} frames written")
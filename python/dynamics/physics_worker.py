@@ -0,0 +1,297 @@
+"""
+physics worker process advancing the simulation frame by frame ahead of the renderer,
+which reads the frames from a ring buffer in shared memory
+"""
+
+import atexit
+import logging
+from logging import Logger, getLogger
+from math import prod
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event, Semaphore
+from types import TracebackType
+
+import numpy as np
+
+from dynamics.simulation import Simulation
+from dynamics.trajectory_recorder import TrajectoryRecorder
+from dynamics.utils import energies_and_momentum
+
+logger: Logger = getLogger()
+
+# sec. between checks whether the other side has stopped while waiting for a slot
+_POLL_INTERVAL: float = 0.1
+
+
+def _slot_arrays(
+    buffer: memoryview, num_slots: int, field_shapes: dict[str, tuple[int, ...]]
+) -> dict[str, np.ndarray]:
+    """
+    (# slots, ...) arrays of the fields laid out one after another in buffer,
+    i.e., views without copying
+    """
+    arrays: dict[str, np.ndarray] = dict()
+    offset: int = 0
+    for name, shape in field_shapes.items():
+        dtype: type = np.int64 if name == "frames" else np.float64
+        arrays[name] = np.ndarray((num_slots,) + shape, dtype, buffer, offset)
+        offset += arrays[name].nbytes
+    return arrays
+
+
+def _num_bytes(num_slots: int, field_shapes: dict[str, tuple[int, ...]]) -> int:
+    # both int64 and float64
+    return 8 * num_slots * sum(prod(shape) for shape in field_shapes.values())
+
+
+def _write_frames(
+    simulation: Simulation,
+    buffer: memoryview,
+    num_slots: int,
+    field_shapes: dict[str, tuple[int, ...]],
+    frames: range,
+    real_world_time_interval: float,
+    free_slots: Semaphore,
+    full_slots: Semaphore,
+    stop_event: Event,
+) -> None:
+    slots: dict[str, np.ndarray] = _slot_arrays(buffer, num_slots, field_shapes)
+
+    for idx, frame in enumerate(frames):
+        # as animation does without the worker
+        simulation.advance(frame * real_world_time_interval)
+        energies, momentum = energies_and_momentum(simulation.bodies, simulation.forces)
+
+        # backpressure, i.e., wait until the renderer has read the frame num_slots before
+        while not free_slots.acquire(timeout=_POLL_INTERVAL):
+            if stop_event.is_set():
+                return
+        if stop_event.is_set():
+            return
+
+        slot: int = idx % num_slots
+        slots["frames"][slot] = frame
+        slots["times"][slot] = simulation.time
+        slots["locs"][slot] = simulation.bodies.locs
+        slots["vels"][slot] = simulation.bodies.vels
+        slots["dissipated_energies"][slot] = simulation.bodies.dissipated_energies
+        slots["energies"][slot] = energies
+        slots["momenta"][slot] = momentum
+        full_slots.release()
+
+
+def _run(
+    input_file: str,
+    shared_memory_name: str,
+    num_slots: int,
+    field_shapes: dict[str, tuple[int, ...]],
+    frames: range,
+    real_world_time_interval: float,
+    free_slots: Semaphore,
+    full_slots: Semaphore,
+    stop_event: Event,
+    resume: str | None,
+    checkpoint: str | None,
+    checkpoint_every: float,
+    record: str | None,
+    log_level: int,
+) -> None:
+    """
+    main function of the worker process, which builds its own simulation from input_file
+    """
+    logging.basicConfig(
+        level=log_level, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    simulation: Simulation = Simulation.from_file(input_file)
+    if resume is not None:
+        simulation.resume(resume)
+    if checkpoint is not None:
+        simulation.set_checkpoint(checkpoint, checkpoint_every)
+
+    recorder: TrajectoryRecorder | None = None
+    if record is not None:
+        recorder = TrajectoryRecorder(
+            record, len(simulation.bodies.bodies), simulation.bodies.locs.shape[1]
+        )
+        simulation.attach_recorder(recorder, every_sub_step=True)
+
+    shared_memory: SharedMemory = SharedMemory(name=shared_memory_name)
+    try:
+        _write_frames(
+            simulation,
+            shared_memory.buf,
+            num_slots,
+            field_shapes,
+            frames,
+            real_world_time_interval,
+            free_slots,
+            full_slots,
+            stop_event,
+        )
+    finally:
+        shared_memory.close()
+        if recorder is not None:
+            recorder.close()
+
+    logger.info(
+        f"physics worker STOPPED at {simulation.time} sec."
+        + f" - # accepted steps: {simulation.bodies.integrator.num_accepted_steps}"
+        + f", # rejected steps: {simulation.bodies.integrator.num_rejected_steps}"
+    )
+
+
+class PhysicsWorker:
+    """
+    the worker process writes the state of every frame into the next slot of a ring of num_slots
+    slots in shared memory, and waits while none of them has been read yet,
+    i.e., stays at most num_slots frames ahead of the renderer, which reads the slot in place
+
+    the simulation is rebuilt from the input file in the worker, so checkpoints and recording
+    are done there as well
+    """
+
+    def __init__(
+        self,
+        input_file: str,
+        num_bodies: int,
+        dim: int,
+        frames: range,
+        real_world_time_interval: float,
+        num_slots: int = 8,
+        resume: str | None = None,
+        checkpoint: str | None = None,
+        checkpoint_every: float = np.inf,
+        record: str | None = None,
+    ) -> None:
+        """
+        :param frames: frames to advance the simulation to, one after another
+        :param num_slots: # of slots, i.e., max # of frames the worker can be ahead
+        """
+        assert num_slots > 0, num_slots
+
+        self._num_slots: int = num_slots
+        self._num_frames: int = len(frames)
+        self._num_read_frames: int = 0
+        self._is_reading: bool = False
+
+        field_shapes: dict[str, tuple[int, ...]] = dict(
+            frames=(),
+            times=(),
+            locs=(num_bodies, dim),
+            vels=(num_bodies, dim),
+            dissipated_energies=(num_bodies,),
+            energies=(4,),
+            momenta=(dim,),
+        )
+        self._shared_memory: SharedMemory = SharedMemory(
+            create=True, size=_num_bytes(num_slots, field_shapes)
+        )
+        self._slots: dict[str, np.ndarray] | None = _slot_arrays(
+            self._shared_memory.buf, num_slots, field_shapes
+        )
+
+        # spawn, since forking a process which has a GUI may not be safe
+        context = get_context("spawn")
+        self._free_slots: Semaphore = context.Semaphore(num_slots)
+        self._full_slots: Semaphore = context.Semaphore(0)
+        self._stop_event: Event = context.Event()
+        self._process = context.Process(
+            target=_run,
+            args=(
+                input_file,
+                self._shared_memory.name,
+                num_slots,
+                field_shapes,
+                frames,
+                real_world_time_interval,
+                self._free_slots,
+                self._full_slots,
+                self._stop_event,
+                resume,
+                checkpoint,
+                checkpoint_every,
+                record,
+                getLogger().getEffectiveLevel(),
+            ),
+            daemon=True,
+        )
+        self._process.start()
+
+        self._is_closed: bool = False
+
+        # so that the shared memory is freed even if rendering fails
+        atexit.register(self.close)
+
+    # reading
+
+    def read(self, block: bool = True) -> dict[str, np.ndarray] | None:
+        """
+        the next frame, i.e., frames, times, locs, vels, dissipated_energies, energies,
+        and momenta of its slot, which are views into the shared memory valid until release
+
+        :param block: wait for the worker, e.g., when saving every frame,
+        instead of returning None if the next frame is not ready yet
+        :return: None if all the frames have been read, or the next frame is not ready
+        """
+        assert not self._is_closed
+        assert not self._is_reading, "the previous frame has not been released"
+        if self._num_read_frames == self._num_frames:
+            return None
+
+        while not self._full_slots.acquire(timeout=_POLL_INTERVAL if block else 0.0):
+            if not self._process.is_alive():
+                # the worker may have written the frame just before exiting
+                if self._full_slots.acquire(block=False):
+                    break
+                raise RuntimeError(
+                    f"physics worker exited with {self._process.exitcode}"
+                    + f" after {self._num_read_frames} of {self._num_frames} frames"
+                )
+            if not block:
+                return None
+
+        assert self._slots is not None
+        self._is_reading = True
+        slot: int = self._num_read_frames % self._num_slots
+        return {name: array[slot] for name, array in self._slots.items()}
+
+    def release(self) -> None:
+        """
+        hand the slot of the frame read last back to the worker
+        """
+        assert self._is_reading
+        self._is_reading = False
+        self._num_read_frames += 1
+        self._free_slots.release()
+
+    # termination
+
+    def close(self) -> None:
+        """
+        stop the worker, even if it has not written all the frames, and free the shared memory
+        """
+        if self._is_closed:
+            return
+
+        self._stop_event.set()
+        self._process.join()
+
+        # views into the shared memory have to be gone before closing it
+        self._slots = None
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+        self._is_closed = True
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "PhysicsWorker":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
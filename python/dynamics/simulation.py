@@ -0,0 +1,284 @@
+"""
+headless simulation engine stepping bodies, forces, and accessories without any figure
+"""
+
+from logging import Logger, getLogger
+from typing import Any
+
+import numpy as np
+import yaml
+
+from dynamics.accessories.accessories import Accessories
+from dynamics.bodies.bodies import Bodies
+from dynamics.checkpoint import load_checkpoint, prefixed, save_checkpoint, unprefixed
+from dynamics.factorization_cache import FactorizationCache
+from dynamics.forces.forces import Forces
+from dynamics.trajectory_recorder import TrajectoryRecorder
+from dynamics.utils import energies_and_momentum, load_dynamic_system_simulation_setting
+
+logger: Logger = getLogger()
+
+
+class Simulation:
+    def __init__(
+        self,
+        simulation_setting: dict[str, Any],
+        bodies: Bodies,
+        forces: Forces,
+        accessories: Accessories,
+        factorization_cache: FactorizationCache | None = None,
+    ) -> None:
+        """
+        :param factorization_cache: cache of the factorization of the min energy system
+        shared with other simulations, e.g., with the other variants of a parameter sweep
+        """
+        self._simulation_setting: dict[str, Any] = simulation_setting
+        self._bodies: Bodies = bodies
+        self._forces: Forces = forces
+        self._accessories: Accessories = accessories
+
+        Bodies.set_time_step_lengths(
+            simulation_setting.get("sim_time_step", Bodies.SIM_TIME_STEP),
+            simulation_setting.get("sim_time_step_const_vel", Bodies.SIM_TIME_STEP_CONST_VEL),
+        )
+
+        # true or approx for the linearized system, and exact for the true potential energy
+        minimize_energy: bool | str = simulation_setting.get("minimize_energy", False)
+        assert minimize_energy in (False, True, "approx", "exact"), minimize_energy
+
+        if minimize_energy in (True, "approx"):
+            logger.info(
+                "set body locations as to (approximately) minimize the total potential energy"
+            )
+            self._forces.approx_min_energy(self._bodies, factorization_cache)
+
+        self._forces.register_forces(self._bodies)
+
+        if minimize_energy == "exact":
+            logger.info("set body locations as to minimize the total potential energy")
+            self._forces.min_energy(self._bodies, factorization_cache)
+
+        self._recorder: TrajectoryRecorder | None = None
+        self._records_sub_steps: bool = False
+
+        self._checkpoint_filepath: str | None = None
+        self._checkpoint_every: float = np.inf
+        self._next_checkpoint_time: float = np.inf
+
+    @classmethod
+    def from_data(
+        cls, data: dict[str, Any], factorization_cache: FactorizationCache | None = None
+    ) -> "Simulation":
+        return cls(*load_dynamic_system_simulation_setting(data), factorization_cache)
+
+    @classmethod
+    def from_file(cls, input_file: str) -> "Simulation":
+        with open(input_file, "r") as fid:
+            data = yaml.safe_load(fid)
+
+        return cls.from_data(data)
+
+    # getters
+
+    @property
+    def simulation_setting(self) -> dict[str, Any]:
+        return self._simulation_setting
+
+    @property
+    def bodies(self) -> Bodies:
+        return self._bodies
+
+    @property
+    def forces(self) -> Forces:
+        return self._forces
+
+    @property
+    def accessories(self) -> Accessories:
+        return self._accessories
+
+    @property
+    def time(self) -> float:
+        return self._bodies.cur_time
+
+    # simulation
+
+    def advance(self, time: float) -> None:
+        """
+        advance physics to time without updating any visualization objects
+        """
+        prev_time: float = self.time
+        self._bodies.advance(time, self._forces)
+        self._accessories.advance(time)
+
+        if self._recorder is not None and not self._records_sub_steps and time > prev_time:
+            self._record()
+
+        if self._checkpoint_filepath is not None and self.time >= self._next_checkpoint_time:
+            self.save_checkpoint(self._checkpoint_filepath)
+            while self._next_checkpoint_time <= self.time:
+                self._next_checkpoint_time += self._checkpoint_every
+
+    # checkpoint
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        state: dict[str, np.ndarray] = prefixed("bodies/", self._bodies.checkpoint_state())
+        state.update(prefixed("forces/", self._forces.checkpoint_state()))
+        state.update(prefixed("accessories/", self._accessories.checkpoint_state()))
+        return state
+
+    def save_checkpoint(self, filepath: str) -> None:
+        save_checkpoint(filepath, self.checkpoint_state())
+        logger.debug(f"checkpoint at {self.time} sec. saved to {filepath}")
+
+    def resume(self, filepath: str) -> None:
+        """
+        restore the state saved by save_checkpoint for the same scenario, from which advancing
+        is bit-identical to advancing without interruption
+        """
+        state: dict[str, np.ndarray] = load_checkpoint(filepath)
+
+        self._bodies.restore_checkpoint_state(unprefixed("bodies/", state))
+        self._forces.restore_checkpoint_state(unprefixed("forces/", state))
+        self._accessories.restore_checkpoint_state(unprefixed("accessories/", state))
+        self._forces.update_objs()
+
+        if self._checkpoint_filepath is not None:
+            self._next_checkpoint_time = self.time + self._checkpoint_every
+
+        logger.info(f"resumed at {self.time} sec. from {filepath}")
+
+    def set_checkpoint(self, filepath: str, every: float) -> None:
+        """
+        save checkpoints to filepath every every seconds (in simulation time) while advancing
+        """
+        assert every > 0.0, every
+        self._checkpoint_filepath = filepath
+        self._checkpoint_every = every
+        self._next_checkpoint_time = self.time + every
+
+    # recording
+
+    def attach_recorder(self, recorder: TrajectoryRecorder, every_sub_step: bool = False) -> None:
+        """
+        have recorder record the current state and the state after every advance, or after every
+        accepted step of the integrator if every_sub_step, i.e., also while bodies are updated
+        by animation
+        """
+        self._recorder = recorder
+        self._records_sub_steps = every_sub_step
+
+        if every_sub_step:
+            assert self._forces.supports_batched_force, "sub-steps need batched force kernels"
+            self._bodies.integrator.set_step_callback(self._record_sub_step)
+
+        self._record()
+
+    def detach_recorder(self) -> None:
+        self._bodies.integrator.set_step_callback(None)
+        self._recorder = None
+
+    def _record(self) -> None:
+        assert self._recorder is not None
+        energies, momentum = energies_and_momentum(self._bodies, self._forces)
+        self._recorder.record(
+            self.time,
+            self._bodies.locs,
+            self._bodies.vels,
+            self._bodies.dissipated_energies,
+            energies,
+            momentum,
+        )
+
+    def _record_sub_step(
+        self, time: float, locs: np.ndarray, vels: np.ndarray, dissipated_energy: np.ndarray
+    ) -> None:
+        """
+        record the free bodies in the middle of advance, which are not in the store yet
+        """
+        assert self._recorder is not None
+        masses: np.ndarray = self._bodies.masses
+
+        all_locs: np.ndarray = self._bodies.with_fixed_rows(locs)
+        all_vels: np.ndarray = self._bodies.with_fixed_rows(vels, True)
+        dissipated_energies: np.ndarray = self._bodies.dissipated_energies.copy()
+        dissipated_energies[: self._bodies.num_free_bodies] += dissipated_energy
+        non_spring_potential_energy, spring_potential_energy = (
+            self._forces.batched_potential_energy(all_locs, masses)
+        )
+
+        self._recorder.record(
+            time,
+            all_locs,
+            all_vels,
+            dissipated_energies,
+            np.array(
+                [
+                    0.5 * (masses * np.square(all_vels).sum(axis=-1)).sum(),
+                    non_spring_potential_energy,
+                    spring_potential_energy,
+                    dissipated_energies.sum(),
+                ],
+                float,
+            ),
+            (masses[:, np.newaxis] * all_vels).sum(axis=0),
+        )
+
+    def run(
+        self,
+        t_end: float,
+        sample_every: float | None = None,
+        output_filepath: str | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        run the simulation up to t_end, sampling the state every sample_every seconds
+        (real_world_time_interval by default)
+
+        :return: sample times, (# samples, # bodies, dim) locations and velocities
+        (whose rows follow the state store of Bodies, i.e., free bodies first),
+        (# samples, # bodies) dissipated energies, (# samples, 4) energies, i.e., kinetic,
+        body potential, spring potential, and dissipated energies, and (# samples, dim) momenta,
+        which are also saved to output_filepath (.npz) if given
+        """
+        if sample_every is None:
+            sample_every = float(self._simulation_setting["real_world_time_interval"])
+        assert sample_every > 0.0, sample_every
+
+        start_time: float = self.time
+        assert t_end >= start_time, (t_end, start_time)
+        num_samples: int = int(np.floor((t_end - start_time) / sample_every + 1e-9)) + 1
+
+        # on the grid from t = 0 if the start time is on it, e.g., after resuming from a checkpoint
+        first_idx: int = int(round(start_time / sample_every))
+        times: np.ndarray = (
+            sample_every * np.arange(first_idx, first_idx + num_samples)
+            if sample_every * first_idx == start_time
+            else start_time + sample_every * np.arange(num_samples)
+        )
+        locs: np.ndarray = np.zeros((num_samples,) + self._bodies.locs.shape)
+        vels: np.ndarray = np.zeros_like(locs)
+        dissipated_energies: np.ndarray = np.zeros((num_samples, self._bodies.locs.shape[0]))
+        energies: np.ndarray = np.zeros((num_samples, 4))
+        momenta: np.ndarray = np.zeros((num_samples, self._bodies.locs.shape[1]))
+
+        for idx, time in enumerate(times):
+            self.advance(time)
+
+            locs[idx] = self._bodies.locs
+            vels[idx] = self._bodies.vels
+            dissipated_energies[idx] = self._bodies.dissipated_energies
+            energies[idx], momenta[idx] = energies_and_momentum(self._bodies, self._forces)
+
+        samples: dict[str, np.ndarray] = dict(
+            times=times,
+            locs=locs,
+            vels=vels,
+            dissipated_energies=dissipated_energies,
+            energies=energies,
+            momenta=momenta,
+        )
+
+        if output_filepath is not None:
+            np.savez(output_filepath, **samples)
+            logger.info(f"{num_samples} samples saved to {output_filepath}")
+
+        return samples
@@ -0,0 +1,473 @@
+"""
+figure of the simulation animation, i.e., the animation axis and the energy bar axis
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon, Arrow
+from matplotlib.text import Text
+from matplotlib.transforms import offset_copy
+from freq_used.plotting import get_figure
+
+from dynamics.simulation import Simulation
+from dynamics.utils import (
+    ENERGY_AND_MOMENTUM_INFO_LABELS,
+    KINEMATICS_INFO_LABEL,
+    energies_and_momentum,
+    energy_and_momentum_info_values,
+    energy_bar_vertices,
+    remove_axes_boundary,
+    kinematics_info_values,
+)
+
+
+class SimulationFigure:
+    """
+    the figure is drawn from the current state of the simulation, which may have been advanced
+    elsewhere, e.g., by the physics worker or before rendering offline
+    """
+
+    ENERGY_BAR_VERTICAL_MARGIN: float = 0.1
+    ARROW_WIDTH_RATIO: float = 0.1
+    # height of each row of the info text above the animation axis
+    INFO_ROW_HEIGHT_POINTS: float = 14.0
+    # between the labels and the values of the info text
+    INFO_COLUMN_PADDING_POINTS: float = 4.0
+
+    def __init__(self, simulation: Simulation) -> None:
+        self._simulation: Simulation = simulation
+        simulation_setting: dict[str, Any] = simulation.simulation_setting
+        bodies = simulation.bodies
+        forces = simulation.forces
+        accessories = simulation.accessories
+
+        self._frame_interval: float = float(simulation_setting["frame_interval"])
+        self._real_world_time_interval: float = float(
+            simulation_setting["real_world_time_interval"]
+        )
+        self._num_frames: int = (
+            simulation_setting["num_frames_saved"]
+            if simulation_setting["save_to_gif"]
+            else simulation_setting["num_frames"]
+        )
+        self._info_update_every: int = simulation_setting["info_update_every"]
+        assert (
+            isinstance(self._info_update_every, int) and self._info_update_every > 0
+        ), self._info_update_every
+        # frame the info values have been updated at last, if any
+        self._info_frame: int | None = None
+
+        # Set up the figure and axis
+        xlim: list[float | int] = simulation_setting["xlim"]
+        ylim: list[float | int] = simulation_setting["ylim"]
+        x_range: float | int = xlim[1] - xlim[0]
+        y_range: float | int = ylim[1] - ylim[0]
+        window_width_inch: float | int = simulation_setting["window_width_inch"]
+
+        title_height_inch: float = 0.5
+        info_labels: list[str] = (
+            [r"$t$, frame ="]
+            + ENERGY_AND_MOMENTUM_INFO_LABELS
+            + (
+                [KINEMATICS_INFO_LABEL] * len(kinematics_info_values(bodies))
+                if simulation_setting["show_kinematics"]
+                else []
+            )
+        )
+        info_text_box_height_inch: float = self.INFO_ROW_HEIGHT_POINTS * len(info_labels) / 72
+        energy_bar_width: float = 1.0
+        energy_bar_padding: float | int = simulation_setting["energy_bar_padding"]
+        self._below_title_padding: float = (info_text_box_height_inch + 0.3) * 72
+
+        self._fig: Figure = get_figure(
+            1,
+            2,
+            axis_width=[window_width_inch, energy_bar_width],
+            axis_height=window_width_inch * float(y_range) / float(x_range),
+            left_margin=1.0,
+            right_margin=1.5,
+            bottom_margin=1.0,
+            top_margin=self._below_title_padding / 72 + title_height_inch,
+            horizontal_padding=energy_bar_padding,
+        )
+        self._animation_axis: Axes = self._fig.get_axes()[0]
+        self._energy_bar_axis: Axes = self._fig.get_axes()[1]
+        animation_axis: Axes = self._animation_axis
+        energy_bar_axis: Axes = self._energy_bar_axis
+
+        accessories.add_objs(animation_axis)
+        forces.add_objs(animation_axis)
+        bodies.add_objs(animation_axis)
+
+        animation_axis.set_xlim(*xlim)  # type: ignore
+        animation_axis.set_ylim(*ylim)
+        if isinstance(simulation_setting["grid"], str):
+            animation_axis.grid(axis=simulation_setting["grid"])  # type: ignore
+        else:
+            animation_axis.grid(simulation_setting["grid"])
+        animation_axis.set_aspect("equal")
+
+        if simulation_setting["1d"]:
+            animation_axis.axhline(y=0.0, color="black", linestyle="-", alpha=0.5)
+
+        # the labels are static, i.e., laid out once in the background, and right-aligned
+        # at the widest one, followed by the values as plain text, i.e., without mathtext
+        self._info_label_texts: list[Text] = [
+            animation_axis.text(
+                0.01, 1.01, label, transform=animation_axis.transAxes, ha="right", va="baseline"
+            )
+            for label in info_labels
+        ]
+        info_label_width_points: float = (
+            max(text.get_window_extent().width for text in self._info_label_texts)
+            * 72
+            / self._fig.dpi
+        )
+
+        self._info_value_texts: list[Text] = list()
+        for row, label_text in enumerate(self._info_label_texts):
+            # baselines from the top row, above the descent of the bottom one
+            y_points: float = self.INFO_ROW_HEIGHT_POINTS * (len(info_labels) - row - 0.75)
+            label_text.set_transform(
+                offset_copy(
+                    animation_axis.transAxes,
+                    fig=self._fig,
+                    x=info_label_width_points,
+                    y=y_points,
+                    units="points",
+                )
+            )
+            self._info_value_texts.append(
+                animation_axis.text(
+                    0.01,
+                    1.01,
+                    "",
+                    transform=offset_copy(
+                        animation_axis.transAxes,
+                        fig=self._fig,
+                        x=info_label_width_points + self.INFO_COLUMN_PADDING_POINTS,
+                        y=y_points,
+                        units="points",
+                    ),
+                    va="baseline",
+                    parse_math=False,
+                )
+            )
+
+        remove_axes_boundary(animation_axis)
+
+        initial_energies, _ = energies_and_momentum(bodies, forces)
+        self._initial_energies: np.ndarray = initial_energies
+
+        (
+            force_potential_energy_bar_vertices,
+            kinetic_energy_bar_vertices,
+            dissipated_energy_bar_vertices,
+        ) = energy_bar_vertices(initial_energies)
+
+        self._force_potential_energy_bar: Polygon = Polygon(
+            force_potential_energy_bar_vertices.T, color="#cc9933", alpha=0.5
+        )
+        self._kinetic_energy_bar: Polygon = Polygon(
+            kinetic_energy_bar_vertices.T, color="blue", alpha=0.5
+        )
+        self._dissipated_energy_bar: Polygon = Polygon(
+            dissipated_energy_bar_vertices.T, color="red", alpha=0.5
+        )
+
+        self._body_potential_energy_arrow = Arrow(
+            x=1.5,
+            y=initial_energies[1],  # Start point
+            dx=-0.4,
+            dy=0,  # Direction and length
+            color="black",
+            alpha=0.5,
+            width=self.ARROW_WIDTH_RATIO * np.diff(np.array(energy_bar_axis.get_ylim()))[0],
+        )
+
+        self._potential_energy_arrow = Arrow(
+            x=1.5,
+            y=initial_energies[1:3].sum(),  # Start point
+            dx=-0.4,
+            dy=0,  # Direction and length
+            color="#cc9933",
+            alpha=0.8,
+            width=self.ARROW_WIDTH_RATIO * np.diff(np.array(energy_bar_axis.get_ylim()))[0],
+        )
+
+        self._total_energy_arrow = Arrow(
+            x=1.5,
+            y=initial_energies[:3].sum(),  # Start point
+            dx=-0.4,
+            dy=0,  # Direction and length
+            color="blue",
+            alpha=0.8,
+            width=self.ARROW_WIDTH_RATIO * np.diff(np.array(energy_bar_axis.get_ylim()))[0],
+        )
+
+        energy_bar_axis.add_patch(self._force_potential_energy_bar)
+        energy_bar_axis.add_patch(self._kinetic_energy_bar)
+        energy_bar_axis.add_patch(self._dissipated_energy_bar)
+        energy_bar_axis.add_patch(self._body_potential_energy_arrow)
+        energy_bar_axis.add_patch(self._potential_energy_arrow)
+        energy_bar_axis.add_patch(self._total_energy_arrow)
+
+        self._body_potential_energy_text: Text = energy_bar_axis.text(
+            1.6, initial_energies[1], r"$E_\mathrm{p, gravity}$", ha="left", va="top"
+        )
+        self._potential_energy_text: Text = energy_bar_axis.text(
+            1.6,
+            initial_energies[1:3].sum(),
+            r"$E_\mathrm{p, gravity}+E_\mathrm{p,spring}$",
+            ha="left",
+            va="top",
+        )
+        self._total_energy_text: Text = energy_bar_axis.text(
+            1.6,
+            initial_energies[:3].sum(),
+            r"$E_\mathrm{total}$",
+            ha="left",
+            va="top",
+        )
+        self._force_potential_energy_text: Text = energy_bar_axis.text(
+            0.5,
+            force_potential_energy_bar_vertices[1].mean(),
+            r"$E_\mathrm{p,spring}$",
+            ha="center",
+            va="center",
+        )
+        self._kinetic_energy_text: Text = energy_bar_axis.text(
+            0.5,
+            kinetic_energy_bar_vertices[1].mean(),
+            r"$E_\mathrm{k}$",
+            ha="center",
+            va="center",
+        )
+        self._dissipated_energy_text: Text = energy_bar_axis.text(
+            0.5,
+            dissipated_energy_bar_vertices[1].mean(),
+            r"$E_\mathrm{d}$",
+            ha="center",
+            va="center",
+        )
+
+        self._energy_bar_y_lim: list[float] = self.grown_energy_bar_y_lim(None, initial_energies)
+
+        energy_bar_axis.set_xlim(0, 1.5)
+        energy_bar_axis.set_xticks([])
+        energy_bar_axis.set_ylim(*self._energy_bar_y_lim)
+
+        remove_axes_boundary(energy_bar_axis)
+
+        self._set_title()
+
+        # artists changing from frame to frame, i.e., all the others are in the static background,
+        # in the order they have been added, i.e., drawn in among equal zorders
+        self._animated_artists: list[Artist] = (
+            list(accessories.updated_objs)
+            + list(forces.updated_objs)
+            + list(bodies.updated_objs)
+            + self._info_value_texts
+            + [
+                self._force_potential_energy_bar,
+                self._kinetic_energy_bar,
+                self._dissipated_energy_bar,
+                self._body_potential_energy_arrow,
+                self._potential_energy_arrow,
+                self._total_energy_arrow,
+                self._body_potential_energy_text,
+                self._potential_energy_text,
+                self._total_energy_text,
+                self._force_potential_energy_text,
+                self._kinetic_energy_text,
+                self._dissipated_energy_text,
+            ]
+        )
+
+    # getters
+
+    @property
+    def simulation(self) -> Simulation:
+        return self._simulation
+
+    @property
+    def fig(self) -> Figure:
+        return self._fig
+
+    @property
+    def num_frames(self) -> int:
+        return self._num_frames
+
+    @property
+    def initial_total_energy(self) -> float:
+        return float(self._initial_energies.sum())
+
+    @property
+    def animated_artists(self) -> Sequence[Artist]:
+        return self._animated_artists
+
+    @property
+    def info_artists(self) -> Sequence[Artist]:
+        """
+        animated artists changing only every info_update_every frames, i.e., the info values
+        """
+        return self._info_value_texts
+
+    @property
+    def energy_bar_y_lim(self) -> list[float]:
+        return list(self._energy_bar_y_lim)
+
+    # energy bar
+
+    @classmethod
+    def grown_energy_bar_y_lim(
+        cls, energy_bar_y_lim: list[float] | None, energies: np.ndarray
+    ) -> list[float]:
+        """
+        y limits of the energy bar axis, which only grow so as to show all the energy levels
+        so far, e.g., those of the frames before the first one a process renders
+
+        :param energy_bar_y_lim: those so far, or None for the initial energies
+        """
+        energy_levels: np.ndarray = np.array(
+            [
+                energies[1],
+                energies[1:3].sum(),
+                energies[:3].sum(),
+                energies.sum(),
+            ]
+        )
+        margin: float = cls.ENERGY_BAR_VERTICAL_MARGIN
+        ylim_min: float = (1.0 + margin) * energy_levels.min() - margin * energy_levels.max()
+        ylim_max: float = (1.0 + margin) * energy_levels.max() - margin * energy_levels.min()
+
+        if energy_bar_y_lim is None:
+            return [ylim_min, ylim_max]
+        return [min(energy_bar_y_lim[0], ylim_min), max(energy_bar_y_lim[1], ylim_max)]
+
+    def set_energy_bar_y_lim(self, energy_bar_y_lim: list[float]) -> None:
+        self._energy_bar_y_lim = list(energy_bar_y_lim)
+        self._energy_bar_axis.set_ylim(*self._energy_bar_y_lim)
+
+    # drawing
+
+    def init(self) -> Sequence[Artist]:
+        """
+        Initialize animation
+        """
+        for text in self._info_value_texts:
+            text.set_text("")
+        self._info_frame = None
+        return self._animated_artists
+
+    def draw(
+        self,
+        frame: int,
+        energies_and_total_momentum: tuple[np.ndarray, np.ndarray] | None = None,
+    ) -> Sequence[Artist]:
+        """
+        update every object from the current state of the simulation at frame,
+        and the info values every info_update_every frames, or if they have not been since init
+
+        :return: the animated artists to be drawn over the static background
+
+        :param energies_and_total_momentum: those computed along with the state, if any
+        """
+        bodies = self._simulation.bodies
+        forces = self._simulation.forces
+
+        if energies_and_total_momentum is None:
+            energies_and_total_momentum = energies_and_momentum(bodies, forces)
+
+        bodies.update_objs()
+        self._simulation.accessories.update_objs()
+        forces.update_objs()
+
+        energies: np.ndarray = energies_and_total_momentum[0]
+        (
+            force_potential_energy_bar_vertices,
+            kinetic_energy_bar_vertices,
+            dissipated_energy_bar_vertices,
+        ) = energy_bar_vertices(energies)
+
+        energy_bar_y_lim: list[float] = self.grown_energy_bar_y_lim(
+            self._energy_bar_y_lim, energies
+        )
+        if energy_bar_y_lim != self._energy_bar_y_lim:
+            self.set_energy_bar_y_lim(energy_bar_y_lim)
+
+        self._force_potential_energy_bar.set_xy(force_potential_energy_bar_vertices.T)
+        self._kinetic_energy_bar.set_xy(kinetic_energy_bar_vertices.T)
+        self._dissipated_energy_bar.set_xy(dissipated_energy_bar_vertices.T)
+
+        arrow_width: float = (
+            self.ARROW_WIDTH_RATIO * np.diff(np.array(self._energy_bar_axis.get_ylim()))[0].item()
+        )
+
+        self._body_potential_energy_arrow.set_data(y=energies[1], width=arrow_width)
+        self._body_potential_energy_text.set_y(energies[1])
+
+        self._potential_energy_arrow.set_data(y=energies[1:3].sum(), width=arrow_width)
+        self._potential_energy_text.set_y(energies[1:3].sum())
+
+        self._total_energy_arrow.set_data(y=energies[:3].sum(), width=arrow_width)
+        self._total_energy_text.set_y(energies[:3].sum())
+
+        self._force_potential_energy_text.set_y(force_potential_energy_bar_vertices[1].mean())
+        self._kinetic_energy_text.set_y(kinetic_energy_bar_vertices[1].mean())
+        self._dissipated_energy_text.set_y(dissipated_energy_bar_vertices[1].mean())
+
+        if self._info_frame is None or frame % self._info_update_every == 0:
+            self._update_info_values(frame, *energies_and_total_momentum)
+
+        return self._animated_artists
+
+    def _update_info_values(
+        self, frame: int, energies: np.ndarray, total_momentum: np.ndarray
+    ) -> None:
+        t: float = frame * self._real_world_time_interval  # convert frame number to time in sec
+
+        values: list[str] = [f"{t:.2f} sec., {frame}"] + energy_and_momentum_info_values(
+            energies, total_momentum
+        )
+        if self._simulation.simulation_setting["show_kinematics"]:
+            values += kinematics_info_values(self._simulation.bodies)
+        assert len(values) == len(self._info_value_texts), (
+            len(values),
+            len(self._info_value_texts),
+        )
+
+        for text, value in zip(self._info_value_texts, values):
+            text.set_text(value)
+        self._info_frame = frame
+
+    def _set_title(self) -> None:
+        simulation_setting: dict[str, Any] = self._simulation.simulation_setting
+        real_world_time_interval: float = self._real_world_time_interval
+
+        if simulation_setting["save_to_gif"]:
+            num_frames_per_sec: int = simulation_setting["num_frames_per_sec"]
+            speed_and_fps: str = (
+                f"{num_frames_per_sec * real_world_time_interval:g}x"
+                + " & "
+                + f"{num_frames_per_sec:g} fps"
+            )
+        else:
+            speed_and_fps = (
+                f"{real_world_time_interval * 1000.0 / self._frame_interval:g}x"
+                + " & "
+                + f"{1./real_world_time_interval:g} fps"
+            )
+
+        self._animation_axis.set_title(
+            str(simulation_setting["name"])
+            + f" - {real_world_time_interval * self._num_frames:.1f} sec."
+            + ", (up to) "
+            + speed_and_fps
+            + f"\ninitial total energy: {self.initial_total_energy:.2f}",
+            pad=self._below_title_padding,
+        )
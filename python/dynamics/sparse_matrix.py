@@ -0,0 +1,212 @@
+"""
+sparse symmetric matrix assembled from (row, column, value) triplets, e.g., of the linear system
+solved for (approximate) min energy locations
+"""
+
+from logging import Logger, getLogger
+
+import numpy as np
+from numpy.linalg import LinAlgError, norm, solve
+
+from dynamics.array_ops import ranks_within
+
+logger: Logger = getLogger()
+
+
+class SparseMatrix:
+    # systems up to this size are solved densely (and exactly)
+    DENSE_SOLVE_MAX_SIZE: int = 2000
+
+    CG_RELATIVE_TOLERANCE: float = 1e-12
+
+    def __init__(self, size: int, rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> None:
+        """
+        duplicate entries are summed up as in COO format, and the entries are kept sorted
+        by (row, column) as in CSR format
+        """
+        assert rows.shape == cols.shape == values.shape, (rows.shape, cols.shape, values.shape)
+        self._size: int = size
+
+        keys, inverse = np.unique(
+            rows.astype(np.int64) * size + cols.astype(np.int64), return_inverse=True
+        )
+        self._rows: np.ndarray = keys // size
+        self._cols: np.ndarray = keys % size
+        self._values: np.ndarray = np.bincount(
+            inverse.ravel(), weights=values, minlength=keys.size
+        ).astype(float)
+
+        # CSR row pointers of the non-empty rows
+        self._nonempty_rows: np.ndarray = np.unique(self._rows)
+        self._row_starts: np.ndarray = np.searchsorted(self._rows, self._nonempty_rows)
+
+    # getters
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def nnz(self) -> int:
+        return self._values.size
+
+    @property
+    def diagonal(self) -> np.ndarray:
+        is_diagonal: np.ndarray = self._rows == self._cols
+        diagonal: np.ndarray = np.zeros(self._size)
+        diagonal[self._rows[is_diagonal]] = self._values[is_diagonal]
+        return diagonal
+
+    @property
+    def entries(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        row indices, column indices, and values of the (summed up) entries in CSR order
+        """
+        return self._rows, self._cols, self._values
+
+    # operations
+
+    def to_dense(self) -> np.ndarray:
+        a_2d: np.ndarray = np.zeros((self._size, self._size))
+        a_2d[self._rows, self._cols] = self._values
+        return a_2d
+
+    @property
+    def key(self) -> bytes:
+        """
+        the entries as bytes, which are the same for the same matrices, e.g., for FactorizationCache
+        """
+        return np.int64(self._size).tobytes() + b"".join(
+            array.tobytes() for array in (self._rows, self._cols, self._values)
+        )
+
+    def reverse_cuthill_mckee_order(self) -> np.ndarray:
+        """
+        order of the indices by reverse Cuthill-McKee, i.e., by breadth-first search level by level
+        from a pseudo-peripheral index of each connected component, which keeps the entries close
+        to the diagonal, e.g., within about the width of a lattice, as needed by BlockCholesky
+        """
+        is_off_diagonal: np.ndarray = self._rows != self._cols
+        rows: np.ndarray = self._rows[is_off_diagonal]
+        neighbors: np.ndarray = self._cols[is_off_diagonal]
+        degrees: np.ndarray = np.bincount(rows, minlength=self._size)
+        starts: np.ndarray = np.cumsum(degrees) - degrees
+
+        def levels(start: int, is_visited: np.ndarray) -> list[np.ndarray]:
+            """
+            breadth-first search visiting the neighbors of each level in the order of their
+            first visitors, and then of their degrees
+            """
+            is_visited[start] = True
+            _levels: list[np.ndarray] = [np.array([start])]
+            while True:
+                level: np.ndarray = _levels[-1]
+                counts: np.ndarray = degrees[level]
+                _neighbors: np.ndarray = neighbors[
+                    np.repeat(starts[level], counts) + ranks_within(counts)
+                ]
+                visitors: np.ndarray = np.repeat(np.arange(level.size), counts)
+
+                is_new: np.ndarray = ~is_visited[_neighbors]
+                _neighbors, visitors = _neighbors[is_new], visitors[is_new]
+                _neighbors = _neighbors[np.lexsort((degrees[_neighbors], visitors))]
+                _, firsts = np.unique(_neighbors, return_index=True)
+                if firsts.size == 0:
+                    return _levels
+
+                _levels.append(_neighbors[np.sort(firsts)])
+                is_visited[_levels[-1]] = True
+
+        is_ordered: np.ndarray = np.zeros(self._size, bool)
+        order: list[np.ndarray] = list()
+        while not np.all(is_ordered):
+            unordered: np.ndarray = np.flatnonzero(~is_ordered)
+            start: int = int(unordered[np.argmin(degrees[unordered])])
+            # the last level is farthest from start, so is (about) that of a peripheral index
+            last_level: np.ndarray = levels(start, is_ordered.copy())[-1]
+            start = int(last_level[np.argmin(degrees[last_level])])
+            order.extend(levels(start, is_ordered))
+
+        return np.concatenate(order)[::-1]
+
+    def dot(self, x_1d: np.ndarray) -> np.ndarray:
+        """
+        :param x_1d: (..., size) vectors
+        """
+        if x_1d.ndim == 1:
+            return np.bincount(
+                self._rows, weights=self._values * x_1d[self._cols], minlength=self._size
+            )
+
+        product: np.ndarray = np.zeros(x_1d.shape)
+        if self._nonempty_rows.size > 0:
+            product[..., self._nonempty_rows] = np.add.reduceat(
+                self._values * x_1d[..., self._cols], self._row_starts, axis=-1
+            )
+        return product
+
+    def solve(self, b_1d: np.ndarray) -> np.ndarray:
+        """
+        solve the system for (..., size) vectors, i.e., many right-hand sides at once,
+        by one dense LU decomposition if small enough, otherwise by Jacobi-preconditioned
+        conjugate gradient, i.e., for symmetric positive definite matrices such as stiffness
+        matrices of springs anchored to fixed bodies
+        """
+        if self._size <= self.DENSE_SOLVE_MAX_SIZE:
+            if b_1d.ndim == 1:
+                return solve(self.to_dense(), b_1d)
+            return solve(self.to_dense(), b_1d.reshape(-1, self._size).T).T.reshape(b_1d.shape)
+
+        return self.conjugate_gradient(b_1d)
+
+    def conjugate_gradient(
+        self,
+        b_1d: np.ndarray,
+        x_1d: np.ndarray | None = None,
+        max_num_iterations: int | None = None,
+    ) -> np.ndarray:
+        """
+        iterate for (..., size) vectors at once until all of them converge
+        """
+        diagonal: np.ndarray = self.diagonal
+        if not np.all(diagonal > 0.0):
+            raise LinAlgError("the matrix is not positive definite")
+        inverse_diagonal: np.ndarray = 1.0 / diagonal
+
+        if max_num_iterations is None:
+            max_num_iterations = 10 * self._size
+
+        def dot(vec_1: np.ndarray, vec_2: np.ndarray) -> np.ndarray:
+            return (vec_1 * vec_2).sum(axis=-1, keepdims=True)
+
+        def divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+            # the converged vectors, whose denominators vanish, stay where they are
+            return numerator / np.where(denominator != 0.0, denominator, 1.0)
+
+        x_1d = np.zeros(b_1d.shape) if x_1d is None else x_1d.copy()
+        residual: np.ndarray = b_1d - self.dot(x_1d)
+        preconditioned: np.ndarray = inverse_diagonal * residual
+        direction: np.ndarray = preconditioned.copy()
+        residual_dot: np.ndarray = dot(residual, preconditioned)
+        tolerance: np.ndarray = self.CG_RELATIVE_TOLERANCE * norm(b_1d, axis=-1, keepdims=True)
+
+        for num_iterations in range(max_num_iterations):
+            if np.all(norm(residual, axis=-1, keepdims=True) <= tolerance):
+                logger.debug(f"conjugate gradient converged after {num_iterations} iterations")
+                return x_1d
+
+            a_direction: np.ndarray = self.dot(direction)
+            step: np.ndarray = divide(residual_dot, dot(direction, a_direction))
+            x_1d += step * direction
+            residual -= step * a_direction
+
+            preconditioned = inverse_diagonal * residual
+            next_residual_dot: np.ndarray = dot(residual, preconditioned)
+            direction = preconditioned + divide(next_residual_dot, residual_dot) * direction
+            residual_dot = next_residual_dot
+
+        logger.warning(
+            f"conjugate gradient did not converge after {max_num_iterations} iterations"
+            + f" (max residual: {norm(residual, axis=-1).max():.3e})"
+        )
+        return x_1d
@@ -0,0 +1,180 @@
+"""
+animation writer streaming frames to .gif as they are grabbed
+"""
+
+import struct
+from io import BytesIO
+from typing import BinaryIO
+
+import numpy as np
+from matplotlib.animation import AbstractMovieWriter
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
+
+
+class StreamingGifWriter(AbstractMovieWriter):
+    """
+    unlike PillowWriter, which keeps every frame until finish, every frame is written as soon as
+    it is grabbed, so memory does not grow with the number of frames
+
+    every frame is quantized to one (global) palette, that of the first frame, i.e., every color
+    is mapped to its nearest one in the palette (cached in a lookup table), and only the
+    rectangle of the pixels changed from the previous frame is written on top of it,
+    i.e., with the disposal method of leaving the previous frame,
+    and the unchanged pixels in the rectangle are transparent, which compress well
+    """
+
+    NUM_COLORS: int = 255
+    # palette index of unchanged pixels
+    TRANSPARENT_INDEX: int = 255
+    # leave the previous frame in place
+    _DISPOSAL: int = 1
+
+    def __init__(self, fps: float = 5, metadata: dict[str, str] | None = None) -> None:
+        super().__init__(fps=fps, metadata=metadata)
+        self._file: BinaryIO | None = None
+        self._palette: np.ndarray | None = None
+        # palette index of every 24-bit color, or -1 if not looked up yet
+        self._lookup_table: np.ndarray | None = None
+        self._prev_indices: np.ndarray | None = None
+        self._num_frames: int = 0
+
+    # getters
+
+    @property
+    def num_frames(self) -> int:
+        return self._num_frames
+
+    # writing
+
+    def setup(self, fig: Figure, outfile: str, dpi: float | None = None) -> None:
+        super().setup(fig, outfile, dpi=dpi)
+        self.open(outfile)
+
+    def open(self, outfile: str) -> None:
+        """
+        start writing to outfile without a figure, e.g., to append images rendered elsewhere
+        """
+        self.outfile = outfile
+        self._file = open(outfile, "wb")
+        self._palette = None
+        self._lookup_table = None
+        self._prev_indices = None
+        self._num_frames = 0
+
+    def grab_frame(self, **savefig_kwargs) -> None:
+        buffer: BytesIO = BytesIO()
+        self.fig.savefig(buffer, **{**savefig_kwargs, "format": "rgba", "dpi": self.dpi})
+        self.append_image(
+            Image.frombuffer("RGBA", self.frame_size, buffer.getbuffer(), "raw", "RGBA", 0, 1)
+        )
+
+    def append_image(self, image: Image.Image) -> None:
+        assert self._file is not None, "the writer has not been opened"
+
+        rgb_image: Image.Image = image.convert("RGB")
+        if self._palette is None:
+            self._palette = self._global_palette(rgb_image)
+            self._lookup_table = np.full(1 << 24, -1, np.int16)
+            self._write_header(rgb_image.size)
+
+        indices: np.ndarray = self._quantized(np.asarray(rgb_image))
+        assert self._prev_indices is None or indices.shape == self._prev_indices.shape, (
+            indices.shape,
+            self._prev_indices.shape,
+        )
+
+        offset: tuple[int, int]
+        if self._prev_indices is None:
+            offset, frame_indices = (0, 0), indices
+        else:
+            changed: np.ndarray = indices != self._prev_indices
+            rows: np.ndarray = np.flatnonzero(changed.any(axis=1))
+            cols: np.ndarray = np.flatnonzero(changed.any(axis=0))
+            if rows.size == 0:
+                # one transparent pixel, so as to keep the timing of frames
+                offset, frame_indices = (0, 0), np.full((1, 1), self.TRANSPARENT_INDEX, np.uint8)
+            else:
+                window: tuple[slice, slice] = (
+                    slice(rows[0], rows[-1] + 1),
+                    slice(cols[0], cols[-1] + 1),
+                )
+                offset = int(cols[0]), int(rows[0])
+                frame_indices = np.where(
+                    changed[window], indices[window], np.uint8(self.TRANSPARENT_INDEX)
+                )
+
+        for data in GifImagePlugin.getdata(
+            Image.fromarray(np.ascontiguousarray(frame_indices, np.uint8)),
+            offset,
+            duration=int(1000 / self.fps),
+            transparency=self.TRANSPARENT_INDEX,
+            disposal=self._DISPOSAL,
+        ):
+            self._file.write(data)
+
+        self._prev_indices = indices
+        self._num_frames += 1
+
+    def finish(self) -> None:
+        assert self._file is not None, "the writer has not been opened"
+        self._file.write(b";")  # trailer
+        self._file.close()
+        self._file = None
+        self._lookup_table = None
+        self._prev_indices = None
+
+    # global palette
+
+    def _global_palette(self, rgb_image: Image.Image) -> np.ndarray:
+        """
+        (256, 3) palette of (up to) NUM_COLORS colors of rgb_image by median cut,
+        where the transparent and unused entries repeat the first color
+        """
+        palette: list[int] = rgb_image.quantize(colors=self.NUM_COLORS).getpalette() or []
+        palette = palette[: 3 * self.NUM_COLORS]
+        palette += palette[:3] * (256 - len(palette) // 3)
+        return np.array(palette, np.int32).reshape(256, 3)
+
+    def _quantized(self, rgb_array: np.ndarray) -> np.ndarray:
+        """
+        :return: (height, width) palette indices of the nearest colors
+        """
+        assert self._palette is not None and self._lookup_table is not None
+        packed: np.ndarray = (
+            (rgb_array[..., 0].astype(np.int32) << 16)
+            | (rgb_array[..., 1].astype(np.int32) << 8)
+            | rgb_array[..., 2]
+        )
+
+        indices: np.ndarray = self._lookup_table[packed]
+        if indices.min() < 0:
+            new_colors: np.ndarray = np.unique(packed[indices < 0])
+            rgbs: np.ndarray = np.stack(
+                ((new_colors >> 16) & 255, (new_colors >> 8) & 255, new_colors & 255), axis=-1
+            )
+            # among the colors of the palette, i.e., never the transparent index
+            self._lookup_table[new_colors] = (
+                np.square(rgbs[:, np.newaxis, :] - self._palette[np.newaxis, : self.NUM_COLORS])
+                .sum(axis=-1)
+                .argmin(axis=-1)
+            )
+            indices = self._lookup_table[packed]
+
+        return indices.astype(np.uint8)
+
+    def _write_header(self, size: tuple[int, int]) -> None:
+        assert self._file is not None and self._palette is not None
+        palette: list[int] = self._palette.ravel().tolist()
+        width, height = size
+
+        self._file.write(
+            b"GIF89a"
+            # logical screen descriptor with the global color table of 256 colors
+            + struct.pack("<HHBBB", width, height, 0xF7, 0, 0)
+            + bytes(palette)
+            # loop forever
+            + b"!\xff\x0bNETSCAPE2.0\x03\x01"
+            + struct.pack("<H", 0)
+            + b"\x00"
+        )
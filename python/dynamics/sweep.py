@@ -0,0 +1,154 @@
+"""
+parameter sweep running variants of one scenario over grids of constants in a process pool
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from logging import Logger, getLogger
+from typing import Any
+import os
+
+import numpy as np
+import yaml
+
+from dynamics.factorization_cache import FactorizationCache
+from dynamics.simulation import Simulation
+
+logger: Logger = getLogger()
+
+# scenario data parsed once per worker process by _init_worker
+_worker_base_data: dict[str, Any] = dict()
+# factorizations of the min energy systems shared by the variants run by the worker process
+_worker_factorization_cache: FactorizationCache = FactorizationCache()
+
+
+def _init_worker(base_yaml_text: str) -> None:
+    global _worker_base_data, _worker_factorization_cache
+    _worker_base_data = yaml.safe_load(base_yaml_text)
+    _worker_factorization_cache = FactorizationCache()
+
+
+def _run_variant(
+    constant_values: dict[str, str], t_end: float, sample_every: float | None
+) -> dict[str, np.ndarray]:
+    data: dict[str, Any] = _worker_base_data.copy()
+    constants: dict[str, str] = dict(data.get("constants", dict()))
+    constants.update(constant_values)
+    data["constants"] = constants
+
+    samples: dict[str, np.ndarray] = Simulation.from_data(data, _worker_factorization_cache).run(
+        t_end, sample_every
+    )
+
+    return dict(
+        times=samples["times"],
+        final_locs=samples["locs"][-1],
+        final_vels=samples["vels"][-1],
+        final_dissipated_energies=samples["dissipated_energies"][-1],
+        energies=samples["energies"],
+    )
+
+
+class ParameterSweep:
+    def __init__(
+        self,
+        base_yaml_text: str,
+        constant_grid: dict[str, list[str | float | int]],
+        t_end: float,
+        sample_every: float | None = None,
+    ) -> None:
+        """
+        :param base_yaml_text: scenario in YAML whose constants are to be swept
+        :param constant_grid: values of each swept constant - every combination becomes a variant
+        """
+        base_data: dict[str, Any] = yaml.safe_load(base_yaml_text)
+        base_constants: dict[str, Any] = base_data.get("constants", dict())
+        for name in constant_grid:
+            assert name in base_constants, (name, list(base_constants.keys()))
+
+        self._base_yaml_text: str = base_yaml_text
+        self._constant_names: list[str] = list(constant_grid.keys())
+        self._variants: list[tuple[str | float | int, ...]] = list(
+            product(*[constant_grid[name] for name in self._constant_names])
+        )
+        self._t_end: float = t_end
+        self._sample_every: float | None = sample_every
+
+    @classmethod
+    def from_files(cls, base_file: str, sweep_file: str) -> "ParameterSweep":
+        """
+        the sweep file has the (list of) values of constants to sweep under constants,
+        t_end, and optionally sample_every
+        """
+        with open(base_file, "r") as fid:
+            base_yaml_text: str = fid.read()
+        with open(sweep_file, "r") as fid:
+            sweep_data: dict[str, Any] = yaml.safe_load(fid)
+
+        return cls(
+            base_yaml_text,
+            {
+                name: values if isinstance(values, list) else [values]
+                for name, values in sweep_data["constants"].items()
+            },
+            float(sweep_data["t_end"]),
+            sweep_data.get("sample_every", None),
+        )
+
+    @property
+    def constant_names(self) -> list[str]:
+        return self._constant_names
+
+    @property
+    def num_variants(self) -> int:
+        return len(self._variants)
+
+    def run(
+        self, num_workers: int | None = None, output_filepath: str | None = None
+    ) -> dict[str, np.ndarray]:
+        """
+        :return: (# variants, # swept constants) constant values, sample times,
+        (# variants, # bodies, dim) final locations and velocities,
+        (# variants, # bodies) final dissipated energies,
+        and (# variants, # samples, 4) energy time series
+        """
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+
+        logger.info(f"run {self.num_variants} variants with {num_workers} worker processes")
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_worker, initargs=(self._base_yaml_text,)
+        ) as executor:
+            results: list[dict[str, np.ndarray]] = list(
+                executor.map(
+                    _run_variant,
+                    [
+                        {name: str(value) for name, value in zip(self._constant_names, variant)}
+                        for variant in self._variants
+                    ],
+                    [self._t_end] * self.num_variants,
+                    [self._sample_every] * self.num_variants,
+                    chunksize=max(1, self.num_variants // (4 * num_workers)),
+                )
+            )
+
+        sweep_results: dict[str, np.ndarray] = dict(
+            constant_values=np.array(
+                [[float(eval(str(value))) for value in variant] for variant in self._variants],
+                float,
+            ).reshape(self.num_variants, len(self._constant_names)),
+            times=results[0]["times"],
+            final_locs=np.array([result["final_locs"] for result in results]),
+            final_vels=np.array([result["final_vels"] for result in results]),
+            final_dissipated_energies=np.array(
+                [result["final_dissipated_energies"] for result in results]
+            ),
+            energies=np.array([result["energies"] for result in results]),
+        )
+
+        if output_filepath is not None:
+            np.savez(output_filepath, constant_names=self._constant_names, **sweep_results)
+            logger.info(f"sweep results saved to {output_filepath}")
+
+        return sweep_results
@@ -0,0 +1,201 @@
+"""
+trajectory recorder writing samples of the state to a chunked .npz file in the background
+"""
+
+from logging import Logger, getLogger
+from queue import Queue
+from threading import Thread
+from types import TracebackType
+from zipfile import ZIP_STORED, ZipFile
+
+import numpy as np
+
+logger: Logger = getLogger()
+
+
+class TrajectoryRecorder:
+    """
+    samples are recorded into a ring of preallocated chunk buffers, and a background writer thread
+    flushes every full chunk to the .npz file as one entry per field, e.g., locs_000003,
+    so that long runs can record every (sub-)step with bounded memory - recording blocks only
+    when all the buffers are waiting to be written
+    """
+
+    FIELD_NAMES: tuple[str, ...] = (
+        "times",
+        "locs",
+        "vels",
+        "dissipated_energies",
+        "energies",
+        "momenta",
+    )
+
+    def __init__(
+        self, filepath: str, num_bodies: int, dim: int, chunk_size: int = 4096, num_buffers: int = 2
+    ) -> None:
+        """
+        :param chunk_size: # of samples per buffer, i.e., per entry of the file
+        :param num_buffers: # of buffers, i.e., 2 for double buffering
+        """
+        assert chunk_size > 0, chunk_size
+        assert num_buffers >= 2, num_buffers
+
+        self._filepath: str = filepath
+        self._chunk_size: int = chunk_size
+        self._num_samples: int = 0
+
+        field_shapes: dict[str, tuple[int, ...]] = dict(
+            times=(),
+            locs=(num_bodies, dim),
+            vels=(num_bodies, dim),
+            dissipated_energies=(num_bodies,),
+            energies=(4,),
+            momenta=(dim,),
+        )
+        self._buffers: list[dict[str, np.ndarray]] = [
+            {name: np.zeros((chunk_size,) + field_shapes[name]) for name in self.FIELD_NAMES}
+            for _ in range(num_buffers)
+        ]
+
+        # indices of the buffers to be filled, and (index, # samples) of those to be written
+        self._free_buffers: Queue[int] = Queue()
+        for idx in range(num_buffers):
+            self._free_buffers.put(idx)
+        self._full_buffers: Queue[tuple[int, int] | None] = Queue()
+
+        self._cur_buffer: int | None = None
+        self._cur_buffer_size: int = 0
+
+        self._zip_file: ZipFile = ZipFile(filepath, mode="w", compression=ZIP_STORED)
+        self._num_chunks: int = 0
+        self._writer_error: BaseException | None = None
+        self._writer: Thread = Thread(target=self._write_chunks, daemon=True)
+        self._writer.start()
+
+        self._is_closed: bool = False
+
+    # getters
+
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    @property
+    def num_samples(self) -> int:
+        return self._num_samples
+
+    # recording
+
+    def record(
+        self,
+        time: float,
+        locs: np.ndarray,
+        vels: np.ndarray,
+        dissipated_energies: np.ndarray,
+        energies: np.ndarray,
+        momentum: np.ndarray,
+    ) -> None:
+        """
+        :param locs: (# bodies, dim) locations
+        :param vels: (# bodies, dim) velocities
+        :param dissipated_energies: (# bodies,) dissipated energies
+        :param energies: (4,) kinetic, body potential, spring potential, and dissipated energies
+        :param momentum: (dim,) total momentum
+        """
+        assert not self._is_closed, self._filepath
+        self._raise_writer_error()
+
+        if self._cur_buffer is None:
+            self._cur_buffer = self._free_buffers.get()
+            self._cur_buffer_size = 0
+
+        buffer: dict[str, np.ndarray] = self._buffers[self._cur_buffer]
+        row: int = self._cur_buffer_size
+        buffer["times"][row] = time
+        buffer["locs"][row] = locs
+        buffer["vels"][row] = vels
+        buffer["dissipated_energies"][row] = dissipated_energies
+        buffer["energies"][row] = energies
+        buffer["momenta"][row] = momentum
+
+        self._cur_buffer_size += 1
+        self._num_samples += 1
+
+        if self._cur_buffer_size == self._chunk_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._cur_buffer is not None:
+            self._full_buffers.put((self._cur_buffer, self._cur_buffer_size))
+            self._cur_buffer = None
+            self._cur_buffer_size = 0
+
+    def close(self) -> None:
+        """
+        write the remaining samples and finish the file
+        """
+        if self._is_closed:
+            return
+
+        # the file has at least one chunk, i.e., the shapes of the fields
+        if self._num_samples == 0:
+            self._cur_buffer = self._free_buffers.get()
+        self._flush()
+        self._full_buffers.put(None)
+        self._writer.join()
+        self._zip_file.close()
+        self._is_closed = True
+
+        self._raise_writer_error()
+        logger.info(
+            f"{self._num_samples} samples saved to {self._filepath} in {self._num_chunks} chunks"
+        )
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    # background writing
+
+    def _write_chunks(self) -> None:
+        while (item := self._full_buffers.get()) is not None:
+            idx, num_samples = item
+            try:
+                if self._writer_error is None:
+                    for name, array in self._buffers[idx].items():
+                        with self._zip_file.open(
+                            f"{name}_{self._num_chunks:06d}.npy", mode="w", force_zip64=True
+                        ) as fid:
+                            np.lib.format.write_array(fid, array[:num_samples], allow_pickle=False)
+                    self._num_chunks += 1
+            except BaseException as error:
+                # raised in the recording thread, while the buffers keep being recycled
+                self._writer_error = error
+            finally:
+                self._free_buffers.put(idx)
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            raise RuntimeError(f"failed to write {self._filepath}") from self._writer_error
+
+    # loading
+
+    @classmethod
+    def load(cls, filepath: str) -> dict[str, np.ndarray]:
+        """
+        :return: the recorded fields whose chunks are concatenated
+        """
+        with np.load(filepath) as npz_file:
+            return {
+                name: np.concatenate(
+                    [npz_file[key] for key in sorted(npz_file.files) if key.startswith(name + "_")]
+                )
+                for name in cls.FIELD_NAMES
+            }
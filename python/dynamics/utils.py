@@ -19,13 +19,19 @@ from dynamics.forces.force_base import ForceBase
 from dynamics.forces.forces import Forces
 from dynamics.instant_creators.constants import Constants
 from dynamics.instant_creators.fan_creator import FanCreator
+from dynamics.instant_creators.integrator_creator import IntegratorCreator
 from dynamics.instant_creators.point_mass_creator import PointMassCreator
 from dynamics.instant_creators.vertical_wall_1d_creator import VerticalWall1DCreator
 from dynamics.instant_creators.vertical_pin_2d_creator import VerticalPin2DCreator
 from dynamics.instant_creators.spring_creator import SpringCreator
+from dynamics.instant_creators.spring_network_creator import SpringNetworkCreator
 from dynamics.instant_creators.gravity_like_creator import GravityLikeCreator
 from dynamics.instant_creators.electric_like_creator import ElectricForceLikeCreator
+from dynamics.instant_creators.electric_force_like_group_creator import (
+    ElectricForceLikeGroupCreator,
+)
 from dynamics.instant_creators.frictional_force_2d_creator import FrictionalForce2DCreator
+from dynamics.instant_creators.frictional_zones_2d_creator import FrictionalZones2DCreator
 from dynamics.instant_creators.non_sticky_left_horizontal_spring_creator import (
     NonStickyLeftHorizontalSpringCreator,
 )
@@ -43,68 +49,100 @@ def is_mac_os() -> bool:
     return sys.platform == "darwin"
 
 
-def energy_and_momentum_info(
-    bodies: Bodies, forces: Forces
-) -> tuple[list[str], np.ndarray, tuple[np.ndarray, ...]]:
-    ke: float = bodies.total_kinetic_energy
-    _bpe: float = bodies.total_potential_energy(forces)
-    nspe, fpe = forces.potential_energy
-    bpe: float = nspe + _bpe
-    pe: float = bpe + fpe
-    de: float = bodies.total_dissipated_energy
-    total_momentum: np.ndarray = bodies.total_momentum
+def energies_and_momentum(bodies: Bodies, forces: Forces) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :return: kinetic, body potential (gravity-like, electric-like, etc.), spring potential,
+    and dissipated energies, and total momentum
+    """
+    bpe: float
+    fpe: float
+    if forces.supports_batched_force:
+        # reductions over the state store instead of loops over bodies and forces
+        bpe, fpe = forces.batched_potential_energy(bodies.locs, bodies.masses)
+    else:
+        nspe, fpe = forces.potential_energy
+        bpe = nspe + bodies.total_potential_energy(forces)
 
-    force_potential_energy_bar_vertices: np.ndarray = np.vstack(
-        (_SQUARE_X_COORDINATES, bpe + fpe * _SQUARE_Y_COORDINATES)
-    )
-    kinetic_energy_bar_vertices: np.ndarray = np.vstack(
-        (_SQUARE_X_COORDINATES, (bpe + fpe) + ke * _SQUARE_Y_COORDINATES)
+    return (
+        np.array([bodies.total_kinetic_energy, bpe, fpe, bodies.total_dissipated_energy], float),
+        bodies.total_momentum,
     )
-    dissipated_energy_bar_vertices: np.ndarray = np.vstack(
-        (_SQUARE_X_COORDINATES, (bpe + fpe + ke) + de * _SQUARE_Y_COORDINATES)
+
+
+# labels of the lines of the info text without the values, i.e., static, and those values
+# formatted by energy_and_momentum_info_values and kinematics_info_values
+ENERGY_AND_MOMENTUM_INFO_LABELS: list[str] = [
+    r"$E_\mathrm{k} + E_\mathrm{p} + E_\mathrm{d}$, $E_\mathrm{k} + E_\mathrm{p}$ =",
+    r"$E_\mathrm{k}$, $E_\mathrm{p}$"
+    + r" (= $E_\mathrm{p,gravity}$ + $E_\mathrm{p,spring}$), $E_\mathrm{d}$ =",
+    "p =",
+]
+KINEMATICS_INFO_LABEL: str = r"$l$, $v$, $\|v\|$, $p$ & $E_\mathrm{d}$ ="
+
+
+def energy_and_momentum_info(
+    bodies: Bodies,
+    forces: Forces,
+    energies_and_total_momentum: tuple[np.ndarray, np.ndarray] | None = None,
+) -> tuple[list[str], np.ndarray, tuple[np.ndarray, ...]]:
+    """
+    :param energies_and_total_momentum: those computed elsewhere, e.g., by the physics worker,
+    instead of computing them from bodies and forces
+    :return: the lines of the info text, i.e., the labels followed by the values, the energies,
+    and the vertices of the energy bars
+    """
+    energies, total_momentum = (
+        energies_and_momentum(bodies, forces)
+        if energies_and_total_momentum is None
+        else energies_and_total_momentum
     )
 
     return (
         [
-            r"$E_\mathrm{k} + E_\mathrm{p} + E_\mathrm{d}$ = "
-            + f"{ke+pe+de:.2f}"
-            + r", $E_\mathrm{k} + E_\mathrm{p}$ = "
-            + f"{ke+pe:.2f}",
-            r"$E_\mathrm{k}$ = "
-            + f"{ke:.2f}, "
-            + r"$E_\mathrm{p}$ = "
-            + f"{pe:.2f}"
-            + r" (= $E_\mathrm{p,gravity}$ "
-            + f"({bpe:.2f})"
-            + r" + $E_\mathrm{p,spring}$ "
-            + f"({fpe:.2f})"
-            + r"), $E_\mathrm{d}$ = "
-            + f"{de:.2f}",
-            "p = (" + ", ".join([f"{x:.2f}" for x in total_momentum]) + ")",
+            f"{label} {value}"
+            for label, value in zip(
+                ENERGY_AND_MOMENTUM_INFO_LABELS,
+                energy_and_momentum_info_values(energies, total_momentum),
+            )
         ],
-        np.array([ke, bpe, fpe, de], float),
-        (
-            force_potential_energy_bar_vertices,
-            kinetic_energy_bar_vertices,
-            dissipated_energy_bar_vertices,
-        ),
+        energies,
+        energy_bar_vertices(energies),
+    )
+
+
+def energy_bar_vertices(energies: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    :return: (2, 4) vertices of the force potential, kinetic, and dissipated energy bars,
+    which are stacked on the body potential energy
+    """
+    ke, bpe, fpe, de = energies.tolist()
+
+    return (
+        np.vstack((_SQUARE_X_COORDINATES, bpe + fpe * _SQUARE_Y_COORDINATES)),
+        np.vstack((_SQUARE_X_COORDINATES, (bpe + fpe) + ke * _SQUARE_Y_COORDINATES)),
+        np.vstack((_SQUARE_X_COORDINATES, (bpe + fpe + ke) + de * _SQUARE_Y_COORDINATES)),
     )
 
 
-def kinematics_info_text(bodies: Bodies) -> list[str]:
+def energy_and_momentum_info_values(energies: np.ndarray, total_momentum: np.ndarray) -> list[str]:
+    ke, bpe, fpe, de = energies.tolist()
+    pe: float = bpe + fpe
     return [
-        "$l$ = ("
+        f"{ke+pe+de:.2f}, {ke+pe:.2f}",
+        f"{ke:.2f}, {pe:.2f} (= {bpe:.2f} + {fpe:.2f}), {de:.2f}",
+        "(" + ", ".join([f"{x:.2f}" for x in total_momentum]) + ")",
+    ]
+
+
+def kinematics_info_values(bodies: Bodies) -> list[str]:
+    return [
+        "("
         + ", ".join([f"{x:.2f}" for x in body.loc])
-        + ")"
-        + ", $v$ = ("
+        + "), ("
         + ", ".join([f"{x:.2f}" for x in body.vel])
-        + ")"
-        + f", $\|v\|$ = {norm(body.vel):.2f}"  # noqa: W605
-        + ", $p$ = ("  # noqa: W605
+        + f"), {norm(body.vel):.2f}, ("
         + ", ".join([f"{x:.2f}" for x in body.momentum])
-        + ")"
-        + r" & $E_\mathrm{d}$ = "
-        + f"{body.dissipated_energy:.2f}"
+        + f") & {body.dissipated_energy:.2f}"
         for body in bodies.bodies
         if not isinstance(body, FixedBodyBase)
     ]
@@ -158,6 +196,9 @@ def load_dynamic_system_simulation_setting(
     )
     simulation_setting["repeat"] = simulation_setting.get("repeat", False)
     simulation_setting["show_kinematics"] = simulation_setting.get("show_kinematics", False)
+    # # of frames between updates of the info text, which may be slower than the frame rate
+    simulation_setting["info_update_every"] = simulation_setting.get("info_update_every", 1)
+    simulation_setting["integrator"] = simulation_setting.get("integrator", "current")
 
     if "sim_time_step" in simulation_setting:
         simulation_setting["sim_time_step"] = constants.value(
@@ -220,6 +261,14 @@ def load_dynamic_system_simulation_setting(
             ]
         )
 
+    if "spring_network" in _data:
+        forces.extend(
+            [
+                SpringNetworkCreator.create(spring_network_data, id_body_map, constants)
+                for spring_network_data in _data.pop("spring_network")
+            ]
+        )
+
     if "gravity_like" in _data:
         forces.extend(
             [
@@ -236,6 +285,16 @@ def load_dynamic_system_simulation_setting(
             ]
         )
 
+    if "electric_force_like_group" in _data:
+        forces.extend(
+            [
+                ElectricForceLikeGroupCreator.create(
+                    electric_force_like_group_data, id_body_map, constants, simulation_setting
+                )
+                for electric_force_like_group_data in _data.pop("electric_force_like_group")
+            ]
+        )
+
     if "frictional_force_2d" in _data:
         forces.extend(
             [
@@ -244,6 +303,14 @@ def load_dynamic_system_simulation_setting(
             ]
         )
 
+    if "frictional_zones_2d" in _data:
+        forces.extend(
+            [
+                FrictionalZones2DCreator.create(frictional_zones_2d, constants)
+                for frictional_zones_2d in _data.pop("frictional_zones_2d")
+            ]
+        )
+
     if "non_sticky_left_horizontal_spring" in _data:
         forces.extend(
             [
@@ -271,9 +338,21 @@ def load_dynamic_system_simulation_setting(
         )
         sys.exit(1)
 
+    bodies: Bodies = Bodies(*id_body_map.values())
+    bodies.set_integrator(
+        IntegratorCreator.create(
+            (
+                simulation_setting["integrator"]  # type:ignore
+                if isinstance(simulation_setting["integrator"], dict)
+                else dict(name=simulation_setting["integrator"])
+            ),
+            constants,
+        )
+    )
+
     return (
         simulation_setting,
-        Bodies(*id_body_map.values()),
+        bodies,
         Forces(*forces),
         Accessories(*accessories),
     )
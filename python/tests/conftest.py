@@ -0,0 +1,20 @@
+"""
+shared fixtures of the tests, which import the dynamics package from the python directory
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PYTHON_DIRECTORY: Path = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIRECTORY))
+
+
+@pytest.fixture
+def input_directory() -> Path:
+    """
+    directory of the bundled input files
+    """
+    return PYTHON_DIRECTORY.parent / "data" / "input"
@@ -0,0 +1,62 @@
+"""
+tests of resuming simulations from checkpoints
+"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+import yaml
+
+from dynamics.simulation import Simulation
+
+FRAME_INTERVAL: float = 0.04
+
+
+def _data(input_directory: Path, input_name: str, integrator: str) -> dict[str, Any]:
+    with open(input_directory / input_name, "r") as fid:
+        data: dict[str, Any] = yaml.safe_load(fid)
+
+    data["simulation_setting"]["integrator"] = integrator
+    for group_data in data.get("electric_force_like_group", list()):
+        group_data.update(method="cutoff", cutoff=3)
+
+    return data
+
+
+def _advance(simulation: Simulation, num_frames: int) -> None:
+    start_frame: int = int(round(simulation.time / FRAME_INTERVAL))
+    for frame in range(start_frame + 1, start_frame + num_frames + 1):
+        simulation.advance(frame * FRAME_INTERVAL)
+
+
+@pytest.mark.parametrize(
+    "input_name, integrator",
+    [
+        ("1d-1-body.yaml", "current"),
+        ("2d-4-bodies-accessories.yaml", "dormand_prince"),
+        ("2d-spring-network-cloth.yaml", "yoshida4"),
+        ("electric-force-like-group.yaml", "dormand_prince"),
+    ],
+)
+def test_resume_is_bit_identical(
+    input_directory: Path, tmp_path: Path, input_name: str, integrator: str
+) -> None:
+    checkpoint_filepath: str = str(tmp_path / "checkpoint.npz")
+
+    straight: Simulation = Simulation.from_data(_data(input_directory, input_name, integrator))
+    _advance(straight, 25)
+    straight.save_checkpoint(checkpoint_filepath)
+    _advance(straight, 25)
+
+    resumed: Simulation = Simulation.from_data(_data(input_directory, input_name, integrator))
+    resumed.resume(checkpoint_filepath)
+    assert resumed.time == 25 * FRAME_INTERVAL
+    _advance(resumed, 25)
+
+    straight_state: dict[str, np.ndarray] = straight.checkpoint_state()
+    resumed_state: dict[str, np.ndarray] = resumed.checkpoint_state()
+    assert straight_state.keys() == resumed_state.keys()
+    for key, value in straight_state.items():
+        np.testing.assert_array_equal(resumed_state[key], value, err_msg=key)
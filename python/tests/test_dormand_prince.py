@@ -0,0 +1,116 @@
+"""
+tests of the Dormand-Prince 5(4) integrator on the harmonic oscillator
+"""
+
+import numpy as np
+
+from dynamics.integrators.dormand_prince import DormandPrince45
+
+SPRING_CONSTANT: float = 4.0
+DAMPING: float = 0.5
+
+
+def _force_function(
+    time: float, locs: np.ndarray, vels: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    frictional_force: np.ndarray = -DAMPING * vels
+    return -SPRING_CONSTANT * locs + frictional_force, frictional_force
+
+
+def _advance(
+    integrator: DormandPrince45, locs: np.ndarray, vels: np.ndarray, times: np.ndarray
+) -> np.ndarray:
+    dissipated_energy: np.ndarray = np.zeros(locs.shape[:-1])
+    for t_1, t_2 in zip(times[:-1], times[1:]):
+        dissipated_energy += integrator.advance(
+            t_1, t_2, 0.1, locs, vels, np.ones(locs.shape[-2]), _force_function
+        )
+    return dissipated_energy
+
+
+def _exact(time: float) -> tuple[float, float]:
+    """
+    location and velocity of the damped oscillator (of unit mass) starting at 1 at rest
+    """
+    decay: float = 0.5 * DAMPING
+    omega: float = np.sqrt(SPRING_CONSTANT - decay**2)
+    loc: float = np.exp(-decay * time) * (
+        np.cos(omega * time) + decay / omega * np.sin(omega * time)
+    )
+    vel: float = -np.exp(-decay * time) * (SPRING_CONSTANT / omega) * np.sin(omega * time)
+    return loc, vel
+
+
+def test_error_follows_tolerance() -> None:
+    times: np.ndarray = np.linspace(0.0, 10.0, 26)
+    exact_loc, exact_vel = _exact(times[-1])
+
+    errors: list[float] = list()
+    for tolerance in (1e-4, 1e-6, 1e-8, 1e-10):
+        integrator: DormandPrince45 = DormandPrince45(atol=tolerance, rtol=tolerance)
+        locs: np.ndarray = np.array([[1.0]])
+        vels: np.ndarray = np.array([[0.0]])
+        dissipated_energy: np.ndarray = _advance(integrator, locs, vels, times)
+
+        errors.append(max(abs(locs[0, 0] - exact_loc), abs(vels[0, 0] - exact_vel)))
+        assert errors[-1] < 100.0 * tolerance, (tolerance, errors[-1])
+
+        # the energy lost equals the energy dissipated by the frictional force
+        energy: float = 0.5 * (SPRING_CONSTANT * locs[0, 0] ** 2 + vels[0, 0] ** 2)
+        np.testing.assert_allclose(
+            energy + dissipated_energy[0], 0.5 * SPRING_CONSTANT, atol=100.0 * tolerance
+        )
+
+    assert errors == sorted(errors, reverse=True), errors
+
+
+def test_steps_adapt_and_land_on_every_time() -> None:
+    integrator: DormandPrince45 = DormandPrince45(atol=1e-8, rtol=1e-8, max_step=0.3)
+    step_times: list[float] = list()
+    integrator.set_step_callback(
+        lambda time, locs, vels, dissipated_energy: step_times.append(time)
+    )
+
+    times: np.ndarray = np.linspace(0.0, 5.0, 11)
+    _advance(integrator, np.array([[1.0]]), np.array([[0.0]]), times)
+
+    # the first step of 0.1 is too long for the tolerances, and no step exceeds max_step
+    assert integrator.num_rejected_steps >= 1
+    assert integrator.num_accepted_steps == len(step_times)
+    assert np.all(np.diff(np.r_[0.0, step_times]) <= 0.3 + 1e-12)
+    assert set(times[1:]) <= set(step_times)
+
+
+def test_batch_is_controlled_by_worst_member() -> None:
+    times: np.ndarray = np.linspace(0.0, 3.0, 7)
+    locs: np.ndarray = np.array([[[1.0]], [[1e-3]]])
+    vels: np.ndarray = np.zeros_like(locs)
+    _advance(DormandPrince45(atol=1e-8, rtol=1e-8), locs, vels, times)
+
+    # the oscillator is linear, so the members only differ by their scale
+    single_locs: np.ndarray = np.array([[1.0]])
+    _advance(DormandPrince45(atol=1e-8, rtol=1e-8), single_locs, np.zeros((1, 1)), times)
+    np.testing.assert_array_equal(locs[0], single_locs)
+    np.testing.assert_allclose(locs[1], 1e-3 * single_locs, rtol=1e-12)
+
+
+def test_checkpoint_resumes_identically() -> None:
+    times: np.ndarray = np.linspace(0.0, 4.0, 9)
+
+    integrator: DormandPrince45 = DormandPrince45(atol=1e-7, rtol=1e-7)
+    locs: np.ndarray = np.array([[1.0]])
+    vels: np.ndarray = np.array([[0.0]])
+    _advance(integrator, locs, vels, times[:5])
+
+    resumed: DormandPrince45 = DormandPrince45(atol=1e-7, rtol=1e-7)
+    resumed.restore_checkpoint_state(integrator.checkpoint_state())
+    resumed_locs: np.ndarray = locs.copy()
+    resumed_vels: np.ndarray = vels.copy()
+
+    _advance(integrator, locs, vels, times[4:])
+    _advance(resumed, resumed_locs, resumed_vels, times[4:])
+
+    np.testing.assert_array_equal(resumed_locs, locs)
+    np.testing.assert_array_equal(resumed_vels, vels)
+    assert resumed.num_accepted_steps == integrator.num_accepted_steps
+    assert resumed.num_rejected_steps == integrator.num_rejected_steps
@@ -0,0 +1,126 @@
+"""
+tests of the electric-force-like groups against the exact summation over all the pairs
+"""
+
+import numpy as np
+
+from dynamics.bodies.body_base import BodyBase
+from dynamics.bodies.point_mass import PointMass
+from dynamics.forces.barnes_hut_electric_force_like import BarnesHutElectricForceLike
+from dynamics.forces.cutoff_electric_force_like import CutoffElectricForceLike
+from dynamics.forces.particle_mesh_electric_force_like import ParticleMeshElectricForceLike
+
+NUM_BODIES: int = 300
+
+
+def _locs(seed: int, *batch_shape: int) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(-5.0, 5.0, batch_shape + (NUM_BODIES, 2))
+
+
+def _bodies(locs: np.ndarray) -> list[BodyBase]:
+    return [PointMass(1.0, loc) for loc in locs]
+
+
+def _relative_error(approx: np.ndarray, exact: np.ndarray) -> float:
+    return float(np.linalg.norm(approx - exact) / np.linalg.norm(exact))
+
+
+def test_barnes_hut_converges_to_exact_summation() -> None:
+    locs: np.ndarray = _locs(0)
+    bodies: list[BodyBase] = _bodies(locs)
+
+    # no node is regarded as one body with zero opening angle
+    force: BarnesHutElectricForceLike = BarnesHutElectricForceLike(
+        1.0, 2.0, 0.1, bodies, opening_angle=0.0
+    )
+    exact_forces: np.ndarray = force.exact_group_forces(locs)
+    exact_potential_energy: float = float(force.exact_group_potential_energy(locs))
+    np.testing.assert_allclose(force.group_forces(locs), exact_forces, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(force.group_potential_energy(locs), exact_potential_energy)
+
+    errors: list[float] = list()
+    for opening_angle in (0.3, 0.5, 1.0):
+        force = BarnesHutElectricForceLike(1.0, 2.0, 0.1, bodies, opening_angle=opening_angle)
+        errors.append(_relative_error(force.group_forces(locs), exact_forces))
+        np.testing.assert_allclose(
+            force.group_potential_energy(locs), exact_potential_energy, rtol=0.05
+        )
+
+    assert errors == sorted(errors), errors
+    assert errors[1] < 1e-2, errors
+
+    # the batched forces are those of every member
+    batched_locs: np.ndarray = _locs(1, 3)
+    np.testing.assert_array_equal(
+        force.batched_group_forces(batched_locs),
+        np.array([force.group_forces(member_locs) for member_locs in batched_locs]),
+    )
+
+    force.set_exact(True)
+    np.testing.assert_array_equal(force.group_forces(locs), exact_forces)
+
+
+def test_cutoff_equals_exact_summation() -> None:
+    locs: np.ndarray = _locs(0)
+    force: CutoffElectricForceLike = CutoffElectricForceLike(1.0, 2.0, 0.1, _bodies(locs), 1.5)
+
+    np.testing.assert_allclose(
+        force.group_forces(locs), force.exact_group_forces(locs), rtol=1e-12, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        force.group_potential_energy(locs), force.exact_group_potential_energy(locs), rtol=1e-12
+    )
+
+    # every pair beyond the cutoff is left out
+    wide: CutoffElectricForceLike = CutoffElectricForceLike(1.0, 2.0, 0.1, _bodies(locs), 100.0)
+    assert not np.allclose(wide.group_forces(locs), force.group_forces(locs))
+
+
+def test_cutoff_keeps_one_neighbor_list_per_member() -> None:
+    locs: np.ndarray = _locs(1, 4)
+    force: CutoffElectricForceLike = CutoffElectricForceLike(1.0, 2.0, 0.1, _bodies(locs[0]), 1.5)
+
+    rng: np.random.Generator = np.random.default_rng(2)
+    for _ in range(10):
+        # members far apart from each other, each of which moves by less than skin / 2
+        moved_locs: np.ndarray = locs + rng.uniform(-0.01, 0.01, locs.shape)
+        np.testing.assert_allclose(
+            force.batched_group_forces(moved_locs),
+            force.exact_group_forces(moved_locs),
+            rtol=1e-12,
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(
+            force.batched_group_potential_energy(moved_locs),
+            force.exact_group_potential_energy(moved_locs),
+            rtol=1e-12,
+        )
+
+    assert [force.batch_neighbor_list((idx,)).num_builds for idx in range(4)] == [1, 1, 1, 1]
+    assert force.neighbor_list.num_builds == 0
+
+
+def test_particle_mesh_converges_to_exact_summation() -> None:
+    locs: np.ndarray = _locs(0)
+    bodies: list[BodyBase] = _bodies(locs)
+
+    force_errors: list[float] = list()
+    potential_energy_errors: list[float] = list()
+    for grid_size in (64, 128, 256):
+        # the spacing should be less than threshold
+        force: ParticleMeshElectricForceLike = ParticleMeshElectricForceLike(
+            1.0, 2.0, 0.5, bodies, [-5.0, 5.0], [-5.0, 5.0], grid_size
+        )
+        exact_potential_energy: float = float(force.exact_group_potential_energy(locs))
+        force_errors.append(
+            _relative_error(force.group_forces(locs), force.exact_group_forces(locs))
+        )
+        potential_energy_errors.append(
+            abs(force.group_potential_energy(locs) - exact_potential_energy)
+            / abs(exact_potential_energy)
+        )
+
+    assert force_errors == sorted(force_errors, reverse=True), force_errors
+    assert potential_energy_errors == sorted(potential_energy_errors, reverse=True)
+    assert force_errors[-1] < 0.05, force_errors
+    assert potential_energy_errors[-1] < 1e-4, potential_energy_errors
@@ -0,0 +1,48 @@
+"""
+tests of the ensembles simulated with batched force kernels
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from dynamics.ensemble import Ensemble
+from dynamics.integrators.dormand_prince import DormandPrince45
+from dynamics.simulation import Simulation
+
+
+def test_default_integrator_does_not_share_state(input_directory: Path) -> None:
+    simulation: Simulation = Simulation.from_file(str(input_directory / "2d-2-bodies-2-pins.yaml"))
+    bodies = simulation.bodies
+    integrator: DormandPrince45 = DormandPrince45(atol=1e-9, rtol=1e-8, max_step=0.01)
+    bodies.set_integrator(integrator)
+
+    sub_steps: list[float] = list()
+    integrator.set_step_callback(lambda time, locs, vels, dissipated_energy: sub_steps.append(time))
+
+    ensemble: Ensemble = Ensemble.perturbed(bodies, simulation.forces, 3, loc_std=0.1, seed=0)
+    ensemble.advance(bodies.cur_time + 0.5)
+
+    # neither the step length, the statistics, nor the callback of bodies are touched
+    assert integrator.step_length is None
+    assert integrator.num_accepted_steps == 0
+    assert len(sub_steps) == 0
+
+    # but the settings are the same, e.g., no step is longer than max_step
+    assert ensemble._integrator is not integrator
+    assert ensemble._integrator.num_accepted_steps >= 50
+    assert ensemble._integrator.step_length <= 0.01
+
+
+def test_members_match_single_simulation(input_directory: Path) -> None:
+    simulation: Simulation = Simulation.from_file(str(input_directory / "2d-2-bodies-2-pins.yaml"))
+    bodies = simulation.bodies
+    bodies.set_integrator(DormandPrince45(atol=1e-9, rtol=1e-9))
+
+    ensemble: Ensemble = Ensemble.perturbed(bodies, simulation.forces, 2)
+    ensemble.advance(bodies.cur_time + 0.5)
+
+    # identical members evolve identically, and as bodies do by themselves
+    np.testing.assert_array_equal(ensemble.locs[0], ensemble.locs[1])
+    bodies.advance(bodies.cur_time + 0.5, simulation.forces)
+    np.testing.assert_allclose(ensemble.locs[0], bodies.locs[: bodies.num_free_bodies], atol=1e-6)
@@ -0,0 +1,53 @@
+"""
+tests of the energy drift of the integrators at a large step
+"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import yaml
+
+from dynamics.simulation import Simulation
+
+SIM_TIME_STEP: float = 0.05
+T_END: float = 60.0
+
+
+def _energy_errors(input_directory: Path, integrator: str) -> tuple[float, float]:
+    """
+    max deviations of the total energy from the initial one over the first and the last quarters
+    of the two bodies of electric-spring-force-2-bodies.yaml on their springs only, i.e., without
+    the electric-like force, whose potential energy has a kink at its threshold
+
+    the step is fixed (rather than shortened for faster bodies), which symplectic integrators
+    need to keep the error bounded
+    """
+    with open(input_directory / "electric-spring-force-2-bodies.yaml", "r") as fid:
+        data: dict[str, Any] = yaml.safe_load(fid)
+
+    del data["electric_force_like"]
+    data["simulation_setting"].update(
+        integrator=integrator, sim_time_step=SIM_TIME_STEP, sim_time_step_const_vel=np.inf
+    )
+
+    energies: np.ndarray = Simulation.from_data(data).run(T_END, 0.2)["energies"].sum(axis=-1)
+    errors: np.ndarray = np.abs(energies - energies[0])
+    num_samples: int = errors.size // 4
+    return float(errors[:num_samples].max()), float(errors[-num_samples:].max())
+
+
+def test_symplectic_integrators_keep_energy_error_bounded(input_directory: Path) -> None:
+    leapfrog_errors: tuple[float, float] = _energy_errors(input_directory, "leapfrog")
+    yoshida4_errors: tuple[float, float] = _energy_errors(input_directory, "yoshida4")
+    current_errors: tuple[float, float] = _energy_errors(input_directory, "current")
+
+    # no growth over time
+    assert leapfrog_errors[1] <= 1.05 * leapfrog_errors[0], leapfrog_errors
+    assert yoshida4_errors[1] <= 1.05 * yoshida4_errors[0], yoshida4_errors
+    # unlike the default predictor-corrector
+    assert current_errors[1] > 1.1 * current_errors[0], current_errors
+
+    # fourth order
+    assert max(yoshida4_errors) < 1e-4, yoshida4_errors
+    assert max(yoshida4_errors) < 0.1 * min(leapfrog_errors), (yoshida4_errors, leapfrog_errors)
@@ -0,0 +1,158 @@
+"""
+tests of the L-BFGS minimizer and the exact min energy locations it finds
+"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+import yaml
+
+from dynamics.lbfgs import LBFGS
+from dynamics.simulation import Simulation
+
+
+def _hanging_body_data(minimize_energy: bool | str = False) -> dict[str, Any]:
+    """
+    a body hanging from a pin by a spring with a natural length under gravity
+    """
+    return dict(
+        name="hanging body",
+        simulation_setting=dict(minimize_energy=minimize_energy),
+        point_mass=[dict(id="ball", mass=2, position=[0.5, -1.0])],
+        vertical_pin_2d=[dict(id="pin", position=[1.0, 2.0])],
+        spring=[dict(spring_constant=10, natural_length=1.5, bodies=["pin", "ball"])],
+        gravity_like=[dict(acceleration=[0, -5])],
+    )
+
+
+def _load(input_file: Path, minimize_energy: bool | str) -> dict[str, Any]:
+    with open(input_file, "r") as fid:
+        data: dict[str, Any] = yaml.safe_load(fid)
+    data.setdefault("simulation_setting", dict())["minimize_energy"] = minimize_energy
+    return data
+
+
+def test_quadratic() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    factor: np.ndarray = rng.normal(size=(20, 20))
+    a_2d: np.ndarray = factor @ factor.T + np.eye(20)
+    b_1d: np.ndarray = rng.normal(size=20)
+
+    x_1d: np.ndarray = LBFGS(
+        lambda x_1d: (0.5 * x_1d @ a_2d @ x_1d - b_1d @ x_1d, a_2d @ x_1d - b_1d)
+    ).minimize(np.zeros(20))
+
+    # stalled by rounding errors of the value, i.e., about the square root of the machine epsilon
+    assert np.allclose(x_1d, np.linalg.solve(a_2d, b_1d), rtol=0.0, atol=1e-6)
+
+
+def test_non_finite_points_are_backtracked_from() -> None:
+    # log barrier, i.e., not defined at or below zero, whose minimum is at 1
+    def energy_and_gradient(x_1d: np.ndarray) -> tuple[float, np.ndarray]:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return float(np.sum(x_1d - np.log(x_1d))), 1.0 - 1.0 / x_1d
+
+    x_1d: np.ndarray = LBFGS(energy_and_gradient).minimize(np.array([0.01, 30.0]))
+    assert np.allclose(x_1d, 1.0, rtol=0.0, atol=1e-8)
+
+
+def test_unbounded_below() -> None:
+    with pytest.raises(RuntimeError, match="unbounded below"):
+        LBFGS(lambda x_1d: (-float(x_1d.sum()), -np.ones(x_1d.shape))).minimize(np.zeros(3))
+
+    with pytest.raises(ValueError):
+        LBFGS(lambda x_1d: (np.inf, np.zeros(x_1d.shape))).minimize(np.zeros(3))
+
+
+def test_hanging_body() -> None:
+    simulation: Simulation = Simulation.from_data(_hanging_body_data("exact"))
+
+    # stretched by the weight beyond the natural length right below the pin
+    expected_loc: np.ndarray = np.array([1.0, 2.0 - (1.5 + 2 * 5 / 10)])
+    assert np.allclose(simulation.bodies.locs[0], expected_loc, rtol=0.0, atol=1e-8)
+    # the linearized solution treats the spring as if its natural length were zero
+    approx_simulation: Simulation = Simulation.from_data(_hanging_body_data(True))
+    assert not np.allclose(approx_simulation.bodies.locs[0], expected_loc, atol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "input_file_name",
+    [
+        "2d-2-bodies-2-pins.yaml",
+        "2d-4-bodies.yaml",
+        "electric-spring-force-2-bodies.yaml",
+        "electric-force-like-group.yaml",
+        "1d-2-bodies-2-walls.yaml",
+        "2d-spring-network-cloth.yaml",
+    ],
+)
+def test_gradient_equals_finite_differences(input_directory: Path, input_file_name: str) -> None:
+    """
+    the gradient L-BFGS is given, i.e., the non-frictional batched forces at zero velocity,
+    against central differences of the batched potential energy
+    """
+    simulation: Simulation = Simulation.from_data(_load(input_directory / input_file_name, False))
+    forces, bodies = simulation.forces, simulation.bodies
+    shape: tuple[int, int] = bodies.num_free_bodies, bodies.locs.shape[1]
+
+    rng: np.random.Generator = np.random.default_rng(0)
+    free_locs: np.ndarray = bodies.locs[: shape[0]] + 0.1 * rng.normal(size=shape)
+    if simulation.simulation_setting["1d"]:
+        free_locs[:, 1:] = 0.0
+
+    force, frictional_force = forces.batched_force(
+        0.0,
+        bodies.with_fixed_rows(free_locs),
+        bodies.with_fixed_rows(np.zeros(shape), True),
+        bodies.masses,
+    )
+    gradient: np.ndarray = -(force - frictional_force)[: shape[0]]
+
+    step: float = 1e-6
+    displacements: np.ndarray = step * np.eye(free_locs.size).reshape((-1,) + shape)
+    energies: list[np.ndarray] = [
+        np.sum(
+            forces.batched_potential_energy(
+                bodies.with_fixed_rows(free_locs + sign * displacements), bodies.masses
+            ),
+            axis=0,
+        )
+        for sign in (1.0, -1.0)
+    ]
+    finite_differences: np.ndarray = ((energies[0] - energies[1]) / (2.0 * step)).reshape(shape)
+
+    if simulation.simulation_setting["1d"]:
+        gradient, finite_differences = gradient[:, :1], finite_differences[:, :1]
+    assert np.allclose(
+        gradient, finite_differences, rtol=1e-6, atol=1e-6 * max(1.0, np.abs(gradient).max())
+    )
+
+
+@pytest.mark.parametrize(
+    "input_file_name",
+    ["2d-2-bodies-2-pins.yaml", "2d-4-bodies.yaml", "2d-spring-network-cloth.yaml"],
+)
+def test_exact_min_energy_is_stationary(input_directory: Path, input_file_name: str) -> None:
+    simulation: Simulation = Simulation.from_data(_load(input_directory / input_file_name, "exact"))
+    forces, bodies = simulation.forces, simulation.bodies
+
+    force, frictional_force = forces.batched_force(
+        0.0, bodies.locs, np.zeros(bodies.locs.shape), bodies.masses
+    )
+    assert np.abs((force - frictional_force)[: bodies.num_free_bodies]).max() < 1e-6
+
+
+def test_exact_min_energy_does_not_collapse_bodies(input_directory: Path) -> None:
+    simulation: Simulation = Simulation.from_data(
+        _load(input_directory / "electric-force-2-bodies.yaml", "exact")
+    )
+    locs: np.ndarray = simulation.bodies.locs
+    assert np.all(np.isfinite(locs)) and not np.array_equal(locs[0], locs[1])
+
+
+def test_exact_min_energy_unbounded_below(input_directory: Path) -> None:
+    # gravity without any fixed bodies
+    with pytest.raises(RuntimeError, match="unbounded below"):
+        Simulation.from_data(_load(input_directory / "2d-2-bodies.yaml", "exact"))
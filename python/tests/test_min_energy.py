@@ -0,0 +1,109 @@
+"""
+tests of the (approximate) min energy locations of the linearized system
+"""
+
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from dynamics.block_cholesky import BlockCholesky
+from dynamics.factorization_cache import FactorizationCache
+from dynamics.forces.gravity_like import GravityLike
+from dynamics.simulation import Simulation
+
+
+def _gravity_like(simulation: Simulation) -> GravityLike:
+    return next(force for force in simulation.forces.forces if isinstance(force, GravityLike))
+
+
+def _resolved_locs(
+    simulation: Simulation, acceleration: np.ndarray, fixed_locs: np.ndarray
+) -> np.ndarray:
+    """
+    min energy locations solved after moving the fixed bodies and replacing the acceleration
+    """
+    bodies = simulation.bodies
+    gravity_like: GravityLike = _gravity_like(simulation)
+    prev_locs: np.ndarray = bodies.locs.copy()
+    prev_acceleration: np.ndarray = gravity_like.acceleration.copy()
+
+    bodies.locs[bodies.num_free_bodies :] = fixed_locs
+    gravity_like.acceleration[...] = acceleration
+    try:
+        return simulation.forces.approx_min_energy_locs(bodies)
+    finally:
+        bodies.locs[...] = prev_locs
+        gravity_like.acceleration[...] = prev_acceleration
+
+
+def test_pinned_equilibrium(input_directory: Path) -> None:
+    simulation: Simulation = Simulation.from_file(str(input_directory / "2d-2-bodies-2-pins.yaml"))
+    forces, bodies = simulation.forces, simulation.bodies
+
+    expected: np.ndarray = np.array([[-2.0 / 3.0, -2.5], [2.0 / 3.0, -0.5]])
+    assert np.allclose(forces.approx_min_energy_locs(bodies), expected)
+    # the springs anchored to the pins are kept when replacing the acceleration by itself
+    assert np.allclose(
+        forces.approx_min_energy_locs(bodies, _gravity_like(simulation).acceleration), expected
+    )
+    assert np.allclose(
+        forces.approx_min_energy_locs(
+            bodies, fixed_locs=bodies.locs[bodies.num_free_bodies :].copy()
+        ),
+        expected,
+    )
+
+
+def test_gravity_and_pin_sweep(input_directory: Path) -> None:
+    simulation: Simulation = Simulation.from_file(str(input_directory / "2d-2-bodies-2-pins.yaml"))
+    bodies = simulation.bodies
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    accelerations: np.ndarray = rng.normal(size=(6, 2))
+    fixed_locs: np.ndarray = bodies.locs[bodies.num_free_bodies :] + rng.normal(
+        size=(6, bodies.locs.shape[0] - bodies.num_free_bodies, 2)
+    )
+    prev_locs: np.ndarray = bodies.locs.copy()
+    factorization_cache: FactorizationCache = FactorizationCache()
+    swept_locs: np.ndarray = simulation.forces.approx_min_energy_locs(
+        bodies, accelerations, fixed_locs, factorization_cache
+    )
+
+    assert swept_locs.shape == (6, bodies.num_free_bodies, 2)
+    for acceleration, _fixed_locs, locs in zip(accelerations, fixed_locs, swept_locs):
+        assert np.allclose(locs, _resolved_locs(simulation, acceleration, _fixed_locs))
+    # the sweep leaves the bodies where they are
+    assert np.array_equal(bodies.locs, prev_locs)
+    assert len(factorization_cache) == 1
+
+
+def test_factorization_cache_is_bounded_by_bytes(input_directory: Path) -> None:
+    simulation: Simulation = Simulation.from_file(str(input_directory / "2d-4-bodies.yaml"))
+    a_2d, b_1d = simulation.forces.min_energy_system(simulation.bodies)
+    num_bytes: int = BlockCholesky(a_2d).num_bytes
+
+    # too large to factorize, so solved by the matrix itself
+    factorization_cache: FactorizationCache = FactorizationCache(max_num_bytes=num_bytes - 1)
+    assert factorization_cache.factorization(a_2d) is None
+    assert np.allclose(factorization_cache.solve(a_2d, b_1d), a_2d.solve(b_1d))
+    assert len(factorization_cache) == 0 and factorization_cache.num_bytes == 0
+
+    factorization_cache = FactorizationCache(max_num_bytes=num_bytes)
+    assert np.allclose(factorization_cache.solve(a_2d, b_1d), a_2d.solve(b_1d))
+    assert factorization_cache.factorization(a_2d) is factorization_cache.factorization(a_2d)
+    assert factorization_cache.num_bytes == num_bytes
+    factorization_cache.clear()
+    assert len(factorization_cache) == 0 and factorization_cache.num_bytes == 0
+
+
+def test_simulations_share_factorization(input_directory: Path) -> None:
+    with open(input_directory / "2d-2-bodies-2-pins.yaml", "r") as fid:
+        data: dict = yaml.safe_load(fid)
+    expected_locs: np.ndarray = Simulation.from_data(data).bodies.locs
+
+    factorization_cache: FactorizationCache = FactorizationCache()
+    for _ in range(2):
+        simulation: Simulation = Simulation.from_data(data, factorization_cache)
+        assert np.allclose(simulation.bodies.locs, expected_locs)
+    assert len(factorization_cache) == 1
@@ -0,0 +1,141 @@
+"""
+tests of the sparse assembly and the solves of the min energy system
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.linalg import LinAlgError, solve
+
+from dynamics.block_cholesky import BlockCholesky
+from dynamics.simulation import Simulation
+from dynamics.sparse_matrix import SparseMatrix
+
+
+def _lattice_laplacian(num_rows: int, num_cols: int, anchor_constant: float) -> SparseMatrix:
+    """
+    stiffness matrix of a (num_rows x num_cols) spring lattice, every node of which is anchored
+    """
+    nodes: np.ndarray = np.arange(num_rows * num_cols).reshape(num_rows, num_cols)
+    nodes_1: np.ndarray = np.concatenate((nodes[:, :-1].ravel(), nodes[:-1, :].ravel()))
+    nodes_2: np.ndarray = np.concatenate((nodes[:, 1:].ravel(), nodes[1:, :].ravel()))
+    diagonal: np.ndarray = np.arange(nodes.size)
+
+    return SparseMatrix(
+        nodes.size,
+        np.concatenate((nodes_1, nodes_2, nodes_1, nodes_2, diagonal)),
+        np.concatenate((nodes_1, nodes_2, nodes_2, nodes_1, diagonal)),
+        np.concatenate(
+            (
+                np.ones(2 * nodes_1.size),
+                -np.ones(2 * nodes_1.size),
+                np.full(nodes.size, anchor_constant),
+            )
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "input_file_name",
+    [
+        "1d-2-bodies-2-walls.yaml",
+        "2d-2-bodies-2-pins.yaml",
+        "2d-4-bodies.yaml",
+        "2d-spring-network-cloth.yaml",
+    ],
+)
+def test_sparse_system_equals_dense_one(input_directory: Path, input_file_name: str) -> None:
+    simulation: Simulation = Simulation.from_file(str(input_directory / input_file_name))
+    forces, bodies = simulation.forces, simulation.bodies
+
+    dense_a_2d: np.ndarray = np.zeros((bodies.num_coordinates, bodies.num_coordinates))
+    dense_b_1d: np.ndarray = np.zeros(bodies.num_coordinates)
+    for force in forces.forces:
+        a_2d, b_1d = force.min_energy_matrices(bodies)
+        dense_a_2d += a_2d
+        dense_b_1d += b_1d
+
+    sparse_a_2d, sparse_b_1d = forces.min_energy_system(bodies)
+    assert np.allclose(sparse_a_2d.to_dense(), dense_a_2d, rtol=0.0, atol=1e-12)
+    assert np.allclose(sparse_b_1d, dense_b_1d, rtol=0.0, atol=1e-12)
+
+    # a single right-hand side is solved directly
+    assert np.array_equal(
+        sparse_a_2d.solve(sparse_b_1d), solve(sparse_a_2d.to_dense(), sparse_b_1d)
+    )
+
+
+def test_batched_solve_equals_single_ones() -> None:
+    a_2d: SparseMatrix = _lattice_laplacian(6, 7, 0.5)
+    b_2d: np.ndarray = np.random.default_rng(0).normal(size=(3, 4, a_2d.size))
+
+    x_2d: np.ndarray = a_2d.solve(b_2d)
+    assert x_2d.shape == b_2d.shape
+    for b_1d, x_1d in zip(b_2d.reshape(-1, a_2d.size), x_2d.reshape(-1, a_2d.size)):
+        assert np.allclose(x_1d, a_2d.solve(b_1d), rtol=0.0, atol=1e-12)
+
+
+def test_dot_equals_dense_product() -> None:
+    a_2d: SparseMatrix = _lattice_laplacian(5, 4, 0.1)
+    x_2d: np.ndarray = np.random.default_rng(1).normal(size=(3, a_2d.size))
+
+    assert np.allclose(a_2d.dot(x_2d), x_2d @ a_2d.to_dense().T)
+    assert np.allclose(a_2d.dot(x_2d[0]), a_2d.to_dense() @ x_2d[0])
+
+
+def test_conjugate_gradient_equals_dense_solve() -> None:
+    a_2d: SparseMatrix = _lattice_laplacian(30, 40, 0.01)
+    b_2d: np.ndarray = np.random.default_rng(2).normal(size=(2, a_2d.size))
+
+    x_2d: np.ndarray = a_2d.conjugate_gradient(b_2d)
+    expected_x_2d: np.ndarray = solve(a_2d.to_dense(), b_2d.T).T
+    assert np.allclose(x_2d, expected_x_2d, rtol=0.0, atol=1e-8 * np.abs(expected_x_2d).max())
+
+
+def test_large_system_is_solved_by_conjugate_gradient() -> None:
+    a_2d: SparseMatrix = _lattice_laplacian(50, 50, 0.1)
+    assert a_2d.size > SparseMatrix.DENSE_SOLVE_MAX_SIZE
+    b_1d: np.ndarray = np.random.default_rng(3).normal(size=a_2d.size)
+
+    x_1d: np.ndarray = a_2d.solve(b_1d)
+    assert np.linalg.norm(a_2d.dot(x_1d) - b_1d) <= 1e-10 * np.linalg.norm(b_1d)
+
+
+def test_block_cholesky_equals_dense_solve(input_directory: Path) -> None:
+    cloth: Simulation = Simulation.from_file(str(input_directory / "2d-spring-network-cloth.yaml"))
+    rng: np.random.Generator = np.random.default_rng(4)
+    dense_a_2d: np.ndarray = rng.normal(size=(300, 300))
+    dense_a_2d = dense_a_2d @ dense_a_2d.T + 300.0 * np.eye(300)
+    rows, cols = np.nonzero(dense_a_2d)
+
+    for a_2d in (
+        _lattice_laplacian(6, 7, 0.5),
+        cloth.forces.min_energy_system(cloth.bodies)[0],
+        SparseMatrix(300, rows, cols, dense_a_2d[rows, cols]),
+    ):
+        b_2d: np.ndarray = rng.normal(size=(2, 3, a_2d.size))
+        x_2d: np.ndarray = BlockCholesky(a_2d).solve(b_2d)
+        expected_x_2d: np.ndarray = solve(a_2d.to_dense(), b_2d.reshape(-1, a_2d.size).T).T
+        assert np.allclose(x_2d.reshape(-1, a_2d.size), expected_x_2d, rtol=0.0, atol=1e-10)
+        assert np.allclose(BlockCholesky(a_2d).solve(b_2d[0, 0]), x_2d[0, 0], rtol=0.0, atol=1e-12)
+
+    with pytest.raises(LinAlgError):
+        BlockCholesky(_lattice_laplacian(6, 7, -0.5))
+
+
+def test_block_cholesky_of_large_lattice() -> None:
+    a_2d: SparseMatrix = _lattice_laplacian(60, 50, 0.1)
+    assert a_2d.size > SparseMatrix.DENSE_SOLVE_MAX_SIZE
+    b_2d: np.ndarray = np.random.default_rng(5).normal(size=(3, a_2d.size))
+
+    # the band of the reordered lattice is about as wide as it
+    factorization: BlockCholesky = BlockCholesky(a_2d)
+    assert factorization.block_size <= 60 and factorization.block_bandwidth == 1
+
+    x_2d: np.ndarray = factorization.solve(b_2d)
+    assert np.all(
+        np.linalg.norm(a_2d.dot(x_2d) - b_2d, axis=-1) <= 1e-12 * np.linalg.norm(b_2d, axis=-1)
+    )
+    with pytest.raises(MemoryError):
+        BlockCholesky(a_2d, max_num_bytes=factorization.num_bytes - 1)